@@ -1,19 +1,26 @@
 from .__version__ import __version__, __date__
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping, Sequence, KeysView, ValuesView, ItemsView
 import os
 import json
 import copy
 import warnings
-from typing import Union, TypeVar
+from typing import Union, TypeVar, Iterator
 from io import TextIOWrapper, BytesIO, StringIO
 import yaml
 import base64
 import types
 import re
 import inspect
+import weakref
+import threading
+import bisect
+import operator
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import uuid
 import sys
+import itertools
 from pathlib import Path
 import importlib.util
 import configparser
@@ -30,10 +37,431 @@ else:
     import tomllib as toml
 
 from rickle.tools import toml_null_stripper, inflate_dict, flatten_dict, parse_ini, unparse_ini, supported_encodings, \
-    generate_random_value
+    generate_random_value, load_string, infer_load_string, parse_cache, get_backend, substitute_template, \
+    template_options, stream_dump, ChunkWriter, STREAM_CHUNK_SIZE, use_mmap, load_mapped_file, CompiledPath, \
+    compile_path, path_step, PathMatch, Condition, parse_condition, comparison_ops
 
 yaml.add_representer(OrderedDict, lambda dumper, data: dumper.represent_mapping('tag:yaml.org,2002:map', data.items()))
 
+_url_pat = re.compile(r'^\s*https?://\S+\s*$')
+_file_ext_types = {'.yaml': 'yaml', '.yml': 'yaml', '.json': 'json', '.jsonl': 'jsonl', '.toml': 'toml',
+                   '.ini': 'ini', '.env': 'env', '.xml': 'xml'}
+_yaml_doc_start_pat = re.compile(r'^---(\s|$)')
+_yaml_doc_end_pat = re.compile(r'^\.\.\.(\s|$)')
+
+class _EmptyMap(dict):
+    # Shared by nodes without metadata or key maps, replaced by a dict on the first write
+
+    def __setitem__(self, key, value):
+        raise TypeError('Shared empty map is read only')
+
+    def __reduce__(self):
+        return '_empty_map'
+
+
+_empty_map = _EmptyMap()
+_missing = object()
+
+def _compare(compare, candidate, value) -> bool:
+    # Values are compared as dict() gives them, nodes are only deconstructed when compared to a dict
+    if isinstance(candidate, BaseRickle):
+        candidate = candidate.dict() if isinstance(value, dict) else dict()
+    elif isinstance(candidate, list) and isinstance(value, list):
+        candidate = [v.dict() if isinstance(v, BaseRickle) else v for v in candidate]
+    return compare(candidate, value)
+
+
+class _TreeIndex(object):
+    # Path, key, and sorted value indexes shared by every node of a tree, each node keeps its own path prefix next to it.
+    # Lists and dicts changed in place mark the indexes stale, they are built again when next used.
+    __slots__ = ('root', 'paths', 'keys', 'sorted', 'stale')
+
+    def __init__(self, root=None):
+        self.root = root
+        self.paths = None
+        self.keys = None
+        self.sorted = None
+        self.stale = False
+
+    def __reduce__(self):
+        # Indexes are not pickled, they are built again when needed
+        return _TreeIndex, ()
+
+
+def _marks_stale(method):
+    # Wraps a list or dict method that changes it in place
+    def mutate(self, *args, **kwargs):
+        self.tree.stale = True
+        return method(self, *args, **kwargs)
+    mutate.__name__ = method.__name__
+    return mutate
+
+
+class _TrackedList(list):
+    # Lists in indexed trees, changing one in place marks the indexes of the tree stale
+    __slots__ = ('tree',)
+
+    __setitem__ = _marks_stale(list.__setitem__)
+    __delitem__ = _marks_stale(list.__delitem__)
+    __iadd__ = _marks_stale(list.__iadd__)
+    __imul__ = _marks_stale(list.__imul__)
+    append = _marks_stale(list.append)
+    extend = _marks_stale(list.extend)
+    insert = _marks_stale(list.insert)
+    pop = _marks_stale(list.pop)
+    remove = _marks_stale(list.remove)
+    clear = _marks_stale(list.clear)
+    sort = _marks_stale(list.sort)
+    reverse = _marks_stale(list.reverse)
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as plain lists
+        return list, (list(self), )
+
+
+class _TrackedDict(dict):
+    # Dicts in indexed trees, changing one in place marks the indexes of the tree stale
+    __slots__ = ('tree',)
+
+    __setitem__ = _marks_stale(dict.__setitem__)
+    __delitem__ = _marks_stale(dict.__delitem__)
+    __ior__ = _marks_stale(dict.__ior__)
+    pop = _marks_stale(dict.pop)
+    popitem = _marks_stale(dict.popitem)
+    clear = _marks_stale(dict.clear)
+    update = _marks_stale(dict.update)
+    setdefault = _marks_stale(dict.setdefault)
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as plain dicts
+        return dict, (dict(self), )
+
+
+# Written as plain lists and dicts, also by the dumpers of the YAML backends
+for _dumper in (yaml.Dumper, yaml.SafeDumper) + ((yaml.CDumper, yaml.CSafeDumper) if hasattr(yaml, 'CDumper') else ()):
+    yaml.add_representer(_TrackedList, yaml.representer.SafeRepresenter.represent_list, Dumper=_dumper)
+    yaml.add_representer(_TrackedDict, yaml.representer.SafeRepresenter.represent_dict, Dumper=_dumper)
+
+
+def _tracked(value, tree):
+    # The list or dict tracked for the tree, a copy is made the first time it is indexed
+    owner = getattr(value, 'tree', None)
+    if owner is tree:
+        return value
+    if owner is not None and owner.paths is None and owner.keys is None and not owner.sorted:
+        # The indexes it was tracked for were dropped
+        value.tree = tree
+        return value
+    tracked = _TrackedList(value) if isinstance(value, list) else _TrackedDict(value)
+    tracked.tree = tree
+    return tracked
+
+
+class _SortedIndex(object):
+    # Values of a key with the paths to them, in sorted value order and by path for equal values.
+    # Values are ordered as numbers or as strings, whichever is added first, other values are kept aside unordered.
+    # Entries are kept in chunks of at most ``_chunk_size``, so that adding and removing a value only shifts a single
+    # chunk. Chunks are filled halfway when loaded, and a full chunk is split in two halves.
+    __slots__ = ('family', 'values', 'paths', 'maxes', 'unordered', 'loading')
+
+    _chunk_size = 2000
+
+    def __init__(self):
+        self.family = None
+        self.values = list()
+        self.paths = list()
+        self.maxes = list()
+        self.unordered = dict()
+        self.loading = None
+
+    @staticmethod
+    def _family(value):
+        if isinstance(value, (int, float)):
+            return float
+        if isinstance(value, str):
+            return str
+        return None
+
+    def _locate(self, value, right: bool = False) -> tuple:
+        # Chunk and offset of the first value not below the value, or with right, of the first value above it
+        c = bisect.bisect_left(self.maxes, (value, ))
+        if right:
+            while c < len(self.maxes) and self.maxes[c][0] == value:
+                c += 1
+        if c == len(self.values):
+            return c, 0
+        find = bisect.bisect_right if right else bisect.bisect_left
+        return c, find(self.values[c], value)
+
+    def _position(self, value, path: str) -> tuple:
+        c = min(bisect.bisect_left(self.maxes, (value, path)), len(self.maxes) - 1)
+        values = self.values[c]
+        lo = bisect.bisect_left(values, value)
+        hi = bisect.bisect_right(values, value, lo)
+        return c, bisect.bisect_left(self.paths[c], path, lo, hi)
+
+    def add(self, value, path: str):
+        family = self._family(value)
+        if family is None or self.family not in (None, family):
+            self.unordered[path] = value
+            return
+        self.family = family
+        if self.loading is not None:
+            self.loading.append((value, path))
+            return
+        if not self.values:
+            self.values.append([value])
+            self.paths.append([path])
+            self.maxes.append((value, path))
+            return
+        c, i = self._position(value, path)
+        values, paths = self.values[c], self.paths[c]
+        if i < len(paths) and paths[i] == path and values[i] == value:
+            return
+        values.insert(i, value)
+        paths.insert(i, path)
+        self.maxes[c] = (values[-1], paths[-1])
+        if len(values) > self._chunk_size:
+            half = len(values) // 2
+            self.values[c:c + 1] = [values[:half], values[half:]]
+            self.paths[c:c + 1] = [paths[:half], paths[half:]]
+            self.maxes[c:c + 1] = [(values[half - 1], paths[half - 1]), (values[-1], paths[-1])]
+
+    def load(self, walk):
+        # Values found by the walk are sorted once, instead of added one by one
+        self.loading = list()
+        try:
+            walk()
+            entries = sorted(self.loading)
+        finally:
+            self.loading = None
+        size = self._chunk_size // 2
+        self.values = [[v for v, _ in entries[i:i + size]] for i in range(0, len(entries), size)]
+        self.paths = [[p for _, p in entries[i:i + size]] for i in range(0, len(entries), size)]
+        self.maxes = [(v[-1], p[-1]) for v, p in zip(self.values, self.paths)]
+
+    def discard(self, value, path: str):
+        if self.unordered.pop(path, _missing) is not _missing:
+            return
+        if self._family(value) != self.family or not self.values:
+            return
+        c, i = self._position(value, path)
+        values, paths = self.values[c], self.paths[c]
+        if i < len(paths) and paths[i] == path and values[i] == value:
+            del values[i]
+            del paths[i]
+            if values:
+                self.maxes[c] = (values[-1], paths[-1])
+            else:
+                del self.values[c], self.paths[c], self.maxes[c]
+                if not self.values:
+                    self.family = None
+
+    def _between(self, start: tuple, end: tuple) -> list:
+        (c, i), (d, j) = start, end
+        if c == d:
+            return self.paths[c][i:j] if c < len(self.paths) else list()
+        paths = self.paths[c][i:]
+        for chunk in self.paths[c + 1:d]:
+            paths.extend(chunk)
+        if d < len(self.paths):
+            paths.extend(self.paths[d][:j])
+        return paths
+
+    def query(self, compare, value):
+        # Paths of the values matching the comparison, or None if the comparison can not be answered from the index
+        if not self.values and not self.unordered:
+            return list()
+        if self._family(value) != self.family or compare is operator.ne:
+            return None
+        first, last = (0, 0), (len(self.values), 0)
+        if compare is operator.eq:
+            paths = self._between(self._locate(value), self._locate(value, right=True))
+            return paths + [p for p, v in self.unordered.items() if _compare(compare, v, value)]
+        if self.unordered:
+            # Ordering against other types is left to the full search, which raises the same errors as before
+            return None
+        if compare is operator.gt:
+            return self._between(self._locate(value, right=True), last)
+        if compare is operator.ge:
+            return self._between(self._locate(value), last)
+        if compare is operator.lt:
+            return self._between(first, self._locate(value))
+        if compare is operator.le:
+            return self._between(first, self._locate(value, right=True))
+        return None
+
+
+class SnapshotError(TypeError):
+    """
+    Raised when a node that belongs to a snapshot is changed, see ``BaseRickle.snapshot``. This includes the nodes
+    got from the object before the snapshot was taken, get them from the object again to change them.
+    """
+
+
+class _Versions(object):
+    # Shared by every node of a tree through its settings. New and copied nodes take the current generation, which
+    # every snapshot of the tree raises. Nodes of the generation of the last snapshot, or older, belong to the
+    # snapshots and are not changed any more.
+    __slots__ = ('generation', 'frozen', 'lock')
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self.frozen = -1
+        self.lock = threading.Lock()
+
+    def __reduce__(self):
+        # Copies of a tree do not belong to its snapshots, their nodes keep their generations
+        return _Versions, (self.generation,)
+
+
+def _copy_nodes(value):
+    # Lists belong to the node holding them, they are copied with it. Nodes in them are given lazy copies of their own.
+    if isinstance(value, BaseRickle):
+        return value._lazy_copy()
+    if isinstance(value, list):
+        copied = [_copy_nodes(v) for v in value]
+        return _tracked(copied, value.tree) if isinstance(value, _TrackedList) else copied
+    return value
+
+
+class _NodeView(object):
+    # Live views over the top level of a node, read from its internal state every time they are used.
+    # Keys and items views are sets like those of a dict, the node stands in for the mapping.
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{type(self).__name__[1:]}({list(self)!r})"
+
+
+class _KeysView(_NodeView, KeysView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return (name for name, _ in self._mapping._visible_items())
+
+    def __contains__(self, key):
+        return self._mapping.has(key)
+
+
+class _ValuesView(_NodeView, ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        node = self._mapping
+        return (node._top_value(value) for _, value in node._visible_items(copy=True))
+
+    def __contains__(self, value):
+        return any(v is value or v == value for v in self)
+
+
+class _ItemsView(_NodeView, ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        node = self._mapping
+        return ((name, node._top_value(value)) for name, value in node._visible_items(copy=True))
+
+    def __contains__(self, item):
+        name, value = item
+        node = self._mapping
+        try:
+            v = node._visible_value(name)
+        except KeyError:
+            return False
+        v = node._top_value(v)
+        return v is value or v == value
+
+
+class _MappingProxy(Mapping):
+    # Read-only mapping over a node, see BaseRickle.as_mapping
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def __getitem__(self, name):
+        return _proxy_value(self._node._visible_value(name))
+
+    def __iter__(self):
+        return (name for name, _ in self._node._visible_items())
+
+    def __len__(self):
+        return len(self._node)
+
+    def __contains__(self, name):
+        return self._node.has(name)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class _SequenceProxy(Sequence):
+    # Read-only sequence over a list of a node, nodes in it are given as views
+    __slots__ = ('_list',)
+
+    def __init__(self, values):
+        self._list = values
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return _SequenceProxy(self._list[i])
+        return _proxy_value(self._list[i])
+
+    def __len__(self):
+        return len(self._list)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, _SequenceProxy)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _proxy_value(value):
+    if isinstance(value, BaseRickle):
+        return value.as_mapping()
+    if isinstance(value, list):
+        return _SequenceProxy(value)
+    return value
+
+# Settings resolved once by the root node and shared by all of its child nodes
+_NodeSettings = namedtuple('_NodeSettings', ['strict', 'deep', 'lazy', 'path_sep', 'name_cleanup', 'memoize',
+                                             'init_args', 'versions'])
+
+
+def _iter_yaml_documents(lines):
+    """
+    Split lines of a multi-document YAML stream into one string per document, at the ``---`` and ``...`` markers.
+    """
+    chunk = list()
+    has_content = False
+    for line in lines:
+        is_start = _yaml_doc_start_pat.match(line)
+        is_end = _yaml_doc_end_pat.match(line)
+        if (is_start or is_end) and has_content:
+            yield ''.join(chunk)
+            chunk = list()
+            has_content = False
+        if is_end:
+            continue
+        if is_start:
+            # Drop markers of empty documents, but keep directives and comments
+            chunk = [l for l in chunk if not _yaml_doc_start_pat.match(l)]
+            inline = line[3:].strip()
+            has_content = bool(inline) and not inline.startswith('#')
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('#') and not stripped.startswith('%'):
+                has_content = True
+        chunk.append(line)
+    if has_content:
+        yield ''.join(chunk)
+
 class BaseRickle:
     """
         A base class that creates internal structures from embedded structures.
@@ -42,12 +470,23 @@ class BaseRickle:
             base (str,dict,TextIOWrapper, list): String (YAML or JSON, file path to YAML/JSON file, URL), text IO stream, dict (default = None).
             deep (bool): Internalize dictionary structures in lists (default = False).
             strict (bool): Check keywords, if YAML/JSON key is Rickle keyword (or member of object) raise ValueError (default = True).
+            lazy (bool): Only internalize nested dictionaries when they are first accessed (default = False).
+            workers (int): Number of workers to parse a list of sources in parallel (default = None).
+            pool (str): Either 'thread' or 'process' pool for parallel parsing, init args must be picklable for processes (default = 'thread').
             **init_args (kw_args): Additional arguments for string replacement
 
         Raises:
             ValueError: If the given base object can not be handled. Also raises if YAML key is already member of Rickle.
     """
 
+    # Node headers are slots, only the keys live in the instance dict
+    __slots__ = ('__dict__', '__weakref__', '__list__', '_meta_info', '_keys_map', '_names_map', '_settings',
+                 '_pending', '_passable', '_input_type', '_index', '_memo', '_parent', '_gen')
+
+    # Dict types that are loaded as values instead of internalized
+    _node_types = tuple()
+    _allowed_chars_pat = re.compile('[^a-zA-Z_]')
+
     @staticmethod
     def flatten_dict(dictionary, path_sep: str = None, list_brackets: tuple = ('(', ')')):
         """
@@ -81,211 +520,201 @@ class BaseRickle:
         """
         return inflate_dict(flat_dict=flat_dict, path_sep=path_sep, list_brackets=list_brackets)
 
+    @staticmethod
+    def _substitute_init_args(stringed: str, **init_args) -> str:
+        opening, closing, unresolved = template_options(init_args)
+        return substitute_template(stringed, init_args, opening=opening, closing=closing, unresolved=unresolved)
+
+    @classmethod
+    def iter_documents(cls, path_or_stream: Union[str, Path, TextIOWrapper],
+                       input_type: str = None,
+                       as_dict: bool = False,
+                       batch_size: int = None,
+                       encoding: str = 'utf-8',
+                       **init_args):
+        """
+        Lazily iterate over the records of a JSONL file, or the documents of a multi-document YAML file.
+        Only one record (or batch) is held in memory at a time.
+
+        Notes:
+            If no input type is given, it is inferred from the file suffix or else from the first line.
+            Records that are not objects (dicts) are yielded as is.
+            A plain JSON file is read whole, and the elements of a top level array are yielded.
+
+        Args:
+            path_or_stream (str, Path, TextIOWrapper): File path or text IO stream.
+            input_type (str): Either 'jsonl', 'yaml', or 'json' (default = None).
+            as_dict (bool): Yield plain dicts instead of Rickle objects (default = False).
+            batch_size (int): Yield lists of up to this many records instead of single records (default = None).
+            encoding (str): File encoding (default = 'utf-8').
+            **init_args (kw_args): Init args for creating the Rickle objects and for string replacement.
+
+        Yields:
+            Rickle, dict, list: Record, or list of records if ``batch_size`` is given.
+        """
+        if isinstance(path_or_stream, (str, Path)):
+            file_path = Path(path_or_stream)
+            if input_type is None:
+                input_type = _file_ext_types.get(file_path.suffix.lower(), None)
+            with file_path.open(mode='r', encoding=encoding) as stream:
+                yield from cls.__iter_stream(stream, input_type=input_type, as_dict=as_dict,
+                                             batch_size=batch_size, **init_args)
+        else:
+            yield from cls.__iter_stream(path_or_stream, input_type=input_type, as_dict=as_dict,
+                                         batch_size=batch_size, **init_args)
+
+    @classmethod
+    def __iter_stream(cls, stream, input_type: str = None, as_dict: bool = False, batch_size: int = None,
+                      **init_args):
+        lines = iter(stream)
+
+        if input_type is None:
+            # Sniff the first significant line, and put the consumed lines back in front
+            consumed = list()
+            for line in lines:
+                consumed.append(line)
+                if line.strip() and not line.lstrip().startswith('#'):
+                    break
+            input_type = 'jsonl' if consumed and consumed[-1].lstrip()[:1] in ['{', '['] else 'yaml'
+            lines = itertools.chain(consumed, lines)
+
+        input_type = input_type.strip().lower()
+        if input_type == 'jsonl':
+            loads = get_backend('json', init_args=init_args).loads
+            raw_documents = (loads(cls._substitute_init_args(line, **init_args)) for line in lines if line.strip())
+        elif input_type == 'json':
+            # A single JSON document can not be split, only the elements of a top level array are streamed
+            loaded = get_backend('json', init_args=init_args).loads(cls._substitute_init_args(''.join(lines),
+                                                                                               **init_args))
+            raw_documents = iter(loaded if isinstance(loaded, list) else [loaded])
+        elif input_type in ['yaml', 'yml']:
+            loads = get_backend('yaml', init_args=init_args).loads
+            raw_documents = (loads(cls._substitute_init_args(chunk, **init_args))
+                             for chunk in _iter_yaml_documents(lines))
+        else:
+            raise ValueError(f"Unable to stream input type '{input_type}', only JSONL or YAML")
+
+        def _documents():
+            for document in raw_documents:
+                if document is None:
+                    continue
+                if as_dict or not isinstance(document, dict):
+                    yield document
+                else:
+                    yield cls(base=document, **init_args)
+
+        documents = _documents()
+        if not batch_size:
+            yield from documents
+            return
+
+        while True:
+            batch = list(itertools.islice(documents, batch_size))
+            if not batch:
+                return
+            yield batch
+
     def __create_dict_from_string(self, base: str, **init_args):
 
         stringed = ''
         file_ext = ''
+        cache_key = None
 
         if os.path.exists(base) and Path(base).is_file():
             file_path = Path(base)
             file_ext = file_path.suffix.lower()
 
+            use_cache = init_args.get('RICKLE_PARSE_CACHE', os.getenv('RICKLE_PARSE_CACHE', False))
+            if str(use_cache).strip().lower() in ['1', 'true', 'yes']:
+                cache_key = parse_cache.file_key(file_path, encoding=init_args.get('encoding', 'utf-8'),
+                                                 init_args=init_args)
+                cached = parse_cache.get(cache_key)
+                if cached is not None:
+                    _d, self._input_type = cached
+                    return _d
+
             # handle dotenv
             if file_path.stem.lower() == '.env':
                 file_ext = '.env'
+
+            if use_mmap(file_path, init_args):
+                try:
+                    _d, self._input_type = load_mapped_file(file_path, input_type=_file_ext_types[file_ext],
+                                                            init_args=init_args, substitute=True)
+                    if cache_key:
+                        parse_cache.put(cache_key, _d, self._input_type)
+                    return _d
+                except ValueError:
+                    # Not valid JSON after all, read and infer as usual
+                    pass
+
             with file_path.open(mode='r', encoding=init_args.get('encoding', 'utf-8')) as f:
                 stringed = f.read()
         elif isinstance(base, str):
-            try:
-                from urllib3.util import parse_url
+            if _url_pat.match(base):
                 try:
-                    parsed = parse_url(base)
-                    if all([parsed.scheme, parsed.host]):
-                        response = requests.get(url=base.strip(), )
-                        if response.status_code == 200:
-                            _d = response.json()
-                            self._input_type = "url"
-                            return _d
-                        else:
-                            sys.stderr.write(f"Non-200 status {response.status_code} returned for URL {base}")
-                            raise ValueError(f"Non-200 status {response.status_code} returned for URL {base}")
-                except:
+                    from urllib3.util import parse_url
+                    try:
+                        parsed = parse_url(base)
+                        if all([parsed.scheme, parsed.host]):
+                            response = requests.get(url=base.strip(), )
+                            if response.status_code == 200:
+                                _d = response.json()
+                                self._input_type = "url"
+                                return _d
+                            else:
+                                sys.stderr.write(f"Non-200 status {response.status_code} returned for URL {base}")
+                                raise ValueError(f"Non-200 status {response.status_code} returned for URL {base}")
+                    except:
+                        pass
+                except (ImportError, ModuleNotFoundError):
                     pass
-            except (ImportError, ModuleNotFoundError):
-                print("#######################3")
-                pass
 
             stringed = base
 
-        if not init_args is None:
-            for k, v in init_args.items():
-                _k = "{opening}{key}{closing}".format(
-                    opening=init_args.get("RICKLE_OPENING_BRACES", os.getenv('RICKLE_OPENING_BRACES', "{{")),
-                    key=k,
-                    closing=init_args.get("RICKLE_CLOSING_BRACES", os.getenv('RICKLE_CLOSING_BRACES', "}}"))
-                )
-                stringed = stringed.replace(_k, json.dumps(v))
+        stringed = self._substitute_init_args(stringed, **init_args)
 
         error_list = list()
+        loaded = False
 
-        if file_ext in [".yaml", ".yml"]:
+        if file_ext in _file_ext_types:
             try:
-                _d = list(yaml.safe_load_all(stringed))
-                if len(_d) == 1:
-                    self._input_type = "yaml"
-                    return _d[0]
-                self._input_type = "array"
-                return _d
-            except Exception as exc:
-                error_list.append(f"YAML: {exc}")
-        if file_ext in [".json"]:
-            try:
-                _d = json.loads(stringed)
-                self._input_type = "json"
-                return _d
-            except Exception as exc:
-                error_list.append(f"JSON: {exc}")
-        if file_ext in [".jsonl"]:
-            try:
-                _d = [json.loads(line) for line in stringed.split('\n')]
-                self._input_type = "array"
-                return _d
-            except Exception as exc:
-                error_list.append(f"JSON: {exc}")
-        if file_ext in [".toml"]:
-            try:
-                _d = toml.loads(stringed)
-                self._input_type = "toml"
-                return _d
-            except Exception as exc:
-                error_list.append(f"TOML: {exc}")
-        if file_ext in [".ini"]:
-            try:
-                config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
-                config.read_string(stringed)
-
-                path_sep = init_args.get('RICKLE_INI_PATH_SEP', os.getenv("RICKLE_INI_PATH_SEP", "."))
-                list_brackets = (
-                    init_args.get("RICKLE_INI_OPENING_BRACES", os.getenv("RICKLE_INI_OPENING_BRACES", "(")),
-                    init_args.get("RICKLE_INI_CLOSING_BRACES", os.getenv("RICKLE_INI_CLOSING_BRACES", ")"))
-                )
-
-                _d = parse_ini(config=config, path_sep=path_sep, list_brackets=list_brackets)
-
-                self._input_type = "ini"
-                return _d
+                _d, self._input_type = load_string(stringed, input_type=_file_ext_types[file_ext], **init_args)
+                loaded = True
+            except ModuleNotFoundError:
+                pass
             except Exception as exc:
-                error_list.append(f"INI: {exc}")
-        if file_ext == ".env":
-            try:
-                if importlib.util.find_spec('dotenv'):
-                    from io import StringIO
-                    from dotenv import dotenv_values
-
-                    _d = dotenv_values(stream=StringIO(stringed))
+                error_list.append(f"{_file_ext_types[file_ext].upper()}: {exc}")
 
-                    self._input_type = "env"
-                    return _d
-            except Exception as exc:
-                error_list.append(f"ENV: {exc}")
-        if file_ext == ".xml":
+        if not loaded:
+            # Sniff the content and only fall back to other types if the sniffed type fails
             try:
-                if importlib.util.find_spec('xmltodict'):
-                    import xmltodict
-
-                    _d = xmltodict.parse(stringed, process_namespaces=init_args.get('process_namespaces', False))
-
-                    self._input_type = "xml"
-                    return _d
-            except Exception as exc:
-                error_list.append(f"XML: {exc}")
-
-        # Brute force it
-        try:
-            _d = [json.loads(l) for l in stringed.splitlines()]
-            if len(_d) == 1:
-                self._input_type = "json"
-                return _d[0]
-            self._input_type = "array"
-            return _d
-        except Exception as exc:
-            error_list.append(f"JSONL: {exc}")
-        try:
-            _d = json.loads(stringed)
-            self._input_type = "json"
-            return _d
-        except Exception as exc:
-            error_list.append(f"JSON: {exc}")
-        try:
-            _d = list(yaml.safe_load_all(stringed))
-            if len(_d) == 1:
-                self._input_type = "yaml"
-                return _d[0]
-            self._input_type = "array"
-            return _d
-        except Exception as exc:
-            error_list.append(f"YAML: {exc}")
-        try:
-            _d = toml.loads(stringed)
-            self._input_type = "toml"
-            return _d
-        except Exception as exc:
-            error_list.append(f"TOML: {exc}")
-        try:
-            config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
-            config.read_string(stringed)
-
-            path_sep = init_args.get('RICKLE_INI_PATH_SEP', os.getenv("RICKLE_INI_PATH_SEP", "."))
-            list_brackets = (
-                init_args.get("RICKLE_INI_OPENING_BRACES", os.getenv("RICKLE_INI_OPENING_BRACES", "(")),
-                init_args.get("RICKLE_INI_CLOSING_BRACES", os.getenv("RICKLE_INI_CLOSING_BRACES", ")"))
-            )
+                inferred = infer_load_string(stringed, **init_args)
+            except ValueError as exc:
+                for error in error_list:
+                    print(error)
+                raise exc
 
-            _d = parse_ini(config=config, path_sep=path_sep, list_brackets=list_brackets)
+            _d = inferred.data
+            self._input_type = inferred.input_type
 
-            self._input_type = "ini"
-            return _d
-        except Exception as exc:
-            error_list.append(f"INI: {exc}")
-        try:
-            if importlib.util.find_spec('dotenv'):
-                from io import StringIO
-                from dotenv import dotenv_values
+        if cache_key:
+            parse_cache.put(cache_key, _d, self._input_type)
 
-                _d = dotenv_values(stream=StringIO(stringed))
-
-                self._input_type = "env"
-                return _d
-        except Exception as exc:
-            error_list.append(f"ENV: {exc}")
-        try:
-            if importlib.util.find_spec('xmltodict'):
-                import xmltodict
-
-                _d = xmltodict.parse(stringed, process_namespaces=init_args.get('process_namespaces', False))
-
-                self._input_type = "xml"
-                return _d
-        except Exception as exc:
-            error_list.append(f"XML: {exc}")
-
-        for error in error_list:
-            print(error)
-
-        raise ValueError("Unable to infer data type")
+        return _d
 
     def _iternalize(self, obj: Union[dict, list], deep: bool, **init_args):
         if isinstance(obj, dict):
             for k, v in obj.items():
                 k = self._check_kw(k)
                 if isinstance(v, dict):
-                    self.__dict__.update({k: BaseRickle(base=v, deep=deep, strict=self._strict, **init_args)})
+                    self.__dict__.update({k: self._spawn(BaseRickle, v)})
                     continue
                 if isinstance(v, list) and deep:
                     new_list = list()
                     for i in v:
                         if isinstance(i, dict):
-                            new_list.append(BaseRickle(base=i, deep=deep, strict=self._strict, **init_args))
+                            new_list.append(self._spawn(BaseRickle, i))
                         else:
                             new_list.append(i)
                     self.__dict__.update({k: new_list})
@@ -293,31 +722,36 @@ class BaseRickle:
 
                 self.__dict__.update({k: v})
         if isinstance(obj, list):
+            self.__list__ = list()
             for b in obj:
                 if isinstance(b, dict):
-                    self.__list__.append(BaseRickle(base=b, deep=deep, strict=self._strict, **init_args))
+                    self.__list__.append(self._spawn(BaseRickle, b))
 
     def __init__(self, base: Union[dict, str, TextIOWrapper, list] = None,
                  deep: bool = False,
                  strict: bool = True,
+                 lazy: bool = False,
+                 workers: int = None,
+                 pool: str = 'thread',
                  **init_args):
-        self._meta_info = dict()
-        self.__list__ = list()
-        self._strict = strict
-        self._input_type = None
-        self._allowed_chars_pat = re.compile('[^a-zA-Z_]')
-        self._keys_map = dict()
-        self._path_sep = init_args.get('RICKLE_PATH_SEP', os.getenv("RICKLE_PATH_SEP", "/"))
-        self._name_cleanup = init_args.get('RICKLE_NAME_CLEAN_UP', os.getenv("RICKLE_NAME_CLEAN_UP", True))
-
-        self._init_args = init_args
+        self._init_node(_NodeSettings(
+            strict=strict, deep=deep, lazy=lazy,
+            path_sep=init_args.get('RICKLE_PATH_SEP', os.getenv("RICKLE_PATH_SEP", "/")),
+            name_cleanup=init_args.get('RICKLE_NAME_CLEAN_UP', os.getenv("RICKLE_NAME_CLEAN_UP", True)),
+            memoize=str(init_args.get('RICKLE_DICT_CACHE', os.getenv('RICKLE_DICT_CACHE', False))).strip().lower()
+                    in ['1', 'true', 'yes'],
+            init_args=init_args, versions=_Versions()))
 
         if base is None:
             return
 
         if isinstance(base, dict):
-            self._iternalize(base, deep=deep, **init_args)
             self._input_type = 'object'
+            if lazy:
+                # Internalized on first access
+                self._pending = base
+                return
+            self._iternalize(base, deep=deep, **init_args)
             return
 
         if isinstance(base, TextIOWrapper):
@@ -330,21 +764,265 @@ class BaseRickle:
             self._iternalize(_d, deep=deep, **init_args)
 
         if isinstance(base, list):
-            _l = list()
+            sources = list()
             for i in base:
-                if isinstance(i, dict):
-                    _l.append(i)
-                elif isinstance(i, str):
-                    _l.append( self.__create_dict_from_string(i, **init_args) )
+                if isinstance(i, (dict, str)):
+                    sources.append(i)
                 elif isinstance(i, TextIOWrapper):
-                    _l.append( self.__create_dict_from_string(i.read(), **init_args) )
+                    sources.append(i.read())
                 else:
                     raise TypeError(f"Unable to add type {type(i)}")
 
+            _l = self._load_sources(sources, workers=workers, pool=pool)
             self._iternalize(_l, deep=deep, **init_args)
             self._input_type = 'array'
 
+    @classmethod
+    def _load_source(cls, settings: _NodeSettings, source: str):
+        # Runs in pool workers, so it only takes picklable arguments
+        node = cls.__new__(cls)
+        node._init_node(settings)
+        return node.__create_dict_from_string(source, **settings.init_args)
+
+    def _load_sources(self, sources: list, workers: int = None, pool: str = 'thread') -> list:
+        strings = [s for s in sources if isinstance(s, str)]
+        if workers and workers > 1 and len(strings) > 1:
+            executors = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+            if pool not in executors:
+                raise ValueError(f"Unknown pool '{pool}', use either 'thread' or 'process'")
+            with executors[pool](max_workers=workers) as executor:
+                # Results are given in the order of the sources
+                loaded = iter(list(executor.map(partial(type(self)._load_source, self._settings), strings,
+                                                chunksize=max(1, len(strings) // (workers * 4)))))
+        else:
+            loaded = (self.__create_dict_from_string(s, **self._init_args) for s in strings)
+        return [s if isinstance(s, dict) else next(loaded) for s in sources]
+
+    def _init_node(self, settings: _NodeSettings, input_type: str = None):
+        # Headers are set past ``__setattr__``, nodes are made for every dict in the document
+        set_header = _header_setters
+        set_header['_settings'](self, settings)
+        set_header['_meta_info'](self, _empty_map)
+        set_header['_keys_map'](self, _empty_map)
+        set_header['_names_map'](self, _empty_map)
+        set_header['__list__'](self, ())
+        set_header['_pending'](self, None)
+        set_header['_passable'](self, False)
+        set_header['_input_type'](self, input_type)
+        set_header['_index'](self, None)
+        set_header['_memo'](self, None)
+        set_header['_parent'](self, None)
+        set_header['_gen'](self, settings.versions.generation)
+
+    @property
+    def _strict(self):
+        return self._settings.strict
+
+    @property
+    def _deep(self):
+        return self._settings.deep
+
+    @property
+    def _lazy(self):
+        return self._settings.lazy
+
+    @property
+    def _path_sep(self):
+        return self._settings.path_sep
+
+    @property
+    def _name_cleanup(self):
+        return self._settings.name_cleanup
+
+    @property
+    def _init_args(self):
+        return self._settings.init_args
+
+    def _spawn(self, cls, base: dict):
+        # Child nodes take the settings resolved by the root, instead of going through init again
+        child = cls.__new__(cls)
+        child._init_node(self._settings, 'object')
+        if self._lazy:
+            _header_setters['_pending'](child, base)
+        else:
+            child._iternalize(base, deep=self._deep, **self._init_args)
+        return child
+
+    @classmethod
+    def _reserved_names(cls) -> frozenset:
+        # Computed once per class, instance members are checked separately
+        reserved = cls.__dict__.get('_reserved')
+        if reserved is None:
+            reserved = frozenset(dir(cls)) | {'_reserved'}
+            cls._reserved = reserved
+        return reserved
+
+    def _set_meta(self, name: str, info: dict):
+        self._check_writable()
+        if self._meta_info is _empty_map:
+            self._meta_info = dict()
+        self._meta_info[name] = info
+        if self._memo is not None:
+            self._touch()
+        if self._index is not None and name in self.__dict__:
+            # Loaders set the metadata after the value, the value is indexed under its final type
+            self.__dict__[name] = self._reindex(name, _missing, self.__dict__[name])
+
+    def _materialize(self):
+        pending = self._pending
+        if pending is None:
+            return
+        # Built on a new node and taken over at once, so that other threads see the node either pending or whole
+        node = type(self).__new__(type(self))
+        node._init_node(self._settings)
+        node._input_type = self._input_type
+        if isinstance(pending, BaseRickle):
+            node._copy_containers(pending)
+        else:
+            node._iternalize(pending, deep=self._deep, **self._init_args)
+        # New child nodes belong to the same generation, they are frozen along with this node
+        stack = list(itertools.chain(node.__dict__.values(), node.__list__))
+        while stack:
+            value = stack.pop()
+            if isinstance(value, BaseRickle):
+                value._gen = self._gen
+            elif isinstance(value, list):
+                stack.extend(value)
+        with self._settings.versions.lock:
+            if self._pending is not pending:
+                return
+            self.__dict__ = node.__dict__
+            self.__list__ = node.__list__
+            self._meta_info = node._meta_info
+            self._keys_map = node._keys_map
+            self._names_map = node._names_map
+            self._pending = None
+        if self._frozen():
+            # Read by the snapshots, the indexes and dictionaries kept for the object are left as they are
+            return
+        if self._index is not None:
+            self._repoint_index()
+        if self._memo is not None:
+            self._touch()
+
+    def _lazy_copy(self):
+        # Copy of a node frozen by a snapshot, that reads the node until it is first accessed, see snapshot
+        node = type(self).__new__(type(self))
+        node._init_node(self._settings)
+        node._input_type = self._input_type
+        if self._pending is None:
+            node._pending = self
+        else:
+            # Copies of untouched or copied nodes take the same source, copies of copies are not chained
+            node._pending = self._pending
+            node._passable = self._passable
+        return node
+
+    def _copy_containers(self, source):
+        # The containers of the source, with lazy copies of its child nodes
+        self.__dict__ = {k: _copy_nodes(v) for k, v in source.__dict__.items()}
+        if isinstance(source.__list__, list):
+            self.__list__ = _copy_nodes(source.__list__)
+        if source._meta_info is not _empty_map:
+            self._meta_info = dict(source._meta_info)
+        if source._keys_map is not _empty_map:
+            self._keys_map = dict(source._keys_map)
+            self._names_map = dict(source._names_map)
+
+    def _repoint_index(self):
+        # Copies of child nodes and lists take the place of the originals in the indexes
+        tree, prefix = self._index
+        paths = tree.paths
+        sep = self._path_sep
+        stack = [(f'{prefix}{sep}[{i}]', v) for i, v in enumerate(self.__list__)]
+        stack.extend((f'{prefix}{sep}{self._keys_map.get(k, k)}', v) for k, v in self.__dict__.items())
+        while stack:
+            path, value = stack.pop()
+            if isinstance(value, BaseRickle):
+                value._index = (tree, path)
+            elif isinstance(value, list):
+                stack.extend((f'{path}{sep}[{i}]', v) for i, v in enumerate(value))
+            else:
+                continue
+            if paths is not None and path in paths:
+                paths[path] = value
+
+    def _source(self):
+        # The node that is read, lazy copies read the node they were copied from until they are first accessed
+        pending = self._pending
+        return pending if isinstance(pending, BaseRickle) else self
+
+    def _frozen(self) -> bool:
+        # Nodes of the generation of the last snapshot, or older, belong to the snapshots. They are read and searched
+        # without the indexes, which follow the object.
+        return self._gen <= self._settings.versions.frozen
+
+    def _check_writable(self):
+        # Called before every change
+        if self._frozen():
+            raise SnapshotError('Snapshots are read only, nodes got before a snapshot was taken belong to the snapshot')
+
+    def _pass_through(self):
+        # Untouched lazy nodes are read as is, when dict() gives the same keys and values. Nodes with hidden, renamed,
+        # or reserved keys, or with typed nodes that still need loading, are internalized instead.
+        if self._passable:
+            return self._pending
+        pending = self._pending
+        hidden = self._hidden_key
+        reserved = self._reserved_names() if self._strict else ()
+        renamed = self._allowed_chars_pat.search if self._name_cleanup else None
+        node_types = self._node_types
+        deep = self._deep
+        stack = [pending]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                if node_types and value.get('type') in node_types:
+                    self._materialize()
+                    return None
+                for k, v in value.items():
+                    if not isinstance(k, str) or hidden(k) or k in reserved or (renamed is not None and renamed(k)):
+                        self._materialize()
+                        return None
+                    if isinstance(v, dict) or (deep and isinstance(v, list)):
+                        stack.append(v)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, dict))
+        self._passable = True
+        return pending
+
+    def _raw_copy(self, value):
+        # Untouched lazy input copied as dict() gives it, dicts in lists are copied where deep internalizes them
+        if isinstance(value, dict):
+            return {k: self._raw_copy(v) for k, v in value.items()}
+        if isinstance(value, list):
+            if self._deep:
+                return [self._raw_copy(v) if isinstance(v, dict) else v for v in value]
+            return list(value)
+        return value
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, lazy nodes are internalized on first access
+        if not name.startswith('__') and name not in BaseRickle.__slots__ and self._pending is not None:
+            self._materialize()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        # Keys assigned as attributes are written as item assignment writes them, node headers are set as they are
+        if name in _node_slots:
+            object.__setattr__(self, name, value)
+            return
+        self._materialize()
+        self._check_writable()
+        if self._memo is not None:
+            self._touch()
+        if self._index is not None:
+            value = self._reindex(name, self.__dict__.get(name, _missing), value)
+        self.__dict__[name] = value
+
     def __repr__(self):
+        self._materialize()
         if self._input_type == 'array':
             return "[{}]".format( ", ".join([repr(i) for i in self.__list__]) )
         keys = self.__dict__
@@ -360,34 +1038,27 @@ class BaseRickle:
 
     def __len__(self):
         if self._input_type == 'array':
-            return len(self.__list__)
-        return len(self.dict())
+            return len(self._source().__list__)
+        return sum(1 for _ in self._visible_items())
 
     def __iter__(self):
-        self.__n = 0
-        return self
+        # A new iterator every time, readers do not share a position
+        if self._input_type == 'array':
+            self._materialize()
+            return iter(self.__list__)
+        return iter(self.keys())
 
-    def __next__(self):
-        if self._input_type == "array":
-            try:
-                item = self.__list__[self.__n]
-            except IndexError:
-                raise StopIteration()
-            self.__n += 1
-            return item
-        else:
-            try:
-                item = list(self.dict().keys())[self.__n]
-            except IndexError:
-                raise StopIteration()
-            self.__n += 1
-            return item
+    def __contains__(self, key):
+        if self._input_type == 'array':
+            return key in self._source().__list__
+        return self.has(key)
 
     def __getitem__(self, key):
+        self._materialize()
         if key is None:
             raise KeyError("NoneType is not a valid key type")
         if isinstance(key, str):
-            return self.__dict__[key]
+            return self.__dict__[self._clean_key(key)]
         elif isinstance(key, int):
             return self.__list__[key]
         else:
@@ -395,167 +1066,296 @@ class BaseRickle:
 
 
     def __setitem__(self, key, value):
+        self._materialize()
         if key is None:
             raise KeyError("NoneType is not a valid key type")
+        self._check_writable()
+        if self._memo is not None:
+            self._touch()
         if isinstance(key, str):
+            key = self._clean_key(key)
+            if self._index is not None:
+                value = self._reindex(key, self.__dict__.get(key, _missing), value)
             self.__dict__.update({key: value})
         elif isinstance(key, int):
+            if not self.__list__:
+                raise IndexError('list assignment index out of range')
+            if self._index is not None:
+                i = range(len(self.__list__))[key]
+                value = self._reindex_element(i, self.__list__[i], value)
             self.__list__[key] = value
         else:
             raise TypeError("Key can only be of case sensitive string type or if created from list, an integer index!")
 
     def __delitem__(self, key):
+        self._materialize()
         if key is None:
             raise KeyError("NoneType is not a valid key type")
+        self._check_writable()
+        if self._memo is not None:
+            self._touch()
         if isinstance(key, str):
+            key = self._clean_key(key)
+            if self._index is not None and key in self.__dict__:
+                self._reindex(key, self.__dict__[key])
             del self.__dict__[key]
+            self._unindex_key(key)
         elif isinstance(key, int):
-            del self.__list__[key]
+            if not self.__list__:
+                raise IndexError('list assignment index out of range')
+            if self._index is None:
+                del self.__list__[key]
+                return
+            # Later items shift down, so they are indexed again under their new positions
+            i = range(len(self.__list__))[key]
+            for j in range(i, len(self.__list__)):
+                self._reindex_element(j, self.__list__[j])
+            del self.__list__[i]
+            for j in range(i, len(self.__list__)):
+                self.__list__[j] = self._reindex_element(j, _missing, self.__list__[j])
         else:
             raise TypeError("Key can only be of case sensitive string type or if created from list, an integer index!")
 
-    def _find_key_value(self, key, value, op:str, dictionary=None, parent_path=None, report_parent: bool = False):
-        values = list()
-        if key in dictionary:
-            if (op == '=' and dictionary[key] == value) or \
-                    (op == 'eq' and dictionary[key] == value) or \
-                (op == '!=' and dictionary[key] != value) or \
-                    (op == 'ne' and dictionary[key] != value) or \
-                (op == '>' and dictionary[key] > value) or \
-                    (op == 'gt' and dictionary[key] > value) or \
-                (op == '>=' and dictionary[key] >= value) or \
-                    (op == 'gte' and dictionary[key] >= value) or \
-                (op == '<' and dictionary[key] < value) or \
-                    (op == 'lt' and dictionary[key] < value) or \
-                (op == '<=' and dictionary[key] <= value) or\
-                    (op == 'lte' and dictionary[key] <= value):
-                if report_parent:
-                    values = [f'{parent_path}']
-                else:
-                    values = [f'{parent_path}{self._path_sep}{key}']
-        for k, v in dictionary.items():
-            if isinstance(v, BaseRickle):
-                try:
-                    paths_list = self._find_key_value(key=key, value=value, op=op, dictionary=v.dict(),
-                                              parent_path=f'{parent_path}{self._path_sep}{k}',
-                                                      report_parent=report_parent)
-                    values.extend(paths_list)
-                except StopIteration:
-                    continue
-            if isinstance(v, dict):
-                try:
-                    paths_list = self._find_key_value(key=key, value=value, op=op, dictionary=v,
-                                                      parent_path=f'{parent_path}{self._path_sep}{k}',
-                                                      report_parent=report_parent)
-                    values.extend(paths_list)
-                except StopIteration:
-                    continue
-            if isinstance(v, list):
-                try:
-                    for ix, el in enumerate(v):
-                        if isinstance(el, dict):
-                            paths_list = self._find_key_value(key=key, value=value, op=op, dictionary=el,
-                                                      parent_path=f'{parent_path}{self._path_sep}{k}{self._path_sep}[{ix}]',
-                                                              report_parent=report_parent)
-                            values.extend(paths_list)
-                        if isinstance(el, BaseRickle):
-                            paths_list = self._find_key_value(key=key, value=value, op=op, dictionary=el.dict(),
-                                                      parent_path=f'{parent_path}{self._path_sep}{k}{self._path_sep}[{ix}]',
-                                                              report_parent=report_parent)
-                            values.extend(paths_list)
-                except StopIteration:
-                    continue
-        if len(values) > 0:
-            return values
-        raise StopIteration
+    def _iter_containers(self) -> Iterator[tuple]:
+        # Iterative depth first walk over the internal nodes in document order, as dict() would give them.
+        # Gives the path link and the key-values of each node and dict, by their original key names.
+        # Paths are kept as linked [parent, segment, path] entries, see _link_path.
+        root = [None, None, '']
+        if self._input_type == 'array':
+            stack = [(el, [root, f'[{ix}]', None]) for ix, el in reversed(list(enumerate(self._source().__list__)))
+                     if isinstance(el, (BaseRickle, dict))]
+        else:
+            stack = [(self, root)]
+
+        while stack:
+            container, link = stack.pop()
+            if isinstance(container, BaseRickle):
+                container = container._source()
+            if isinstance(container, BaseRickle) and container._pending is not None:
+                raw = container._pass_through()
+                if raw is not None:
+                    container = raw
+            if isinstance(container, BaseRickle):
+                keys_map = container._keys_map
+                hidden = container._hidden_key
+                container = {keys_map.get(k, k): v for k, v in container.__dict__.items() if not hidden(k)}
+
+            yield link, container
+
+            children = list()
+            for k, v in container.items():
+                if isinstance(v, (BaseRickle, dict)):
+                    children.append((v, [link, k, None]))
+                elif isinstance(v, list):
+                    list_link = [link, k, None]
+                    children.extend((el, [list_link, f'[{ix}]', None]) for ix, el in enumerate(v)
+                                    if isinstance(el, (BaseRickle, dict)))
+            stack.extend(reversed(children))
+
+    def _link_path(self, link: list) -> str:
+        # Path strings are only built for matches, and cached on the links for the matches after
+        chain = list()
+        while link[2] is None:
+            chain.append(link)
+            link = link[0]
+        path = link[2]
+        for link in reversed(chain):
+            path = link[2] = f'{path}{self._path_sep}{link[1]}'
+        return path
+
+    def _iter_matches(self, key: str, match=None, report_parent: bool = False) -> Iterator[str]:
+        for link, values in self._iter_containers():
+            if key in values and (match is None or match(values[key])):
+                parent_path = self._link_path(link)
+                yield parent_path if report_parent else f'{parent_path}{self._path_sep}{key}'
+
+    def _iter_where(self, where: list, any_of: list, report_parent: bool = False) -> Iterator[str]:
+        # All conditions are evaluated in a single walk, per node or dict
+        for link, values in self._iter_containers():
+            keys = [c.key for c in any_of if c.key in values and
+                    _compare(comparison_ops[c.op], values[c.key], c.value)]
+            if where and all(c.key in values and _compare(comparison_ops[c.op], values[c.key], c.value)
+                             for c in where):
+                keys.extend(c.key for c in where)
+            if not keys:
+                continue
+            parent_path = self._link_path(link)
+            if report_parent:
+                yield parent_path
+            else:
+                for key in dict.fromkeys(keys):
+                    yield f'{parent_path}{self._path_sep}{key}'
 
-    def find_key_value(self, key: str, value, op: str, report_parent: bool = False) -> list:
+    def iter_find(self, key: str, value, op: str, report_parent: bool = False) -> Iterator[str]:
+        """
+        Lazily search the current Rickle for paths where the key compares to the value, in document order.
+        Stops walking the document as soon as the caller stops asking for paths.
+
+        Args:
+            key (str): The key to search.
+            value (any): The value to compare to.
+            op (str): The comparison, one of '=', '!=', '>', '>=', '<', '<=', or 'eq', 'ne', 'gt', 'gte', 'lt', 'lte'.
+            report_parent (bool): Give the path to the parent of the key instead (default = False).
+
+        Returns:
+            Iterator[str]: paths found.
+        """
+        compare = comparison_ops.get(op)
+        if compare is None:
+            return iter(())
+        return self._iter_matches(key, match=lambda v: _compare(compare, v, value), report_parent=report_parent)
+
+    def find_key_value(self, key: str, value, op: str, report_parent: bool = False, limit: int = None) -> list:
         """
         Search the current Rickle for all paths that match the search key. Returns empty list if nothing is found.
 
         Args:
             key (str): The key to search.
+            value (any): The value to compare to.
+            op (str): The comparison, one of '=', '!=', '>', '>=', '<', '<=', or 'eq', 'ne', 'gt', 'gte', 'lt', 'lte'.
+            report_parent (bool): Give the path to the parent of the key instead (default = False).
+            limit (int): Stop after this many paths are found (default = None).
+
+        Notes:
+            If the key has a sorted index, see ``create_index``, equality and range comparisons are answered from it.
+            The paths are given in document order either way.
 
         Returns:
             list: all paths found.
         """
-        try:
-            if self._input_type == 'array':
-                return self._find_key_value(key=key,
-                                            value=value,
-                                            op=op,
-                                            dictionary={f'[{ix}]':_d.dict() for ix, _d in enumerate(self.__list__)},
-                                            parent_path='',
-                                            report_parent=report_parent)
-            return self._find_key_value(key=key,
-                                        value=value,
-                                        op=op,
-                                        dictionary=self.dict(),
-                                        parent_path='',
-                                        report_parent=report_parent)
-        except StopIteration:
-            return list()
+        tree = self._fresh_index()
+        if tree is not None and tree.sorted and key in tree.sorted:
+            paths = self._query_sorted(key, value, op)
+            if paths is not None:
+                paths = self._document_order(paths)
+                if report_parent:
+                    paths = (p[:-len(key) - len(self._path_sep)] for p in paths)
+                return list(itertools.islice(paths, limit))
+        return list(itertools.islice(self.iter_find(key, value, op, report_parent=report_parent), limit))
+
+    def _document_order(self, paths) -> list:
+        # Paths of keys in the order that a search finds them. Only the nodes and dicts on the paths are walked, the
+        # keys of each one are listed before the levels below it. List items are taken by index, not walked.
+        sep = self._path_sep
+        trie = dict()
+        for path in paths:
+            branch = trie
+            for segment in path.split(sep)[1:]:
+                branch = branch.setdefault(segment, dict())
+            branch[None] = path
+        ordered = list()
+        stack = [(self, trie)]
+        while stack:
+            value, branch = stack.pop()
+            children = list()
+            for segment, child in self._branch_items(value, branch):
+                sub_branch = branch[segment]
+                if None in sub_branch:
+                    ordered.append(sub_branch[None])
+                if len(sub_branch) > (None in sub_branch):
+                    children.append((child, sub_branch))
+            stack.extend(reversed(children))
+        return ordered
 
-    def _search_path(self, key, dictionary=None, parent_path=None, report_parent: bool = False):
-        values = list()
-        if key in dictionary:
-            if report_parent:
-                values = [f'{parent_path}']
-            else:
-                values = [f'{parent_path}{self._path_sep}{key}']
-        for k, v in dictionary.items():
-            if isinstance(v, BaseRickle):
-                try:
-                    value = self._search_path(key=key, dictionary=v.dict(),
-                                              parent_path=f'{parent_path}{self._path_sep}{k}', report_parent=report_parent)
-                    values.extend(value)
-                except StopIteration:
-                    continue
-            if isinstance(v, dict):
-                try:
-                    value = self._search_path(key=key, dictionary=v, parent_path=f'{parent_path}{self._path_sep}{k}',
-                                              report_parent=report_parent)
-                    values.extend(value)
-                except StopIteration:
-                    continue
-            if isinstance(v, list):
-                try:
-                    for ix, el in enumerate(v):
-                        if isinstance(el, dict):
-                            value = self._search_path(key=key, dictionary=el,
-                                                      parent_path=f'{parent_path}{self._path_sep}{k}{self._path_sep}[{ix}]',
-                                                      report_parent=report_parent)
-                            values.extend(value)
-                        if isinstance(el, BaseRickle):
-                            value = self._search_path(key=key, dictionary=el.dict(),
-                                                      parent_path=f'{parent_path}{self._path_sep}{k}{self._path_sep}[{ix}]',
-                                                      report_parent=report_parent)
-                            values.extend(value)
-                except StopIteration:
-                    continue
-        if len(values) > 0:
-            return values
-        raise StopIteration
+    @staticmethod
+    def _branch_items(value, branch: dict) -> Iterator[tuple]:
+        # The children of a value named by the segments of a branch, in the order of ``_children``
+        if isinstance(value, BaseRickle):
+            value._materialize()
+        items = value.__list__ if isinstance(value, BaseRickle) else value if isinstance(value, list) else ()
+        indexes = 0
+        if items:
+            found = sorted(int(s[1:-1]) for s in branch if s is not None and s[:1] == '[' and s[1:-1].isdigit())
+            indexes = len(found)
+            for ix in found:
+                if ix < len(items):
+                    yield f'[{ix}]', items[ix]
+        if len(branch) - (None in branch) == indexes:
+            return
+        if isinstance(value, BaseRickle):
+            keys_map = value._keys_map
+            for k, v in value.__dict__.items():
+                name = keys_map.get(k, k)
+                if name in branch and not value._hidden_key(k):
+                    yield name, v
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                if k in branch:
+                    yield k, v
+
+    def _query_sorted(self, key: str, value, op: str):
+        compare = comparison_ops.get(op)
+        if compare is None:
+            return None
+        tree, prefix = self._index
+        paths = tree.sorted[key].query(compare, value)
+        if paths is None or not prefix:
+            return paths
+        # Searching below the root of the tree, only the paths under this node are relative to it
+        start = f'{prefix}{self._path_sep}'
+        return [p[len(prefix):] for p in paths if p.startswith(start)]
+
+    def find(self, where: list = None, any_of: list = None, report_parent: bool = False, limit: int = None) -> list:
+        """
+        Find paths matching several conditions in a single pass over the document.
+        All ``where`` conditions have to hold under the same parent, where the keys can differ,
+        for example ``['threshold > 0.2', 'enabled = true']``. Any of the ``any_of`` conditions is enough on its own.
+
+        Notes:
+            Conditions are strings like 'key >= value' or (key, op, value) tuples, see ``parse_condition``.
+            Paths are given in document order, each path only once.
+
+        Args:
+            where (list): Conditions that all have to match (default = None).
+            any_of (list): Conditions of which any has to match (default = None).
+            report_parent (bool): Give the path to the parent of the keys instead (default = False).
+            limit (int): Stop after this many paths are found (default = None).
+
+        Returns:
+            list: all paths found.
+
+        Raises:
+            ValueError: If a condition can not be parsed.
+        """
+        where = [parse_condition(c) for c in where or list()]
+        any_of = [parse_condition(c) for c in any_of or list()]
+        if not where and not any_of:
+            return list()
+        return list(itertools.islice(self._iter_where(where, any_of, report_parent=report_parent), limit))
 
-    def search_path(self, key: str, report_parent: bool = False) -> list:
+    def search_path(self, key: str, report_parent: bool = False, limit: int = None) -> list:
         """
         Search the current Rickle for all paths that match the search key. Returns empty list if nothing is found.
 
+        Notes:
+            After ``build_index``, searches are answered from its index of key names to paths. Changes made through
+            ``set``, ``put``, ``remove``, ``add``, and item or attribute assignment update only the changed part of
+            the index, see ``build_index``. Without an index the document is walked, stopping early with a limit.
+
         Args:
             key (str): The key to search.
+            report_parent (bool): Report the path to the parent of the key instead (default = False).
+            limit (int): Stop after this many paths are found (default = None).
 
         Returns:
             list: all paths found.
         """
-        try:
-            if self._input_type == 'array':
-                return self._search_path(key=key, dictionary={f'[{ix}]':_d.dict() for ix, _d in enumerate(self.__list__)},
-                                         parent_path='', report_parent=report_parent)
-            return self._search_path(key=key, dictionary=self.dict(), parent_path='', report_parent=report_parent)
-        except StopIteration:
+        tree = self._fresh_index()
+        if tree is None or tree.keys is None or tree.root() is None:
+            return list(itertools.islice(self._iter_matches(key, report_parent=report_parent), limit))
+        parents = tree.keys.get(key)
+        if not parents:
             return list()
+        prefix = self._index[1]
+        if prefix:
+            # Searching below the root of the tree, only the paths under this node are relative to it
+            start = f'{prefix}{self._path_sep}'
+            parents = (p[len(prefix):] for p in parents if p == prefix or p.startswith(start))
+        if report_parent:
+            return list(itertools.islice(parents, limit))
+        return [f'{p}{self._path_sep}{key}' for p in itertools.islice(parents, limit)]
 
-    def __call__(self, path: str, **kwargs):
+    def __call__(self, path: Union[str, CompiledPath], **kwargs):
         """
         Rickle objects can be queried via a path string.
 
@@ -564,65 +1364,463 @@ class BaseRickle:
             '/name' => member.
             '/name/[0]' => for lists.
             '/[0]' => for lists types.
+            '/name/*/key', '/name/[*]/key', '//key' => patterns, giving a list of (path, value) matches.
+            Paths can also be given precompiled, see ``compile_path``.
 
         Args:
-            path (str): The path as a string, down to the last mentioned node.
+            path (str, CompiledPath): The path as a string, down to the last mentioned node.
 
         Returns:
-            Any: Value of node of function.
+            Any: Value of node of function, or a list of PathMatch for patterns.
         """
-        if path == self._path_sep:
-            return self
+        path, current_node = self._query_path(path)
+        return self._path_value(path.path, current_node, **kwargs)
+
+    def _path_value(self, path: str, value, **kwargs):
+        # The value given for a resolved path, Rickle calls loaded functions here
+        return value
 
+    def compile_path(self, path: str) -> CompiledPath:
+        """
+        Parse a path once into typed steps, for repeated use with ``__call__``, ``get``, ``set``, ``put``, and ``remove``.
+        String paths are compiled through a bounded LRU cache as well.
+
+        Args:
+            path (str): The path as a string, starting with the path separator.
+
+        Returns:
+            CompiledPath: The compiled path.
+        """
         if not path.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep} at {repr(self)}')
+            raise KeyError(f'Missing root path {self._path_sep}')
+        return compile_path(path, self._path_sep)
 
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', path)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
+    def build_index(self):
+        """
+        Build a flat index of every full path in the tree, like '/path/to/[3]/value', to the node or value found there,
+        and an index of key names to the paths of their parents.
+        Paths found in the index are resolved with a single lookup by ``__call__`` and ``get``, and ``search_path``
+        is answered from the key index.
+
+        Notes:
+            The indexes are kept up to date by ``set``, ``put``, ``remove``, ``add``, the typed ``add_*`` methods,
+            and item and attribute assignment and deletion, which patch only the changed subtree.
+            Lists and dicts in the tree are tracked, they are replaced by tracking copies when first indexed. After
+            one of them is changed in place, the indexes are built anew when next used.
+        """
+        tree = self._tree_index()
+        tree.paths = dict()
+        tree.keys = dict()
+        # Sorted indexes are kept as they are, see ``create_index``
+        sorted_indexes, tree.sorted = tree.sorted, None
+        try:
+            self._index_tree(tree)
+        finally:
+            tree.sorted = sorted_indexes
+
+    def create_index(self, key: str):
+        """
+        Build a sorted index of the values of a key, by its original name, for the whole tree.
+        ``find_key_value`` answers equality and range comparisons on the key from the index in O(log n + k).
 
+        Notes:
+            Values are ordered as numbers or as strings, whichever the key holds first. Other values of the key are
+            kept aside, they are compared one by one for equality, and range comparisons fall back to a full search.
+            The index is kept up to date as described in ``build_index``. Calling ``create_index`` again for the
+            key builds its index anew.
 
-        path_list = path.split(self._path_sep)
+        Args:
+            key (str): The key to index.
+        """
+        tree = self._tree_index()
+        sorted_indexes = tree.sorted or dict()
+        index = _SortedIndex()
+        # Only the new index is filled by the walk, the other sorted indexes are set aside
+        tree.sorted = {key: index}
+        try:
+            index.load(partial(self._index_tree, tree))
+        finally:
+            sorted_indexes[key] = index
+            tree.sorted = sorted_indexes
 
-        for node_name in path_list[path_start_index:]:
-            list_index_match = re.match(r'\[(\d+)\]', node_name)
-            if list_index_match and isinstance(current_node, list):
-                current_node = current_node[int(list_index_match.group(1))]
+    def drop_index(self, key: str = None):
+        """
+        Remove the path and key indexes built by ``build_index``, and the sorted indexes built by ``create_index``.
+
+        Args:
+            key (str): Only remove the sorted index of this key (default = None).
+        """
+        if self._index is None or self._frozen():
+            return
+        tree = self._index[0]
+        if key is not None:
+            if tree.sorted:
+                tree.sorted.pop(key, None)
+            return
+        tree.paths = None
+        tree.keys = None
+        tree.sorted = None
+        root = tree.root() if tree.root is not None else None
+        for node in (self, root):
+            if node is not None:
+                node._detach_index()
+
+    def _tree_index(self):
+        # Indexes are shared by the whole tree, a node without a (living) root starts its own
+        if self._frozen():
+            raise SnapshotError('Snapshots are read only, they are searched without indexes')
+        if self._index is not None:
+            tree = self._index[0]
+            if tree.root is not None and tree.root() is not None:
+                return tree
+        tree = _TreeIndex(weakref.ref(self))
+        self._index = (tree, '')
+        return tree
+
+    def _fresh_index(self):
+        # The indexes of the tree, if the node has any and they can be used. After lists or dicts of the tree were
+        # changed in place, the indexes are built again.
+        if self._index is None or self._frozen():
+            return None
+        tree = self._index[0]
+        if not tree.stale:
+            return tree
+        tree.stale = False
+        root = tree.root() if tree.root is not None else None
+        if root is None or root._frozen():
+            # Can not be built again from here, searches go without them
+            tree.paths = None
+            tree.keys = None
+            tree.sorted = None
+            return tree
+        if tree.paths is not None:
+            root.build_index()
+        for key in list(tree.sorted or ()):
+            root.create_index(key)
+        return tree
+
+    def _index_tree(self, tree):
+        root = tree.root()
+        if root._pending is not None:
+            root._materialize()
+        root._index_node(tree, '')
+        for i, value in enumerate(root.__list__):
+            root.__list__[i] = root._index_element(tree, f'{root._path_sep}[{i}]', value, True)
+
+    def _detach_index(self):
+        self._index = None
+        for value in itertools.chain(self.__dict__.values(), self.__list__):
+            if isinstance(value, BaseRickle):
+                value._detach_index()
+            elif isinstance(value, list):
+                for v in value:
+                    if isinstance(v, BaseRickle):
+                        v._detach_index()
+
+    def _index_node(self, tree, prefix: str, searchable: bool = True):
+        if self._pending is not None:
+            self._materialize()
+        self._index = (tree, prefix)
+        if tree.keys is not None and searchable:
+            # Keys of a level are listed before the levels below, in the same order as a full search
+            for key in self.__dict__:
+                if not self._hidden_key(key):
+                    tree.keys.setdefault(self._keys_map.get(key, key), dict())[prefix] = None
+        for key, value in self.__dict__.items():
+            indexed = self._index_value(tree, prefix, key, value, searchable and not self._hidden_key(key))
+            if indexed is not value:
+                self.__dict__[key] = indexed
+
+    def _index_value(self, tree, prefix: str, key: str, value, searchable: bool):
+        # Gives the value as it is kept in the tree, indexed lists and dicts are tracked
+        name = self._keys_map.get(key, key)
+        path = f'{prefix}{self._path_sep}{name}'
+        if isinstance(value, list) or (isinstance(value, dict) and searchable
+                                       and (tree.keys is not None or tree.sorted)):
+            value = self._track(value, tree)
+        if tree.paths is not None:
+            tree.paths[path] = value
+        if tree.sorted and searchable and name in tree.sorted:
+            tree.sorted[name].add(value, path)
+        if isinstance(value, BaseRickle):
+            value._index_node(tree, path, searchable)
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                indexed = self._index_element(tree, f'{path}{self._path_sep}[{i}]', v, searchable)
+                if indexed is not v:
+                    list.__setitem__(value, i, indexed)
+        elif isinstance(value, dict) and searchable and (tree.keys is not None or tree.sorted):
+            self._index_keys(tree, path, value)
+        return value
+
+    def _track(self, value, tree):
+        tracked = _tracked(value, tree)
+        if tracked is not value and self._memo is not None:
+            # The kept dict() holds the list or dict that was replaced
+            self._touch()
+        return tracked
+
+    def _index_element(self, tree, path: str, value, searchable: bool):
+        if isinstance(value, dict) and searchable and (tree.keys is not None or tree.sorted):
+            value = self._track(value, tree)
+        if tree.paths is not None:
+            tree.paths[path] = value
+        if isinstance(value, BaseRickle):
+            value._index_node(tree, path, searchable)
+        elif isinstance(value, dict) and searchable and (tree.keys is not None or tree.sorted):
+            self._index_keys(tree, path, value)
+        return value
+
+    def _index_keys(self, tree, parent_path: str, dictionary: dict, remove: bool = False):
+        # Plain dictionaries are only in the key and sorted indexes, they are searched but not reachable through the
+        # path index. When indexed, the lists and dicts in them are tracked.
+        keys = tree.keys
+        for k, v in dictionary.items():
+            if keys is not None:
+                if remove:
+                    parents = keys.get(k)
+                    if parents is not None:
+                        parents.pop(parent_path, None)
+                        if not parents:
+                            del keys[k]
+                else:
+                    keys.setdefault(k, dict())[parent_path] = None
+            if tree.sorted and k in tree.sorted:
+                if remove:
+                    tree.sorted[k].discard(v, f'{parent_path}{self._path_sep}{k}')
+                else:
+                    tree.sorted[k].add(v, f'{parent_path}{self._path_sep}{k}')
+        for k, v in dictionary.items():
+            if isinstance(v, (dict, list)) and not remove:
+                v = self._track(v, tree)
+                dict.__setitem__(dictionary, k, v)
+            if isinstance(v, dict):
+                self._index_keys(tree, f'{parent_path}{self._path_sep}{k}', v, remove)
+            elif isinstance(v, list):
+                for ix, el in enumerate(v):
+                    if isinstance(el, dict):
+                        if not remove:
+                            el = self._track(el, tree)
+                            list.__setitem__(v, ix, el)
+                        self._index_keys(tree, f'{parent_path}{self._path_sep}{k}{self._path_sep}[{ix}]', el, remove)
+
+    def _unindex_node(self, tree, prefix: str, searchable: bool):
+        self._index = None
+        # Lazy copies are indexed as the node they were copied from
+        node = self._source()
+        for key, value in node.__dict__.items():
+            node._unindex_value(tree, prefix, key, value, searchable)
+
+    def _unindex_value(self, tree, prefix: str, key: str, value, searchable: bool):
+        name = self._keys_map.get(key, key)
+        path = f'{prefix}{self._path_sep}{name}'
+        searchable = searchable and not self._hidden_key(key)
+        if tree.keys is not None and searchable:
+            parents = tree.keys.get(name)
+            if parents is not None:
+                parents.pop(prefix, None)
+                if not parents:
+                    del tree.keys[name]
+        if tree.paths is not None:
+            tree.paths.pop(path, None)
+        if tree.sorted and searchable and name in tree.sorted:
+            tree.sorted[name].discard(value, path)
+        if isinstance(value, BaseRickle):
+            value._unindex_node(tree, path, searchable)
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                self._unindex_element(tree, f'{path}{self._path_sep}[{i}]', v, searchable)
+        elif isinstance(value, dict) and searchable and (tree.keys is not None or tree.sorted):
+            self._index_keys(tree, path, value, remove=True)
+
+    def _unindex_element(self, tree, path: str, value, searchable: bool):
+        if tree.paths is not None:
+            tree.paths.pop(path, None)
+        if isinstance(value, BaseRickle):
+            value._unindex_node(tree, path, searchable)
+        elif isinstance(value, dict) and searchable and (tree.keys is not None or tree.sorted):
+            self._index_keys(tree, path, value, remove=True)
+
+    def _reindex(self, key: str, old_value, new_value=_missing):
+        # Patches only the subtree below the changed key, and gives the new value as it is to be kept
+        tree, prefix = self._index
+        if old_value is not _missing:
+            self._unindex_value(tree, prefix, key, old_value, True)
+        if new_value is not _missing:
+            searchable = not self._hidden_key(key)
+            if tree.keys is not None and searchable:
+                tree.keys.setdefault(self._keys_map.get(key, key), dict())[prefix] = None
+            new_value = self._index_value(tree, prefix, key, new_value, searchable)
+        return new_value
+
+    def _reindex_element(self, i: int, old_value, new_value=_missing):
+        tree, prefix = self._index
+        path = f'{prefix}{self._path_sep}[{i}]'
+        if old_value is not _missing:
+            self._unindex_element(tree, path, old_value, True)
+        if new_value is not _missing:
+            new_value = self._index_element(tree, path, new_value, True)
+        return new_value
+
+    def _query_path(self, path: Union[str, CompiledPath], strip_params: bool = False) -> tuple:
+        if not isinstance(path, CompiledPath):
+            if not path.startswith(self._path_sep):
+                raise KeyError(f'Missing root path {self._path_sep} at {repr(self)}')
+            path = compile_path(path, self._path_sep)
+
+        if path.pattern:
+            return path, self._query_pattern(path)
+
+        tree = self._fresh_index()
+        if tree is not None and tree.paths is not None:
+            current_node = tree.paths.get(self._index[1] + path.path, _missing)
+            frozen = self._settings.versions.frozen
+            # Until the nodes above them are copied, the index holds the nodes and lists of the snapshots
+            if current_node is not _missing and (frozen < 0 or not isinstance(current_node, (BaseRickle, list, dict))
+                                                 or (isinstance(current_node, BaseRickle) and current_node._gen > frozen)):
+                return path, current_node
+
+        if path.root_index is not None:
+            self._materialize()
+        current_node = self if path.root_index is None else self.__list__[path.root_index]
+        for step in path.steps:
+            if step.index is not None and isinstance(current_node, list):
+                current_node = current_node[step.index]
             else:
-                current_node = current_node.get(node_name)
+                current_node = current_node.get(step.key if strip_params else step.segment)
             if current_node is None:
-                raise NameError(f'The path {path} could not be traversed. Alternatively use "get"')
-
-        return current_node
+                raise NameError(f'The path {path.path} could not be traversed. Alternatively use "get"')
+
+        return path, current_node
+
+    def _children(self, path: str, value) -> Iterator[tuple]:
+        # Key-values of nodes and dicts by their original names, and list items, with their paths
+        sep = self._path_sep
+        if isinstance(value, BaseRickle):
+            value._materialize()
+            for ix, item in enumerate(value.__list__):
+                yield f'{path}{sep}[{ix}]', item
+            keys_map = value._keys_map
+            for k, v in value.__dict__.items():
+                if not value._hidden_key(k):
+                    yield f'{path}{sep}{keys_map.get(k, k)}', v
+        elif isinstance(value, dict):
+            for k, v in value.items():
+                yield f'{path}{sep}{k}', v
+        elif isinstance(value, list):
+            for ix, item in enumerate(value):
+                yield f'{path}{sep}[{ix}]', item
+
+    def _descendants(self, path: str, value) -> Iterator[tuple]:
+        # The value itself and everything below it, in document order
+        stack = [(path, value)]
+        while stack:
+            path, value = stack.pop()
+            yield path, value
+            stack.extend(reversed(list(self._children(path, value))))
+
+    def _match_step(self, step, path: str, value) -> Iterator[tuple]:
+        sep = self._path_sep
+        is_list = isinstance(value, list) or (isinstance(value, BaseRickle) and value._input_type == 'array')
+        if step.segment == '[*]':
+            if is_list:
+                yield from self._children(path, value)
+        elif step.segment == '*':
+            if not is_list:
+                yield from self._children(path, value)
+        elif step.index is not None and is_list:
+            items = value if isinstance(value, list) else value.__list__
+            if step.index < len(items):
+                yield f'{path}{sep}{step.segment}', items[step.index]
+        elif isinstance(value, BaseRickle):
+            value._materialize()
+            key = value._clean_key(step.segment)
+            if key in value.__dict__:
+                yield f'{path}{sep}{step.segment}', value.__dict__[key]
+        elif isinstance(value, dict):
+            if step.segment in value:
+                yield f'{path}{sep}{step.segment}', value[step.segment]
+
+    def _query_pattern(self, path: CompiledPath) -> list:
+        # Every step is applied to all matches of the step before it, descendant steps first widen to the subtrees
+        self._materialize()
+        if path.root_index is None:
+            matches = [('', self)]
+        else:
+            matches = [(f'{self._path_sep}[{path.root_index}]', self.__list__[path.root_index])]
+        for step in path.steps:
+            if step.descendant:
+                matches = dict(pair for p, v in matches for pair in self._descendants(p, v)).items()
+            matches = [pair for p, v in matches for pair in self._match_step(step, p, v)]
+        return [PathMatch(path=p, value=v) for p, v in dict(matches).items()]
+
+    def _compile_key(self, key: Union[str, CompiledPath], allow_pattern: bool = False) -> CompiledPath:
+        # Keys for set, put, and remove may leave out the root
+        if not isinstance(key, CompiledPath):
+            if self._path_sep in key and not key.startswith(self._path_sep):
+                raise KeyError(f'Missing root path {self._path_sep}')
+            if not self._path_sep in key:
+                key = f"{self._path_sep}{key}"
+            key = compile_path(key, self._path_sep)
+        if key.pattern and not allow_pattern:
+            raise KeyError(f'The path {key.path} is a pattern, patterns can only be used to get values')
+        return key
 
     def _eval_name(self, name):
-        if str(name).__contains__(self.__class__.__name__) or str(name).endswith('__n') or str(name).startswith('_'):
-            return True
-        else:
-            return False
+        name = str(name)
+        return name.startswith('_') or name.endswith('__n') or self.__class__.__name__ in name
+
+    def _hidden_key(self, key) -> bool:
+        # Keys left out of dict(), and so out of searches
+        key = str(key)
+        return key.startswith('_') or key.endswith(('__n', '_meta_info')) or self.__class__.__name__ in key
 
     def _check_kw(self, name):
-        if self._strict and name in dir(self):
+        if self._pending is not None:
+            self._materialize()
+        self._check_writable()
+        settings = self._settings
+        if settings.strict and (name in self._reserved_names() or name in self.__dict__):
             raise NameError(f"Unable to add key '{name}', reserved keyword in Rickle. Use strict=False.")
 
-        if not self._name_cleanup:
-            return name
-        clean_name = self._allowed_chars_pat.sub('', name)
+        clean_name = self._allowed_chars_pat.sub('', name) if settings.name_cleanup else name
+        if self._memo is not None:
+            self._touch()
+        if self._index is not None and clean_name in self.__dict__:
+            # The value is replaced next, removed from the indexes while its key and metadata are still known
+            self._reindex(clean_name, self.__dict__[clean_name])
         if clean_name != name:
-            self._keys_map[clean_name] = name
+            self._index_key(clean_name, name)
 
         return clean_name
 
+    def _index_key(self, clean_name, name):
+        # Keeps the cleaned to original key map and its reverse in step
+        if self._keys_map is _empty_map:
+            self._keys_map = dict()
+            self._names_map = dict()
+        previous = self._keys_map.get(clean_name)
+        if previous is not None:
+            self._names_map.pop(previous, None)
+        self._keys_map[clean_name] = name
+        self._names_map[name] = clean_name
+
+    def _unindex_key(self, clean_name):
+        name = self._keys_map.pop(clean_name, None)
+        if name is not None:
+            self._names_map.pop(name, None)
+
+    def _clean_key(self, name):
+        # Original (uncleaned) key names resolve to the cleaned name in O(1)
+        return self._names_map.get(name, name)
+
     def _recursive_search(self, dictionary, key):
         if key in dictionary:
             return dictionary[key]
         for k, v in dictionary.items():
             if isinstance(v, BaseRickle):
                 try:
+                    v._materialize()
                     value = self._recursive_search(v.__dict__, key)
                     return value
                 except StopIteration:
@@ -639,16 +1837,128 @@ class BaseRickle:
         """
         Iterate through all key value pairs. Rickle is destructed into dict.
 
-        Yields:
-            tuple: str, object.
+        Notes:
+            The view is live, values are destructed one at a time as they are iterated.
+
+        Returns:
+            view: of (str, object) tuples.
+        """
+        return _ItemsView(self)
+
+    def _visible_items(self, copy: bool = False):
+        # Top level (name, value) pairs as dict() gives them, without destructing the values. Values of untouched
+        # lazy nodes are copied when they are handed out.
+        if isinstance(self._pending, BaseRickle):
+            return self._pending._visible_items(copy)
+        if self._pending is not None:
+            raw = self._pass_through()
+            if raw is not None:
+                return ((k, self._raw_copy(v)) for k, v in raw.items()) if copy else iter(raw.items())
+        keys_map = self._keys_map
+        return ((keys_map.get(k, k), v) for k, v in self.__dict__.items()
+                if not self._hidden_key(k) and not self._eval_name(keys_map.get(k, k)))
+
+    def _visible_key(self, name):
+        # Internal key of a name that dict() gives, or None. Cleaned names of renamed keys are not given by dict().
+        key = self._clean_key(name)
+        if key in self.__dict__ and self._keys_map.get(key, key) == name and not self._hidden_key(key) and \
+                not self._eval_name(name):
+            return key
+        return None
+
+    def _visible_value(self, name):
+        # Value of a name that dict() gives, without destructing it
+        if isinstance(self._pending, BaseRickle):
+            return self._pending._visible_value(name)
+        if self._pending is not None:
+            raw = self._pass_through()
+            if raw is not None:
+                return raw[name]
+        key = self._visible_key(name)
+        if key is None:
+            raise KeyError(name)
+        return self.__dict__[key]
+
+    def as_mapping(self) -> Union[Mapping, Sequence]:
         """
-        d = self.dict()
-        for key in d.keys():
-            if self._eval_name(key):
-                continue
-            yield key, d[key]
+        Read-only view of the object, with the same keys and values as ``dict`` (or ``list`` for arrays), without
+        copying anything. Nested nodes and lists are given as views as well.
+
+        Notes:
+            The view reads the current state of the object. It can be given to the JSON and YAML backends,
+            ``flatten_dict``, and ``Schema.schema_validation`` as is.
 
-    def get(self, key: str, default=None, do_recursive: bool = False):
+        Returns:
+            Mapping: view of self, or Sequence if type is 'array'.
+        """
+        if self._input_type == 'array':
+            return _SequenceProxy(self._source().__list__)
+        return _MappingProxy(self)
+
+    def snapshot(self):
+        """
+        Take a read-only snapshot of the current state in O(1), that stays the same while the object is changed.
+        The snapshot takes over the nodes of the object, which are frozen from then on. The object reads them until
+        it is changed, and makes a copy of a node, sharing the nodes below it, the first time the node is accessed
+        through the object. Only the accessed part of the object is copied.
+
+        Notes:
+            Snapshots are meant to be read by other threads while one thread changes the object, take them from the
+            thread that changes it.
+            Nodes got from a snapshot, and nodes got from the object before the snapshot was taken, belong to the
+            snapshot. Changing them raises SnapshotError, get them from the object again to change them. Generations
+            are counted per object, a snapshot of a node inside an object freezes the nodes of the whole object.
+            Nodes created on their own and added to the object, and lists, metadata, and attributes changed in
+            place, are not frozen.
+            Searches of a snapshot walk the document, the indexes follow the object.
+
+        Returns:
+            BaseRickle: The snapshot, changing it raises SnapshotError (a TypeError).
+        """
+        if self._frozen():
+            return self
+        versions = self._settings.versions
+        with versions.lock:
+            frozen = versions.generation
+            versions.generation = frozen + 1
+
+        snapshot = type(self).__new__(type(self))
+        snapshot._init_node(self._settings)
+        # The snapshot takes over the containers, this node reads them until it is first accessed
+        snapshot.__dict__ = self.__dict__
+        snapshot.__list__ = self.__list__
+        snapshot._meta_info = self._meta_info
+        snapshot._keys_map = self._keys_map
+        snapshot._names_map = self._names_map
+        snapshot._pending = self._pending
+        snapshot._passable = self._passable
+        snapshot._input_type = self._input_type
+        snapshot._memo = self._memo
+        snapshot._gen = frozen
+        copy = snapshot._lazy_copy()
+
+        self.__dict__ = copy.__dict__
+        self.__list__ = ()
+        self._meta_info = _empty_map
+        self._keys_map = _empty_map
+        self._names_map = _empty_map
+        self._pending = copy._pending
+        self._passable = copy._passable
+        self._memo = None
+        self._gen = frozen + 1
+        versions.frozen = frozen
+        return snapshot
+
+    @staticmethod
+    def _top_value(value):
+        # Same as the values in dict(), one level at a time
+        if isinstance(value, BaseRickle):
+            return value.dict()
+        if isinstance(value, list):
+            return [e.dict() if isinstance(e, BaseRickle) else e for e in value]
+        return value
+
+    def get(self, key: Union[str, CompiledPath], default=None, do_recursive: bool = False):
         """
         Acts as a regular get from a dictionary but can employ a recursive search of structure and returns the first found key-value pair.
 
@@ -656,22 +1966,23 @@ class BaseRickle:
             Document paths like '/root/to/path' can also be used. If the path can not be traversed, the default value is returned.
 
         Args:
-            key (str): key string being searched.
+            key (str, CompiledPath): key string or path being searched.
             default (any): Return value if nothing is found.
             do_recursive (bool): Search recursively until first match is found (default = False).
 
         Returns:
             obj: value found, or None for nothing found.
         """
+        if self._pending is not None:
+            self._materialize()
         try:
-            if self._path_sep in key:
+            if isinstance(key, CompiledPath) or self._path_sep in key:
                 v = self(key)
                 return v
             if do_recursive:
                 value = self._recursive_search(self.__dict__, key)
             else:
-                if key in self._keys_map.values():
-                    key = next((k for k, v in self._keys_map.items() if v == key), None)
+                key = self._clean_key(key)
                 value = self.__dict__.get(key, default)
             return value
         except StopIteration:
@@ -681,7 +1992,7 @@ class BaseRickle:
         except Exception as ex:
             raise ex
 
-    def set(self, key: str, value):
+    def set(self, key: Union[str, CompiledPath], value):
         """
         As with the `get` method, this method can be used to update the inherent dictionary with new values.
 
@@ -689,46 +2000,47 @@ class BaseRickle:
             Document paths like '/root/to/path' can also be used. If the path can not be traversed, an error is raised.
 
         Args:
-            key (str): key string to set.
+            key (str, CompiledPath): key string or compiled path to set.
             value: Any Python like value that can be deserialised.
         """
+        path = self._compile_key(key)
 
-        if self._path_sep in key and not key.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep}')
-        if not self._path_sep in key:
-            key = f"{self._path_sep}{key}"
-
-        if key == self._path_sep:
+        if not path.steps and path.root_index is None:
             raise KeyError('Can not set a value to self')
 
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', key)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
-        path_list = key.split(self._path_sep)
-
-        for node_name in path_list[path_start_index:-1]:
+        self._materialize()
+        current_node = self if path.root_index is None else self.__list__[path.root_index]
+        if not path.steps:
+            raise NameError(f'The path {path.path} could not be set, try using put')
+
+        # Paths through lists raised KeyError before lists could be traversed, they still do when they can not be set
+        error = NameError
+        for step in path.steps[:-1]:
+            if step.index is not None and isinstance(current_node, list):
+                if step.index >= len(current_node):
+                    raise KeyError(f'The path {path.path} could not be traversed')
+                current_node = current_node[step.index]
+                error = KeyError
+                continue
             if not isinstance(current_node, self.__class__):
-                raise KeyError(f'The path {key} could not be traversed')
-            current_node = current_node.get(node_name)
+                raise KeyError(f'The path {path.path} could not be traversed')
+            current_node = current_node.get(step.segment)
             if current_node is None:
-                raise KeyError(f'The path {key} could not be traversed')
+                raise KeyError(f'The path {path.path} could not be traversed')
 
-        if '?' in path_list[-1]:
-            raise KeyError(f'Function params "{path_list[-1]}" included in path!')
+        name = path.steps[-1].segment
+        if path.steps[-1].params is not None:
+            raise KeyError(f'Function params "{name}" included in path!')
 
         if not isinstance(current_node, self.__class__):
-            raise NameError(f'The path {key} could not be set, try using put')
+            raise error(f'The path {path.path} could not be set, try using put')
 
-        if current_node.has(path_list[-1]):
-            current_node[path_list[-1]] = value
+        if current_node.has(name):
+            current_node[name] = value
         else:
-            raise NameError(f'The path {key} could not be set, try using put')
+            raise error(f'The path {path.path} could not be set, try using put')
 
-    def put(self, key: str, value):
+    def put(self, key: Union[str, CompiledPath], value):
         """
         As with the `get` method, this method can be used to update the inherent dictionary with new values.
 
@@ -736,110 +2048,305 @@ class BaseRickle:
             Document paths like '/root/to/path' can also be used. If the path can not be traversed, an error is raised.
 
         Args:
-            key (str): key string to set.
+            key (str, CompiledPath): key string or compiled path to set.
             value: Any Python like value that can be deserialised.
         """
+        path = self._compile_key(key)
 
-        if self._path_sep in key and not key.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep}')
-        if not self._path_sep in key:
-            key = f"{self._path_sep}{key}"
-
-        if key == self._path_sep:
+        if not path.steps and path.root_index is None:
             raise KeyError('Can not set a value to self')
 
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', key)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
-        path_list = key.split(self._path_sep)
+        self._materialize()
+        current_node = self if path.root_index is None else self.__list__[path.root_index]
+        if not path.steps:
+            raise NameError(f'The path {path.path} could not be set, try using put')
 
-        for node_name in path_list[path_start_index:-1]:
+        for step in path.steps[:-1]:
+            if step.index is not None and isinstance(current_node, list):
+                current_node = current_node[step.index]
+                continue
             if not isinstance(current_node, self.__class__):
-                raise KeyError(f'The path {key} could not be traversed')
-            next_node = current_node.get(node_name)
+                raise KeyError(f'The path {path.path} could not be traversed')
+            next_node = current_node.get(step.segment)
             if next_node is None or not isinstance(next_node, self.__class__):
-                next_node = self.__class__()
-                if current_node.has(node_name):
-                    current_node.remove(node_name)
-                current_node.add(node_name, next_node)
+                # New nodes belong to the tree, so that its snapshots freeze them as well
+                next_node = current_node._spawn(self.__class__, dict())
+                if current_node.has(step.segment):
+                    current_node.remove(step.segment)
+                current_node.add(step.segment, next_node)
             current_node = next_node
 
-
-        if '?' in path_list[-1]:
-            raise KeyError(f'Function params "{path_list[-1]}" included in path!')
+        name = path.steps[-1].segment
+        if path.steps[-1].params is not None:
+            raise KeyError(f'Function params "{name}" included in path!')
 
         if not isinstance(current_node, self.__class__):
-            raise NameError(f'The path {key} could not be set, try using put')
+            raise NameError(f'The path {path.path} could not be set, try using put')
 
-        if current_node.has(path_list[-1]):
-            current_node[path_list[-1]] = value
+        if current_node.has(name):
+            current_node[name] = value
         else:
-            current_node.add(path_list[-1], value)
+            current_node.add(name, value)
 
-    def remove(self, key: str):
+    def remove(self, key: Union[str, CompiledPath]):
         """
         Removes using path.
 
         Args:
-            key (str): Path to key-value to be removed.
+            key (str, CompiledPath): Path to key-value to be removed.
         """
-        if self._path_sep in key and not key.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep}')
-        if not self._path_sep in key:
-            key = f"{self._path_sep}{key}"
+        path = self._compile_key(key)
 
-        if key == self._path_sep:
+        if not path.steps and path.root_index is None:
             raise NameError('Can not remove self')
 
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', key)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
+        self._materialize()
+        current_node = self if path.root_index is None else self.__list__[path.root_index]
+        if not path.steps:
+            raise KeyError(f'The path {path.path} could not be removed')
+
+        # Plain dictionaries and lists may belong to a snapshot, nodes loaded lazily share them with their copies
+        shared = self._settings.versions.frozen >= 0
+        owner = current_node
+        anchor = None
+        for step in path.steps[:-1]:
+            parent = current_node
+            key = step.index
+            if step.index is not None and isinstance(current_node, list):
+                if step.index >= len(current_node):
+                    # Lists could not be traversed before, walking into them raised AttributeError
+                    raise AttributeError(f'The path {path.path} could not be traversed')
+                current_node = current_node[step.index]
+            else:
+                if isinstance(current_node, BaseRickle) and current_node._index is not None:
+                    current_node._materialize()
+                    anchor = (current_node, current_node._clean_key(step.segment))
+                key = step.segment
+                current_node = current_node.get(step.segment)
+                if current_node is None:
+                    raise NameError(f'The path {path.path} could not be traversed')
+                if isinstance(parent, BaseRickle):
+                    owner = parent
+                    key = parent._clean_key(step.segment)
+                    parent = parent.__dict__
+            if shared and isinstance(current_node, (dict, list)):
+                owner._check_writable()
+                current_node = dict(current_node) if isinstance(current_node, dict) else list(current_node)
+                parent[key] = current_node
+                if owner._memo is not None:
+                    owner._touch()
+
+        name = path.steps[-1].segment
+        if path.steps[-1].params is not None:
+            raise KeyError(f'Function params "{name}" included in path!')
+
+        if not isinstance(current_node, (BaseRickle, dict)):
+            # Only keys of nodes and dictionaries are removed, as before
+            raise AttributeError(f'The path {path.path} could not be traversed')
+        if isinstance(current_node, BaseRickle) or anchor is None:
+            del current_node[name]
+            return
+        # Plain dictionaries are not indexed nodes, the subtree under the closest node is indexed again
+        node, anchor_key = anchor
+        node._reindex(anchor_key, node.__dict__[anchor_key])
+        try:
+            # Not an untracked change, the index is patched around it
+            dict.__delitem__(current_node, name)
+        finally:
+            node.__dict__[anchor_key] = node._reindex(anchor_key, _missing, node.__dict__[anchor_key])
 
-        path_list = key.split(self._path_sep)
+    def get_many(self, paths: list, default=None) -> list:
+        """
+        Get the values of many paths at once. Paths are grouped by their shared prefixes, so that every shared part
+        of the document is walked only once.
 
-        for node_name in path_list[path_start_index:-1]:
-            current_node = current_node.get(node_name)
-            if current_node is None:
-                raise NameError(f'The path {key} could not be traversed')
+        Args:
+            paths (list): Paths as strings or compiled paths, like '/root/to/path'. Patterns are also allowed.
+            default (any): Return value for paths that can not be traversed (default = None).
+
+        Returns:
+            list: The values in the same order as the paths, or a list of PathMatch for patterns.
+        """
+        self._materialize()
+        paths = [self._batch_path(path) for path in paths]
+        results = [default] * len(paths)
+        patterns = [self._is_pattern(path) for path in paths]
+        trie = self._path_trie(None if pattern else path for path, pattern in zip(paths, patterns))
+        self._read_trie(self, trie, paths, results)
+        for position, pattern in enumerate(patterns):
+            if pattern:
+                results[position] = self._query_pattern(compile_path(paths[position], self._path_sep))
+        return results
+
+    def set_many(self, mapping: dict):
+        """
+        Set the values of many existing paths at once, like ``set``. Paths are grouped by their shared prefixes,
+        so that every shared part of the document is walked only once.
+
+        Note:
+            Paths are checked before any value is set, a path can not also be the prefix of another path in the batch.
+            If a path can not be traversed, an error is raised, values set before it are kept.
+
+        Args:
+            mapping (dict): Paths, as strings or compiled paths, to the values to set.
+        """
+        self._write_many(mapping, create=False)
+
+    def put_many(self, mapping: dict):
+        """
+        Put the values of many paths at once, like ``put``. Paths are grouped by their shared prefixes,
+        so that every shared part of the document is walked only once, and missing nodes are created only once.
 
-        if '?' in path_list[-1]:
-            raise KeyError(f'Function params "{path_list[-1]}" included in path!')
+        Note:
+            Paths are checked before any value is put, a path can not also be the prefix of another path in the batch.
+
+        Args:
+            mapping (dict): Paths, as strings or compiled paths, to the values to put.
+        """
+        self._write_many(mapping, create=True)
+
+    def _batch_path(self, key: Union[str, CompiledPath]) -> str:
+        # Batched paths are grouped as strings, only the steps of shared prefixes are compiled
+        if isinstance(key, CompiledPath):
+            return key.path
+        if self._path_sep not in key:
+            return f"{self._path_sep}{key}"
+        if not key.startswith(self._path_sep):
+            raise KeyError(f'Missing root path {self._path_sep}')
+        return key
+
+    def _is_pattern(self, path: str) -> bool:
+        if '*' in path or f'{self._path_sep}{self._path_sep}' in path:
+            return compile_path(path, self._path_sep).pattern
+        return False
+
+    def _path_trie(self, paths) -> dict:
+        # Paths grouped step by step, so that a shared prefix is a single branch. Branches are keyed by their PathStep,
+        # the positions of the paths ending at a branch are listed under None. Paths given as None are left out.
+        sep = self._path_sep
+        segments = dict()
+        for position, path in enumerate(paths):
+            if path is None:
+                continue
+            branch = segments
+            for segment in (path.split(sep)[1:] if path != sep else ()):
+                branch = branch.setdefault(segment, dict())
+            branch.setdefault(None, list()).append(position)
+
+        def _steps(branch):
+            return {k if k is None else path_step(k): v if k is None else _steps(v) for k, v in branch.items()}
+
+        return _steps(segments)
+
+    def _read_trie(self, node, branch: dict, paths: list, results: list):
+        for step, sub_branch in branch.items():
+            if step is None:
+                for position in sub_branch:
+                    results[position] = self._path_value(paths[position], node)
+                continue
+            # Mirrors _query_path, paths through missing or None values keep the default
+            items = node.__list__ if isinstance(node, BaseRickle) else node
+            if step.index is not None and isinstance(items, list):
+                child = items[step.index] if step.index < len(items) else None
+            elif isinstance(node, (BaseRickle, dict)):
+                child = node.get(step.segment)
+            else:
+                child = None
+            if child is not None:
+                self._read_trie(child, sub_branch, paths, results)
+
+    def _write_many(self, mapping: dict, create: bool):
+        self._materialize()
+        sep = self._path_sep
+        paths = list()
+        for key in mapping:
+            path = self._batch_path(key)
+            if path == sep:
+                raise KeyError('Can not set a value to self')
+            if self._is_pattern(path):
+                raise KeyError(f'The path {path} is a pattern, patterns can only be used to get values')
+            name = path.rsplit(sep, 1)[-1]
+            if path.count(sep) == 1 and path_step(name).index is not None:
+                raise NameError(f'The path {path} could not be set, try using put')
+            if '?' in name:
+                raise KeyError(f'Function params "{name}" included in path!')
+            paths.append(path)
+        values = list(mapping.values())
+
+        trie = self._path_trie(paths)
+        branches = [trie]
+        while branches:
+            for step, sub_branch in branches.pop().items():
+                if step is None:
+                    continue
+                if None in sub_branch and len(sub_branch) > 1:
+                    raise KeyError(f'The path {paths[sub_branch[None][0]]} is set in the same batch as paths below it')
+                branches.append(sub_branch)
+
+        self._write_trie(self, '', trie, paths, values, create)
+
+    def _write_trie(self, node, prefix: str, branch: dict, paths: list, values: list, create: bool):
+        cls = self.__class__
+        for step, sub_branch in branch.items():
+            path = f'{prefix}{self._path_sep}{step.segment}'
+            leaf = sub_branch.get(None)
+            if leaf is not None:
+                if not isinstance(node, cls):
+                    raise NameError(f'The path {paths[leaf[-1]]} could not be set, try using put')
+                # The last of duplicate paths wins, as when set one after the other
+                value = values[leaf[-1]]
+                node._materialize()
+                key = node._clean_key(step.segment)
+                if key in node.__dict__ and not node._hidden_key(key):
+                    node[step.segment] = value
+                elif create:
+                    node.add(step.segment, value)
+                else:
+                    raise NameError(f'The path {paths[leaf[-1]]} could not be set, try using put')
+                continue
 
-        del current_node.__dict__[path_list[-1]]
+            items = node.__list__ if isinstance(node, BaseRickle) and not prefix else node
+            if step.index is not None and isinstance(items, list):
+                self._write_trie(items[step.index], path, sub_branch, paths, values, create)
+                continue
+            if not isinstance(node, cls):
+                raise KeyError(f'The path {path} could not be traversed')
+            child = node.get(step.segment)
+            if create and not isinstance(child, cls):
+                # New nodes are filled before they are added, so that they are indexed once
+                child = node._spawn(cls, dict())
+                self._write_trie(child, path, sub_branch, paths, values, create)
+                if node._clean_key(step.segment) in node.__dict__:
+                    del node[step.segment]
+                node.add(step.segment, child)
+                continue
+            if child is None:
+                raise KeyError(f'The path {path} could not be traversed')
+            self._write_trie(child, path, sub_branch, paths, values, create)
 
     def values(self):
         """
         Gets the higher level values of the current Rick object.
 
+        Notes:
+            The view is live, values are destructed one at a time as they are iterated.
+
         Returns:
-            list: of objects.
+            view: of objects.
         """
-        d = self.dict()
-        keys = list(d.keys())
-        objects = [d[k] for k in keys if not self._eval_name(k)]
-
-        return objects
+        return _ValuesView(self)
 
     def keys(self):
         """
         Gets the higher level keys of the current Rick object.
 
+        Notes:
+            The view is live and nothing is destructed, membership is checked with has.
+
         Returns:
-            list: of keys.
+            view: of keys.
         """
-        d = self.dict()
-        keys = list(d.keys())
-        keys = [k for k in keys if not self._eval_name(k)]
-
-        return keys
+        return _KeysView(self)
 
     def dict(self, serialised: bool = False):
         """
@@ -850,24 +2357,50 @@ class BaseRickle:
 
         Notes:
             Functions and lambdas are always given in serialised form.
+            With init arg or env var ``RICKLE_DICT_CACHE`` set, every node keeps its dictionary until it, or a node
+            below it, is changed by ``set``, ``put``, ``remove``, ``add``, the typed ``add_*`` methods, or item
+            assignment and deletion. The same dictionary is then given each time and should not be changed in place.
+            Lists and metadata changed in place are not tracked.
 
         Returns:
             dict: of object.
         """
+        memo = self._memo
+        if memo is not None and serialised in memo:
+            return memo[serialised]
+        if isinstance(self._pending, BaseRickle):
+            # Frozen nodes do not change, what they give is kept as it is
+            d = self._pending.dict(serialised=serialised)
+            return self._remember(serialised, d, serialised, ()) if self._settings.memoize else d
+        if self._pending is not None:
+            raw = self._pass_through()
+            if raw is not None:
+                d = self._raw_copy(raw)
+                return self._remember(serialised, d, serialised, ()) if self._settings.memoize else d
+        children = list()
+        d = self._deconstruct(serialised, children)
+        if self._settings.memoize:
+            self._remember(serialised, d, serialised, children)
+        return d
+
+    def _deconstruct(self, serialised: bool, children: list) -> dict:
+        # Nodes that the dictionary is built from are added to children
         d = dict()
         for key, value in self.__dict__.items():
             actual_key = key
             if key in self._keys_map.keys():
                 actual_key = self._keys_map[key]
-            if self._eval_name(key) or str(key).endswith('_meta_info'):
+            if self._hidden_key(key):
                 continue
             if isinstance(value, BaseRickle) or isinstance(value, Rickle):
                 d[actual_key] = value.dict(serialised=serialised)
+                children.append(value)
             elif isinstance(value, list):
                 new_list = list()
                 for element in value:
                     if isinstance(element, BaseRickle):
                         new_list.append(element.dict(serialised=serialised))
+                        children.append(element)
                     else:
                         new_list.append(element)
                 d[actual_key] = new_list
@@ -875,6 +2408,31 @@ class BaseRickle:
                 d[actual_key] = value
         return d
 
+    def _remember(self, memo_key, value, child_key, children):
+        # Kept only if every child node it was built from kept its own, a change to any of them then reaches this
+        # node through _touch. A None child is a hot loaded value that UnsafeRickle shows, which is never kept.
+        parent = weakref.ref(self)
+        for child in children:
+            if child is None or child._memo is None or child_key not in child._memo:
+                return value
+            owner = child._parent() if child._parent is not None else None
+            if owner is not None and owner is not self:
+                # Also part of another tree, changes to it would only reach one of them
+                return value
+            child._parent = parent
+        if self._memo is None:
+            self._memo = dict()
+        self._memo[memo_key] = value
+        return value
+
+    def _touch(self):
+        # Forgets the kept dict() and list() of this node and of every node above it. A node without one has nothing
+        # above it that was built from it, so the walk stops there.
+        node = self
+        while node is not None and node._memo is not None:
+            node._memo = None
+            node = node._parent() if node._parent is not None else None
+
     def list(self, serialised: bool = False):
         """
         Deconstructs the whole object into a Python list (of dictionaries) if type is 'array'.
@@ -884,11 +2442,21 @@ class BaseRickle:
 
         Notes:
             Functions and lambdas are always given in serialised form.
+            Kept per node with ``RICKLE_DICT_CACHE``, see ``dict``.
 
         Returns:
             list: of self.
         """
-        return [_d.dict(serialised=serialised) for _d in self.__list__]
+        memo = self._memo
+        if memo is not None and ('list', serialised) in memo:
+            return memo[('list', serialised)]
+        if isinstance(self._pending, BaseRickle):
+            l = self._pending.list(serialised=serialised)
+            return self._remember(('list', serialised), l, serialised, ()) if self._settings.memoize else l
+        l = [_d.dict(serialised=serialised) for _d in self.__list__]
+        if self._settings.memoize:
+            self._remember(('list', serialised), l, serialised, self.__list__)
+        return l
 
     def has(self, key: str, deep=False) -> bool:
         """
@@ -901,7 +2469,13 @@ class BaseRickle:
         Returns:
             bool: if found.
         """
-        if key in self.dict():
+        if isinstance(self._pending, BaseRickle):
+            return self._pending.has(key, deep=deep)
+        if self._pending is not None:
+            raw = self._pass_through()
+            if raw is not None and key in raw:
+                return True
+        if self._pending is None and self._visible_key(key) is not None:
             return True
         if deep:
             try:
@@ -911,7 +2485,19 @@ class BaseRickle:
                 return False
         return False
 
-    def to_yaml(self, output: Union[str, TextIOWrapper] = None, serialised: bool = False, encoding: str = 'utf-8'):
+    def _stream_source(self, serialised: bool = False, documents: bool = False):
+        # What the streaming encoders walk. Documents of an array are deconstructed one at a time, otherwise the
+        # read-only view is walked. Serialised output is built whole.
+        if documents:
+            return (_d.dict(serialised=serialised) for _d in self._source().__list__)
+        if not serialised:
+            return self.as_mapping()
+        if self._input_type == "array":
+            return self.list(serialised=serialised)
+        return self.dict(serialised=serialised)
+
+    def to_yaml(self, output: Union[str, TextIOWrapper] = None, serialised: bool = False, encoding: str = 'utf-8',
+                chunk_size: int = STREAM_CHUNK_SIZE):
         """
         Does a self dump to a YAML file or returns as string.
 
@@ -919,34 +2505,38 @@ class BaseRickle:
             output (str, TextIOWrapper): File path or stream (default = None).
             serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
             encoding (str): Output stream encoding (default = 'utf-8').
+            chunk_size (int): Number of characters buffered before writing to the output (default = 64 KiB).
 
         Notes:
             Functions and lambdas are always given in serialised form.
+            Output to a file or stream is encoded while walking the tree and written in chunks, arrays are written
+            one document at a time.
         """
+        if output:
+            documents = self._input_type == "array"
+            if isinstance(output, str):
+                with open(output, 'w', encoding=encoding) as fs:
+                    stream_dump(self._stream_source(serialised, documents), fs, 'yaml', chunk_size=chunk_size,
+                                documents=documents, init_args=self._init_args)
+            else:
+                stream_dump(self._stream_source(serialised, documents), output, 'yaml', chunk_size=chunk_size,
+                            documents=documents, init_args=self._init_args)
+            return
+
         if self._input_type == "array":
             self_as_primitive = self.list(serialised=serialised)
         else:
             self_as_primitive = self.dict(serialised=serialised)
 
-        if output:
-            if isinstance(output, TextIOWrapper):
-                if self._input_type == "array":
-                    yaml.safe_dump_all(self_as_primitive, stream=output, encoding=encoding)
-                else:
-                    yaml.safe_dump(self_as_primitive, stream=output, encoding=encoding)
-            elif isinstance(output, str):
-                with open(output, 'w', encoding=encoding) as fs:
-                    if self._input_type == "array":
-                        yaml.safe_dump_all(self_as_primitive, fs)
-                    else:
-                        yaml.safe_dump(self_as_primitive, fs)
+        backend = get_backend('yaml', init_args=self._init_args)
+
+        if self._input_type == "array":
+            return backend.dump_all(self_as_primitive, None, encoding=encoding).decode(encoding)
         else:
-            if self._input_type == "array":
-                return yaml.safe_dump_all(self_as_primitive, stream=None, encoding=encoding).decode(encoding)
-            else:
-                return yaml.safe_dump(self_as_primitive, stream=None, encoding=encoding).decode(encoding)
+            return backend.dump(self_as_primitive, None, encoding=encoding).decode(encoding)
 
-    def to_json(self, output: Union[str, TextIOWrapper] = None, serialised: bool = False, encoding: str = 'utf-8', lines: bool = True):
+    def to_json(self, output: Union[str, TextIOWrapper] = None, serialised: bool = False, encoding: str = 'utf-8', lines: bool = True,
+                chunk_size: int = STREAM_CHUNK_SIZE):
         """
         Does a self dump to a JSON file or returns as string.
 
@@ -955,40 +2545,40 @@ class BaseRickle:
             serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
             encoding (str): Output stream encoding (default = 'utf-8').
             lines (bool): Whether to dump as JSON lines when rickle is an array (default = True).
+            chunk_size (int): Number of characters buffered before writing to the output (default = 64 KiB).
 
         Notes:
             Functions and lambdas are always given in serialised form.
             To not dump as JSON lines when rickle is an array, use lines=False.
+            Output to a file or stream is encoded while walking the tree and written in chunks, JSON lines are written
+            one record at a time.
 
         """
+        if output:
+            documents = self._input_type == "array" and lines
+            if isinstance(output, str):
+                with open(output, 'w', encoding=encoding) as fs:
+                    stream_dump(self._stream_source(serialised, documents), fs, 'json', chunk_size=chunk_size,
+                                documents=documents, init_args=self._init_args)
+            else:
+                stream_dump(self._stream_source(serialised, documents), output, 'json', chunk_size=chunk_size,
+                            documents=documents, init_args=self._init_args)
+            return
+
         if self._input_type == "array":
             self_as_primitive = self.list(serialised=serialised)
         else:
             self_as_primitive = self.dict(serialised=serialised)
 
-        if output:
-            if isinstance(output, TextIOWrapper):
-                if self._input_type == "array" and lines:
-                    for l in self_as_primitive:
-                        output.write(json.dumps(l))
-                        output.write('\n')
-                else:
-                    json.dump(self_as_primitive, output)
-            elif isinstance(output, str):
-                with open(output, 'w', encoding=encoding) as fs:
-                    if self._input_type == "array" and lines:
-                        for l in self_as_primitive:
-                            fs.write(json.dumps(l))
-                            fs.write('\n')
-                    else:
-                        json.dump(self_as_primitive, fs)
+        dump = get_backend('json', init_args=self._init_args).dump
+
+        if self._input_type == "array" and lines:
+            return '\n'.join([dump(l) for l in self_as_primitive])
         else:
-            if self._input_type == "array" and lines:
-                return '\n'.join([json.dumps(l) for l in self_as_primitive])
-            else:
-                return json.dumps(self_as_primitive)
+            return dump(self_as_primitive)
 
-    def to_toml(self, output: Union[str, BytesIO] = None, serialised: bool = False, encoding: str = 'utf-8'):
+    def to_toml(self, output: Union[str, BytesIO] = None, serialised: bool = False, encoding: str = 'utf-8',
+                chunk_size: int = STREAM_CHUNK_SIZE):
         """
         Does a self dump to a TOML file or returns as string.
 
@@ -996,26 +2586,32 @@ class BaseRickle:
             output (str, BytesIO): File path or stream (default = None).
             serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
             encoding (str): Output stream encoding (default = 'utf-8').
+            chunk_size (int): Number of characters buffered before writing to the output (default = 64 KiB).
 
         Notes:
             Functions and lambdas are always given in serialised form.
             IO stream "output" needs to be BytesIO object
+            Output to a file or stream is written one top level key at a time, in chunks.
         """
         if self._input_type == "array":
             raise TypeError("Can not dump array type as TOML, convert to object type.")
-        else:
-            self_as_primitive = toml_null_stripper(self.dict(serialised=serialised))
 
         if output:
-            if isinstance(output, BytesIO):
-                tomlw.dump(self_as_primitive, output)
-            elif isinstance(output, str):
-                with open(output, 'wb', encoding=encoding) as fs:
-                    tomlw.dump(self_as_primitive, fs)
-        else:
-            return tomlw.dumps(self_as_primitive)
+            if isinstance(output, str):
+                with open(output, 'wb') as fs:
+                    stream_dump(self._stream_source(serialised), fs, 'toml', chunk_size=chunk_size,
+                                encoding=encoding, init_args=self._init_args)
+            else:
+                stream_dump(self._stream_source(serialised), output, 'toml', chunk_size=chunk_size,
+                            encoding=encoding, init_args=self._init_args)
+            return
 
-    def to_xml(self, output: Union[str, BytesIO] = None, serialised: bool = False, encoding: str = 'utf-8'):
+        self_as_primitive = toml_null_stripper(self.dict(serialised=serialised))
+        dump = get_backend('toml', init_args=self._init_args).dump
+        return dump(self_as_primitive)
+
+    def to_xml(self, output: Union[str, BytesIO] = None, serialised: bool = False, encoding: str = 'utf-8',
+               chunk_size: int = STREAM_CHUNK_SIZE):
         """
         Does a self dump to a XML file or returns as string.
 
@@ -1023,10 +2619,12 @@ class BaseRickle:
             output (str, BytesIO): File path or stream (default = None).
             serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
             encoding (str): Output stream encoding (default = 'utf-8').
+            chunk_size (int): Number of bytes buffered before writing to the output (default = 64 KiB).
 
         Notes:
             Functions and lambdas are always given in serialised form.
             IO stream "output" needs to be BytesIO object
+            Output to a file or stream is written in chunks.
         """
         if importlib.util.find_spec('xmltodict'):
             import xmltodict
@@ -1038,10 +2636,14 @@ class BaseRickle:
 
             if output:
                 if isinstance(output, BytesIO):
-                    xmltodict.unparse(input_dict=self_as_primitive, output=output, encoding=encoding, pretty=True)
+                    writer = ChunkWriter(output, chunk_size=chunk_size)
+                    xmltodict.unparse(input_dict=self_as_primitive, output=writer, encoding=encoding, pretty=True)
+                    writer.flush()
                 elif isinstance(output, str):
-                    with open(output, 'wb', encoding=encoding) as fs:
-                        xmltodict.unparse(input_dict=self_as_primitive, output=fs, encoding=encoding, pretty=True)
+                    with open(output, 'wb') as fs:
+                        writer = ChunkWriter(fs, chunk_size=chunk_size)
+                        xmltodict.unparse(input_dict=self_as_primitive, output=writer, encoding=encoding, pretty=True)
+                        writer.flush()
             else:
                 return xmltodict.unparse(input_dict=self_as_primitive, encoding=encoding, pretty=True)
         else:
@@ -1103,10 +2705,11 @@ class BaseRickle:
         Returns:
             dict: The metadata as a dict.
         """
+        self._materialize()
         if name:
-            if name in self._keys_map.values():
-                name = next((k for k, v in self._keys_map.items() if v == name), None)
-            return self._meta_info[name]
+            return self._meta_info[self._clean_key(name)]
+        if self._meta_info is _empty_map:
+            self._meta_info = dict()
         return self._meta_info
 
     def add_attr(self, name, value):
@@ -1123,7 +2726,12 @@ class BaseRickle:
         """
         name = self._check_kw(name)
         self.__dict__.update({name: value})
-        self._meta_info[name] = {'type': 'attribute', 'value': value}
+        self._set_meta(name, {'type': 'attribute', 'value': value})
+
+
+_node_slots = frozenset(BaseRickle.__slots__)
+_header_setters = {name: getattr(BaseRickle, name).__set__ for name in BaseRickle.__slots__
+                   if name not in ('__dict__', '__weakref__')}
 
 class Rickle(BaseRickle):
     """
@@ -1134,12 +2742,15 @@ class Rickle(BaseRickle):
             deep (bool): Internalize dictionary structures in lists.
             load_lambda (bool): Load lambda as code or strings.
             strict (bool): Check keywords, if YAML/JSON key is Rickle keyword (or member of object) raise ValueError (default = True).
+            lazy (bool): Only internalize nested dictionaries when they are first accessed (default = False).
             **init_args (kw_args): Additional arguments for string replacement
 
         Raises:
             ValueError: If the given base object can not be handled. Also raises if YAML key is already member of Rickle.
     """
 
+    _node_types = ('env', 'base64', 'file', 'from_file', 'csv', 'from_csv', 'api_json', 'secret', 'html_page', 'random')
+
     def _iternalize(self, obj: dict, deep: bool, **init_args):
         if isinstance(obj, dict):
             for k, v in obj.items():
@@ -1211,32 +2822,35 @@ class Rickle(BaseRickle):
                                                   hot_load=v.get('hot_load', False))
                             continue
 
-                    self.__dict__.update({k: Rickle(base=v, deep=deep, strict=self._strict, **init_args)})
+                    self.__dict__.update({k: self._spawn(Rickle, v)})
                     continue
                 if isinstance(v, list) and deep:
                     new_list = list()
                     for i in v:
                         if isinstance(i, dict):
-                            new_list.append(Rickle(base=i, deep=deep, strict=self._strict, **init_args))
+                            new_list.append(self._spawn(Rickle, i))
                         else:
                             new_list.append(i)
                     self.__dict__.update({k: new_list})
                     continue
                 self.__dict__.update({k: v})
         if isinstance(obj, list):
+            self.__list__ = list()
             for b in obj:
                 if isinstance(b, dict):
-                    self.__list__.append(Rickle(base=b, deep=deep, strict=self._strict, **init_args))
+                    self.__list__.append(self._spawn(Rickle, b))
 
     def __init__(self, base: Union[dict, str, TextIOWrapper, list] = None,
                  deep: bool = False,
                  load_lambda: bool = False,
                  strict: bool = True,
+                 lazy: bool = False,
                  **init_args):
         # self._meta_info = dict()
         init_args['load_lambda'] = load_lambda
         init_args['deep'] = deep
         init_args['strict'] = strict
+        init_args['lazy'] = lazy
         super().__init__(base, **init_args)
 
     def __call__(self, path: str, **kwargs):
@@ -1254,54 +2868,29 @@ class Rickle(BaseRickle):
         Returns:
             Any: Value of node of function.
         """
+        path, current_node = self._query_path(path)
+        return self._path_value(path.path, current_node, **kwargs)
 
-        if path == self._path_sep:
-            return self
-
-        if not path.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep} at {repr(self)}')
-
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', path)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
-
-        path_list = path.split(self._path_sep)
-
-        for node_name in path_list[path_start_index:]:
-            list_index_match = re.match(r'\[(\d+)\]', node_name)
-            if list_index_match and isinstance(current_node, list):
-                current_node = current_node[int(list_index_match.group(1))]
-            else:
-                current_node = current_node.get(node_name)
-            if current_node is None:
-                raise NameError(f'The path {path} could not be traversed. Alternatively use "get"')
-
-        if self._init_args['load_lambda'] and inspect.isfunction(current_node):
+    def _path_value(self, path: str, value, **kwargs):
+        if self._init_args['load_lambda'] and inspect.isfunction(value):
             try:
-                return current_node(**kwargs)
+                return value(**kwargs)
             except Exception as exc:
                 raise TypeError(
-                    f'{exc} occurred. The node in the path {path} is of type {type(current_node)} or does not match the query')
+                    f'{exc} occurred. The node in the path {path} is of type {type(value)} or does not match the query')
 
-        return current_node
-
-    def dict(self, serialised: bool = False):
-        """
-        Deconstructs the whole object into a Python dictionary.
-
-        Args:
-            serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
+        return value
 
-        Notes:
-            Functions and lambdas are always given in serialised form.
+    def _hidden_key(self, key) -> bool:
+        if self._eval_name(key):
+            return True
+        meta = self._meta_info.get(key)
+        if meta is None:
+            return False
+        return meta['type'] in ['base64'] or \
+            (meta['type'] in ['file', 'html_page', 'api_json', 'secret', 'random'] and meta['hot_load'])
 
-        Returns:
-            dict: of object.
-        """
+    def _deconstruct(self, serialised: bool, children: list) -> dict:
         d = dict()
         for key, value in self.__dict__.items():
             actual_key = key
@@ -1311,23 +2900,22 @@ class Rickle(BaseRickle):
                 continue
             if serialised and key in self._meta_info.keys():
                 d[actual_key] = self._meta_info[key]
-            # Revisit this at some later point
-            elif key in self._meta_info.keys() and \
-                    self._meta_info[key]['type'] in ['base64']:
-                # d[actual_key] = self._meta_info[key]
                 continue
-            elif key in self._meta_info.keys() and \
-                    self._meta_info[key]['type'] in ['file', 'html_page', 'api_json', 'secret', 'random'] and \
-                    self._meta_info[key]['hot_load']:
-                # d[actual_key] = self._meta_info[key]
+            # Revisit this at some later point
+            elif self._hidden_key(key):
                 continue
-            elif isinstance(value, BaseRickle):
+            if self._meta_info.get(key, _empty_map).get('hot_load'):
+                # Only UnsafeRickle shows hot loaded random values and secrets, a new one is made on every call
+                children.append(None)
+            if isinstance(value, BaseRickle):
                 d[actual_key] = value.dict(serialised=serialised)
+                children.append(value)
             elif isinstance(value, list):
                 new_list = list()
                 for element in value:
                     if isinstance(element, BaseRickle):
                         new_list.append(element.dict(serialised=serialised))
+                        children.append(element)
                     else:
                         new_list.append(element)
                 d[actual_key] = new_list
@@ -1374,10 +2962,10 @@ class Rickle(BaseRickle):
 
             self.__dict__.update({name: value})
 
-        self._meta_info[name] = {'type': 'random',
+        self._set_meta(name, {'type': 'random',
                                  'value_type': value_type,
                                  'value_properties': value_properties,
-                                 'hot_load': hot_load}
+                                 'hot_load': hot_load})
 
     def add_env_variable(self, name, load, default=None):
         warnings.warn(message="'add_env_variable' will be removed after version 1.4. Use 'add_env' instead")
@@ -1394,7 +2982,7 @@ class Rickle(BaseRickle):
         """
         name = self._check_kw(name)
         self.__dict__.update({name: os.getenv(load, default)})
-        self._meta_info[name] = {'type': 'env', 'load': load, 'default': default}
+        self._set_meta(name, {'type': 'env', 'load': load, 'default': default})
 
     def add_base64(self, name, load):
         """
@@ -1407,9 +2995,9 @@ class Rickle(BaseRickle):
         name = self._check_kw(name)
         b = base64.b64decode(load)
         self.__dict__.update({name: b})
-        self._meta_info[name] = {'type': 'base64',
+        self._set_meta(name, {'type': 'base64',
                                  'load': load
-                                 }
+                                 })
 
     def add_csv_file(self,
                      name,
@@ -1480,12 +3068,12 @@ class Rickle(BaseRickle):
 
         stream.close()
 
-        self._meta_info[name] = {'type': 'csv',
+        self._set_meta(name, {'type': 'csv',
                                  'file_path_or_str': file_path_or_str,
                                  'load_as_rick': load_as_rick,
                                  'fieldnames': fieldnames,
                                  'encoding': encoding
-                                 }
+                                 })
 
     def _load_file(self,
                         file_path: str,
@@ -1569,7 +3157,7 @@ class Rickle(BaseRickle):
 
             self.__dict__.update({name: result})
 
-        self._meta_info[name] = {'type': 'file',
+        self._set_meta(name, {'type': 'file',
                                  'file_path': file_path,
                                  'load_as_rick': load_as_rick,
                                  'deep': deep,
@@ -1577,7 +3165,7 @@ class Rickle(BaseRickle):
                                  'is_binary': is_binary,
                                  'encoding': encoding,
                                  'hot_load': hot_load
-                                 }
+                                 })
 
     def _load_html_page(self,
                         url: str,
@@ -1642,13 +3230,13 @@ class Rickle(BaseRickle):
 
             self.__dict__.update({name: result})
 
-        self._meta_info[name] = {'type': 'html_page',
+        self._set_meta(name, {'type': 'html_page',
                                  'url': url,
                                  'headers': headers,
                                  'params': params,
                                  'expected_http_status': expected_http_status,
                                  'hot_load': hot_load
-                                 }
+                                 })
 
     def _load_api_json(self,
                             url: str,
@@ -1766,7 +3354,7 @@ class Rickle(BaseRickle):
 
             self.__dict__.update({name: result})
 
-        self._meta_info[name] = {'type': 'api_json',
+        self._set_meta(name, {'type': 'api_json',
                                  'url': url,
                                  'http_verb': http_verb,
                                  'headers': headers,
@@ -1777,7 +3365,7 @@ class Rickle(BaseRickle):
                                  'load_lambda': load_lambda,
                                  'expected_http_status': expected_http_status,
                                  'hot_load': hot_load
-                                 }
+                                 })
 
     def _add_secret(self,
                     secret_id: str,
@@ -1976,7 +3564,7 @@ class Rickle(BaseRickle):
 
             self.__dict__.update({name: result})
 
-        self._meta_info[name] = {'type': 'secret',
+        self._set_meta(name, {'type': 'secret',
                                  'secret_id': secret_id,
                                  'provider': provider,
                                  'provider_access_key': provider_access_key,
@@ -1985,11 +3573,13 @@ class Rickle(BaseRickle):
                                  'deep': deep,
                                  'load_lambda': load_lambda,
                                  'hot_load': hot_load
-                                 }
+                                 })
 
 
 class UnsafeRickle(Rickle):
 
+    _node_types = Rickle._node_types + ('module_import', 'class_definition', 'function')
+
     def _iternalize(self, obj: dict, deep: bool, **init_args):
         if isinstance(obj, dict):
             for k, v in obj.items():
@@ -2098,31 +3688,34 @@ class UnsafeRickle(Rickle):
                                 self.__dict__.update({k: v})
                             continue
 
-                    self.__dict__.update({k: UnsafeRickle(base=v, deep=deep, strict=self._strict, **init_args)})
+                    self.__dict__.update({k: self._spawn(UnsafeRickle, v)})
                     continue
                 if isinstance(v, list) and deep:
                     new_list = list()
                     for i in v:
                         if isinstance(i, dict):
-                            new_list.append(UnsafeRickle(base=i, deep=deep, strict=self._strict, **init_args))
+                            new_list.append(self._spawn(UnsafeRickle, i))
                         else:
                             new_list.append(i)
                     self.__dict__.update({k: new_list})
                     continue
                 self.__dict__.update({k: v})
         if isinstance(obj, list):
+            self.__list__ = list()
             for b in obj:
                 if isinstance(b, dict):
-                    self.__list__.append(UnsafeRickle(base=b, deep=deep, strict=self._strict, **init_args))
+                    self.__list__.append(self._spawn(UnsafeRickle, b))
 
     def __init__(self, base: Union[dict, str, TextIOWrapper, list] = None,
                  deep: bool = False,
                  load_lambda: bool = False,
                  strict: bool = True,
+                 lazy: bool = False,
                  **init_args):
         init_args['load_lambda'] = load_lambda
         init_args['deep'] = deep
         init_args['strict'] = strict
+        init_args['lazy'] = lazy
         super().__init__(base, **init_args)
 
     def __call__(self, path: str, **kwargs):
@@ -2142,38 +3735,11 @@ class UnsafeRickle(Rickle):
         Returns:
             Any: Value of node of function.
         """
+        path, current_node = self._query_path(path, strip_params=True)
 
-        if path == self._path_sep:
-            return self
-
-        if not path.startswith(self._path_sep):
-            raise KeyError(f'Missing root path {self._path_sep} at {repr(self)}')
-
-        list_index_match = re.match(r'/\[(\d+)\](/.+)?', path)
-        path_start_index = 1
-        if list_index_match:
-            current_node = self.__list__[int(list_index_match.group(1))]
-            path_start_index = 2
-        else:
-            current_node = self
-
-        path_list = path.split(self._path_sep)
-
-        for node_name in path_list[path_start_index:]:
-            if '?' in node_name:
-                node_name = node_name.split('?')[0]
-
-            list_index_match = re.match(r'\[(\d+)\]', node_name)
-            if list_index_match and isinstance(current_node, list):
-                current_node = current_node[int(list_index_match.group(1))]
-            else:
-                current_node = current_node.get(node_name)
-            if current_node is None:
-                raise NameError(f'The path {path} could not be traversed. Alternatively use "get"')
-
-        if '?' in path_list[-1]:
+        if path.steps and path.steps[-1].params is not None:
             import ast
-            args_string = path_list[-1].split('?')[-1]
+            args_string = path.steps[-1].params
             args = {a.split('=')[0]: a.split('=')[1] for a in args_string.split('&')}
             type_guessed_args = dict()
             for n, v in args.items():
@@ -2192,64 +3758,26 @@ class UnsafeRickle(Rickle):
                 return current_node(**type_guessed_args)
             except Exception as exc:
                 raise TypeError(
-                    f'{exc} occurred. The node in the path {path} is of type {type(current_node)} or does not match the query')
+                    f'{exc} occurred. The node in the path {path.path} is of type {type(current_node)} or does not match the query')
 
         if inspect.isfunction(current_node):
             try:
                 return current_node(**kwargs)
             except Exception as exc:
                 raise TypeError(
-                    f'{exc} occurred. The node in the path {path} is of type {type(current_node)} or does not match the query')
+                    f'{exc} occurred. The node in the path {path.path} is of type {type(current_node)} or does not match the query')
 
         else:
             return current_node
 
-    def dict(self, serialised: bool = False):
-        """
-        Deconstructs the whole object into a Python dictionary.
-
-        Args:
-            serialised (bool): Give a Python dictionary in serialised (True) form or deserialised (default = False).
-
-        Notes:
-            Functions and lambdas are always given in serialised form.
-
-        Returns:
-            dict: of object.
-        """
-        d = dict()
-        for key, value in self.__dict__.items():
-            actual_key = key
-            if key in self._keys_map.keys():
-                actual_key = self._keys_map[key]
-            if self._eval_name(key):
-                continue
-            if serialised and key in self._meta_info.keys():
-                d[actual_key] = self._meta_info[key]
-            # Revisit this at some later point
-            elif key in self._meta_info.keys() and \
-                    self._meta_info[key]['type'] in ['function', 'class_definition', 'module_import',
-                                                     'base64']:
-                # d[actual_key] = self._meta_info[key]
-                continue
-            elif key in self._meta_info.keys() and \
-                    self._meta_info[key]['type'] in ['file', 'html_page', 'api_json'] and \
-                    self._meta_info[key]['hot_load']:
-                # d[actual_key] = self._meta_info[key]
-                continue
-            elif isinstance(value, BaseRickle):
-                d[actual_key] = value.dict(serialised=serialised)
-            elif isinstance(value, list):
-                new_list = list()
-                for element in value:
-                    if isinstance(element, BaseRickle):
-                        new_list.append(element.dict(serialised=serialised))
-                    else:
-                        new_list.append(element)
-                d[actual_key] = new_list
-            else:
-                d[actual_key] = value
-        return d
+    def _hidden_key(self, key) -> bool:
+        if self._eval_name(key):
+            return True
+        meta = self._meta_info.get(key)
+        if meta is None:
+            return False
+        return meta['type'] in ['function', 'class_definition', 'module_import', 'base64'] or \
+            (meta['type'] in ['file', 'html_page', 'api_json'] and meta['hot_load'])
 
     def add_module_import(self, name, imports: list):
         """
@@ -2267,7 +3795,7 @@ class UnsafeRickle(Rickle):
             else:
                 exec('import {}'.format(i), globals())
 
-        self._meta_info[name] = {'type': 'module_import', 'import': imports}
+        self._set_meta(name, {'type': 'module_import', 'import': imports})
 
     def add_function(self, name, load, args: dict = None, imports: list = None,
                      return_function: bool = False,
@@ -2343,8 +3871,8 @@ class UnsafeRickle(Rickle):
             return eval(func_string)
         self.__dict__.update({name: eval(func_string)})
 
-        self._meta_info[name] = {'type': 'function', 'name': name, 'args': args, 'import': imports,
-                                 'load': load, 'is_method': is_method}
+        self._set_meta(name, {'type': 'function', 'name': name, 'args': args, 'import': imports,
+                                 'load': load, 'is_method': is_method})
 
     def add_class_definition(self, name, attributes, imports: list = None):
         """
@@ -2380,7 +3908,7 @@ class UnsafeRickle(Rickle):
 
         self.__dict__.update({name: type(name, (), _attributes)})
 
-        self._meta_info[name] = {'type': 'class_definition', 'name': name, 'import': imports, 'attributes': attributes}
+        self._set_meta(name, {'type': 'class_definition', 'name': name, 'import': imports, 'attributes': attributes})
 
 
 class ObjectRickler:
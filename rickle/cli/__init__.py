@@ -185,6 +185,11 @@ Examples:
 
     $ cat config.yaml | rickle obj get /path/to
     $ rickle --output-type JSON obj --input conf1.yaml get /path/to  
+    $ cat config.yaml | rickle obj get "/servers/*/port"
+    $ cat config.yaml | rickle obj get "/clusters/[*]/nodes/[*]/ip"
+    $ cat config.yaml | rickle obj get //timeout
+
+Paths with '*' (any key), '[*]' (any list item), or '//' (at any depth) print every match by path.
 
 """, )
 
@@ -339,8 +344,11 @@ Types depend on --output-type and can be the following (default is JSON):
 Examples: 
 
     $ cat config.yaml | rickle obj search key
+    $ rickle obj --input export.json search key --stream
 
 Only the following --output-type is allowed: YAML, JSON, and ARRAY (default). Using ARRAY will only print the path(s).
+Using --stream searches JSON, JSON lines, or YAML input as it is read, without loading the whole document, and 
+prints the paths in the order they are read.
 
 
 """, )
@@ -355,6 +363,11 @@ Only the following --output-type is allowed: YAML, JSON, and ARRAY (default). Us
                                  action='store_true',
                                  default=False,
                                  help=f"only list {cli_bcolors.OKBLUE}parent{cli_bcolors.ENDC} node", )
+    search_obj_parser.add_argument('--stream',
+                                   dest="STREAM",
+                                   action='store_true',
+                                   default=False,
+                                   help=f"{cli_bcolors.OKBLUE}stream{cli_bcolors.ENDC} the input instead of loading it", )
 
     search_obj_parser.set_defaults(func=obj_search)
 
@@ -376,10 +389,15 @@ Examples:
     $ cat config.yaml | rickle obj find "key=value"
     $ cat config.yaml | rickle obj find --or "threshold < 0.2" "threshold > 0.8"
     $ cat config.yaml | rickle obj find --and "threshold gt 0.2" "threshold lt 0.8" -p
+    $ cat config.yaml | rickle obj find --and "threshold gt 0.2" "enabled = true" -p
+    $ rickle obj --input export.json find "port > 1024" --stream
 
 Only the following --output-type is allowed: YAML, JSON, and ARRAY (default). Using ARRAY will only print the path(s).
-Either key or --or / --and can be used, with key taking precedence. Both --or and --and can be combined with the first 
-being executed and then the later. Using --parent / -p will output the parent node paths. Comparison operators include:
+Either key or --or / --and can be used, with key taking precedence. Both --or and --and can be combined, all conditions 
+are checked in a single pass. The --and conditions have to match under the same parent node, also for different keys. 
+Using --parent / -p will output the parent node paths. Using --stream finds paths in JSON, JSON lines, or YAML input 
+as it is read, without loading the whole document, nested values can then only be compared to as empty. 
+Comparison operators include:
     
     Comparison         |  op | alt |
     ================================
@@ -405,7 +423,7 @@ being executed and then the later. Using --parent / -p will output the parent no
                                  default=[],
                                  dest='OR')
     find_obj_parser.add_argument('--and',
-                                 help=f"list of {cli_bcolors.OKBLUE}OR{cli_bcolors.ENDC} conditions",
+                                 help=f"list of {cli_bcolors.OKBLUE}AND{cli_bcolors.ENDC} conditions",
                                  nargs='+',
                                  default=[],
                                  dest='AND')
@@ -415,6 +433,11 @@ being executed and then the later. Using --parent / -p will output the parent no
                               action='store_true',
                               default=False,
                               help=f"only list {cli_bcolors.OKBLUE}parent{cli_bcolors.ENDC} node", )
+    find_obj_parser.add_argument('--stream',
+                                 dest="STREAM",
+                                 action='store_true',
+                                 default=False,
+                                 help=f"{cli_bcolors.OKBLUE}stream{cli_bcolors.ENDC} the input instead of loading it", )
 
     find_obj_parser.set_defaults(func=obj_find)
 
@@ -4,16 +4,12 @@ import sys
 from io import StringIO
 
 from rickle.tools import unparse_ini, CLIError, get_native_type_name
-from rickle.tools import toml_null_stripper
+from rickle.tools import toml_null_stripper, get_backend, stream_search, stream_find
 
 from rickle import Rickle, UnsafeRickle
 import re
-import json
-import yaml
 import ast
 
-import tomli_w as tomlw
-
 def obj_get(args):
     try:
         if args:
@@ -28,6 +24,9 @@ def obj_get(args):
 
             v = r.get(args.key)
 
+            if args.key.startswith(r._path_sep) and r.compile_path(args.key).pattern:
+                # Patterns give every match, dumped as a mapping of path to value
+                v = {m.path: m.value.dict() if isinstance(m.value, Rickle) else m.value for m in v}
             if isinstance(v, Rickle):
                 v = v.dict()
             if isinstance(v, dict):
@@ -38,13 +37,13 @@ def obj_get(args):
             if args.OUTPUT:
                 if dump_type in ['yaml', 'object', 'array']:
                     with open(args.OUTPUT, 'w') as fp:
-                        yaml.safe_dump(v, fp)
+                        get_backend('yaml').dump(v, fp)
                 elif dump_type in ['json', 'url']:
                     with open(args.OUTPUT, 'w') as fp:
-                        json.dump(v, fp)
+                        get_backend('json').dump(v, fp)
                 elif dump_type == 'toml':
                     with open(args.OUTPUT, 'wb') as fp:
-                        tomlw.dump(toml_null_stripper(v), fp)
+                        get_backend('toml').dump(toml_null_stripper(v), fp)
                 elif dump_type == 'xml':
                     if importlib.util.find_spec('xmltodict'):
                         import xmltodict
@@ -71,11 +70,11 @@ def obj_get(args):
 
             else:
                 if dump_type in ['yaml', 'object', 'array']:
-                    print(yaml.safe_dump(v))
+                    print(get_backend('yaml').dump(v))
                 elif dump_type in ['json', 'url']:
-                    print(json.dumps(v))
+                    print(get_backend('json').dump(v))
                 elif dump_type == 'toml':
-                    print(tomlw.dumps(toml_null_stripper(v)))
+                    print(get_backend('toml').dump(toml_null_stripper(v)))
                 elif dump_type == 'xml':
                     if importlib.util.find_spec('xmltodict'):
                         import xmltodict
@@ -261,18 +260,22 @@ def obj_search(args):
     dump_type = args.OUTPUT_TYPE.lower() if args.OUTPUT_TYPE else 'array'
     try:
         if args:
-            if args.INPUT:
-                _input = args.INPUT
+            if args.STREAM:
+                # Paths are given as the input is read, without loading the document
+                paths = stream_search(args.INPUT if args.INPUT else sys.stdin, args.key, report_parent=args.PARENT_ONLY)
             else:
-                _input = sys.stdin.read()
-            r = Rickle(_input, load_lambda=args.LOAD_LAMBDA)
+                if args.INPUT:
+                    _input = args.INPUT
+                else:
+                    _input = sys.stdin.read()
+                r = Rickle(_input, load_lambda=args.LOAD_LAMBDA)
 
-            paths = r.search_path(args.key, report_parent=args.PARENT_ONLY)
+                paths = r.search_path(args.key, report_parent=args.PARENT_ONLY)
 
             if dump_type == 'json':
-                print(json.dumps(paths))
+                print(get_backend('json').dump(list(paths)))
             elif dump_type == 'yaml':
-                print(yaml.safe_dump(paths))
+                print(get_backend('yaml').dump(list(paths)))
             elif dump_type in ['list', 'array']:
                 for p in paths:
                     print(p)
@@ -284,73 +287,31 @@ def obj_search(args):
         raise CLIError(message=str(exc), cli_tool=CLIError.CLITool.OBJ_SEARCH)
 
 def obj_find(args):
-    from collections import Counter
-
     dump_type = args.OUTPUT_TYPE.lower() if args.OUTPUT_TYPE else 'array'
-    pattern = re.compile(
-        r'(?P<key>[\w-]+\s+)'  # key: one or more word characters, followed by optional whitespace
-        r'(?P<operator>>=|<=|!=|=|>|<|eq|nq|gte|lte|gt|lt)\s+' 
-        r'(?P<value>\S+)'
-    )
     try:
         if args:
-            if args.INPUT:
-                _input = args.INPUT
-            else:
-                _input = sys.stdin.read()
-            r = Rickle(_input, load_lambda=args.LOAD_LAMBDA)
-
-            if args.key:
-                m = pattern.fullmatch(args.key)
-                if m:
-                    v = yaml.safe_load(m.group("value").strip())
-                    paths = r.find_key_value(key=m.group("key").strip(),
-                                             value=v,
-                                             op=m.group("operator").strip(),
-                                             report_parent=args.PARENT_ONLY)
+            where, any_of = ([args.key], None) if args.key else (args.AND, args.OR)
+            try:
+                if args.STREAM:
+                    # Paths are given as the input is read, without loading the document
+                    paths = stream_find(args.INPUT if args.INPUT else sys.stdin, where=where, any_of=any_of,
+                                        report_parent=args.PARENT_ONLY)
                 else:
-                    raise CLIError(f"Could not match <key><comp><value> with {args.key}", cli_tool=CLIError.CLITool.OBJ_FIND)
-            else:
-                paths = list()
-                for cond in args.OR:
-                    m = pattern.fullmatch(cond)
-                    if m:
-                        v = yaml.safe_load(m.group("value").strip())
-                        paths.extend(
-                            r.find_key_value(key=m.group("key").strip(),
-                                             value=v,
-                                             op=m.group("operator").strip(),
-                                             report_parent=args.PARENT_ONLY)
-                        )
-                    else:
-                        raise CLIError(f"Could not match <key><comp><value> with {args.key}",
-                                       cli_tool=CLIError.CLITool.OBJ_FIND)
-
-                _paths = list()
-                for cond in args.AND:
-                    m = pattern.fullmatch(cond)
-                    if m:
-                        v = yaml.safe_load(m.group("value").strip())
-                        _paths.extend(
-                            r.find_key_value(key=m.group("key").strip(),
-                                             value=v,
-                                             op=m.group("operator").strip(),
-                                             report_parent=args.PARENT_ONLY)
-                        )
+                    if args.INPUT:
+                        _input = args.INPUT
                     else:
-                        raise CLIError(f"Could not match <key><comp><value> with {args.key}",
-                                       cli_tool=CLIError.CLITool.OBJ_FIND)
-                for k, v in Counter(_paths).items():
-                    if v == len(args.AND):
-                        paths.append(k)
-                paths = list(dict.fromkeys(paths))
-
+                        _input = sys.stdin.read()
+                    r = Rickle(_input, load_lambda=args.LOAD_LAMBDA)
 
+                    # All conditions are checked in a single pass over the document
+                    paths = r.find(where=where, any_of=any_of, report_parent=args.PARENT_ONLY)
+            except ValueError as exc:
+                raise CLIError(str(exc), cli_tool=CLIError.CLITool.OBJ_FIND)
 
             if dump_type == 'json':
-                print(json.dumps(paths))
+                print(get_backend('json').dump(list(paths)))
             elif dump_type == 'yaml':
-                print(yaml.safe_dump(paths))
+                print(get_backend('yaml').dump(list(paths)))
             elif dump_type in ['list', 'array']:
                 for p in paths:
                     print(p)
@@ -437,11 +398,11 @@ def obj_func(args):
                         raise CLIError(f"Unsupported dump type {dump_type}", cli_tool=CLIError.CLITool.OBJ_FUNC)
                 elif isinstance(v, dict):
                     if dump_type in ['yaml', 'object', 'array']:
-                        print(yaml.safe_dump(v))
+                        print(get_backend('yaml').dump(v))
                     elif dump_type in ['json', 'url']:
-                        print(json.dumps(v))
+                        print(get_backend('json').dump(v))
                     elif dump_type == 'toml':
-                        print(tomlw.dumps(v))
+                        print(get_backend('toml').dump(v))
                     elif dump_type == 'ini':
                         print(Rickle(v).to_ini())
                     elif dump_type == 'xml':
@@ -3,12 +3,8 @@ import sys
 from rickle.tools import cli_bcolors, CLIError
 from rickle.tools import Schema
 from rickle.tools import Converter
-from rickle.tools import toml_null_stripper
+from rickle.tools import toml_null_stripper, get_backend
 
-import json
-import yaml
-
-import tomli_w as tomlw
 def check(args):
     try:
         if args.INPUT:
@@ -55,11 +51,11 @@ def gen(args):
             schema_dict = Schema.generate_schema_from_obj(input_data, include_extended_properties=args.EXTRAS)
 
             if output_type == 'yaml':
-                print(yaml.dump(schema_dict))
+                print(get_backend('yaml').dump(schema_dict))
             elif output_type == 'json':
-                print(json.dumps(schema_dict))
+                print(get_backend('json').dump(schema_dict))
             elif output_type == 'toml':
-                print(tomlw.dumps(toml_null_stripper(schema_dict)))
+                print(get_backend('toml').dump(toml_null_stripper(schema_dict)))
             elif output_type == 'xml':
                 if importlib.util.find_spec('xmltodict'):
                     import xmltodict
@@ -2,12 +2,9 @@ import importlib.util
 import sys
 import traceback
 import warnings
-import json
-
-import yaml
-import tomli_w as tomlw
 
 from rickle import Rickle, toml_null_stripper
+from rickle.tools import get_backend
 
 try:
     from twisted.web import server, resource
@@ -63,12 +60,12 @@ class HttpResource(resource.Resource):
             elif isinstance(content, dict) or isinstance(content, list):
                 if self.output_type == 'yaml':
                     request.setHeader(b"content-type", b"application/yaml")
-                    response = yaml.safe_dump(content)
+                    response = get_backend('yaml').dump(content)
                 elif self.output_type == 'toml':
                     request.setHeader(b"content-type", b"application/toml")
                     if isinstance(content, dict):
                         content = toml_null_stripper(content)
-                    response = tomlw.dumps(content)
+                    response = get_backend('toml').dump(content)
                 elif self.output_type == 'xml' and importlib.util.find_spec('xmltodict'):
                     import xmltodict
                     request.setHeader(b"content-type", b"text/xml")
@@ -77,7 +74,7 @@ class HttpResource(resource.Resource):
                     response = xmltodict.unparse(input_dict=content, pretty=True)
                 else:
                     request.setHeader(b"content-type", b"application/json")
-                    response = json.dumps(content)
+                    response = get_backend('json').dump(content)
             elif isinstance(content, bytes):
                 request.setHeader(b"content-type", b"application/x-binary")
                 return content
@@ -3,14 +3,21 @@ import importlib.util
 import random
 import string
 from enum import Enum
-from typing import List, Union
+from typing import List, Union, Iterator
 from pathlib import Path
 import yaml
 import json
 import os
 import sys
 import re
+import time
+import threading
+import warnings
+import mmap
+import operator
+from functools import lru_cache
 from collections import OrderedDict, namedtuple, defaultdict
+from collections.abc import Mapping, Sequence
 from io import StringIO
 
 # Add ordered dictionary to dumper
@@ -203,66 +210,389 @@ def supported_encodings() -> list:
             supported.append(name.replace("_", "-").strip().lower())
     return supported
 
-def classify_string(input_string: str):
+Backend = namedtuple('Backend', ['name', 'format', 'loads', 'loads_all', 'dump', 'dump_all'])
+
+# Backends per format, in order of preference (the default first)
+_backends = defaultdict(OrderedDict)
+
+
+def register_backend(backend: Backend, preferred: bool = False):
+    """
+    Register a parser / emitter backend for a format.
+
+    Args:
+        backend (Backend): The backend to register.
+        preferred (bool): Put the backend before the already registered backends (default = False).
+    """
+    registered = _backends[backend.format]
+    registered[backend.name] = backend
+    if preferred:
+        registered.move_to_end(backend.name, last=False)
+
+
+def available_backends(format_type: str) -> list:
+    """
+    Names of the installed backends for a format, the default first.
+
+    Args:
+        format_type (str): Either "json", "yaml", or "toml".
+
+    Returns:
+        list: Backend names.
+    """
+    return list(_backends[format_type.strip().lower()].keys())
+
+
+def get_backend(format_type: str, name: str = None, init_args: dict = None) -> Backend:
     """
-    Try to classify the type from a string. This is done by attempting to load the string as each type.
-    In the cases where the base decoder is not installed a simple Regex match is attempted.
+    Get the parser / emitter backend for a format. The backend can be picked with the ``name``, or the init arg or
+    env var ``RICKLE_<FORMAT>_BACKEND``, for example ``RICKLE_JSON_BACKEND=orjson``. Otherwise the default backend is
+    used, the fastest installed one for YAML, ``tomllib`` with ``tomli_w`` for TOML, and the stdlib ``json`` for JSON.
+
+    Notes:
+        JSON backends are "json" and "orjson", YAML backends "libyaml" and "pyyaml", TOML backends "rtoml" and "tomllib".
+        The "orjson" backend writes compact JSON with non-ASCII characters as is, so it is only used when picked.
+        The "rtoml" backend writes keys with tables last, lists of dicts as ``[[name]]`` tables, and lists on one
+        line, so it is only used when picked as well.
+        If the requested backend is not installed, a warning is given and the default one is used.
+
+    Args:
+        format_type (str): Either "json", "yaml", or "toml".
+        name (str): Name of the backend (default = None).
+        init_args (dict): Init args that may define the backend (default = None).
+
+    Returns:
+        Backend: Named tuple with ``loads``, ``loads_all``, ``dump``, and ``dump_all`` functions.
+    """
+    format_type = format_type.strip().lower()
+    registered = _backends[format_type]
+    if not registered:
+        raise ValueError(f"No backend for format '{format_type}'")
+
+    if name is None:
+        env_name = f"RICKLE_{format_type.upper()}_BACKEND"
+        name = init_args.get(env_name, None) if init_args else None
+        if name is None:
+            name = os.getenv(env_name, None)
+
+    if name:
+        name = name.strip().lower()
+        if name in registered:
+            return registered[name]
+        warnings.warn(f"Backend '{name}' for {format_type} is not installed, using '{next(iter(registered))}'")
+
+    return next(iter(registered.values()))
+
+
+def _is_sequence(value) -> bool:
+    # Lists and read-only sequences, like the views given by ``as_mapping``. Strings, bytes, and tuples are values.
+    return isinstance(value, list) or \
+        (isinstance(value, Sequence) and not isinstance(value, (str, bytes, bytearray, tuple, range)))
+
+
+def _type_name(value) -> str:
+    # Read-only views are named after the type they stand in for
+    if isinstance(value, Mapping) and not isinstance(value, dict):
+        return 'dict'
+    if _is_sequence(value) and not isinstance(value, list):
+        return 'list'
+    return type(value).__name__
+
+
+def _json_default(obj):
+    # Views are encoded one level at a time, the whole tree is never copied
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if _is_sequence(obj):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _json_dump(obj, stream=None, **kwargs):
+    kwargs.setdefault('default', _json_default)
+    if stream is None:
+        return json.dumps(obj, **kwargs)
+    json.dump(obj, stream, **kwargs)
+
+
+register_backend(Backend(name='json',
+                         format='json',
+                         loads=json.loads,
+                         loads_all=lambda s: [json.loads(s)],
+                         dump=_json_dump,
+                         dump_all=lambda objs, stream=None, **kwargs: _json_dump(list(objs), stream, **kwargs)))
+
+# orjson is faster but writes '{"a":"Zürich"}' where json writes '{"a": "Z\u00fcrich"}', it is registered after json
+# and only used when picked
+if importlib.util.find_spec('orjson'):
+    import orjson
+
+    def _orjson_loads(s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity, and very large integers are only supported by the stdlib
+            return json.loads(bytes(s) if isinstance(s, memoryview) else s)
+
+    def _orjson_dump(obj, stream=None, **kwargs):
+        if kwargs:
+            return _json_dump(obj, stream, **kwargs)
+        try:
+            dumped = orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except orjson.JSONEncodeError:
+            dumped = json.dumps(obj, default=_json_default)
+        if stream is None:
+            return dumped
+        stream.write(dumped)
+
+    register_backend(Backend(name='orjson',
+                             format='json',
+                             loads=_orjson_loads,
+                             loads_all=lambda s: [_orjson_loads(s)],
+                             dump=_orjson_dump,
+                             dump_all=lambda objs, stream=None, **kwargs: _orjson_dump(list(objs), stream, **kwargs)))
+
+
+# Dumper classes of the YAML backends, used to emit streamed YAML
+_yaml_dumpers = dict()
+
+
+def _yaml_backend(name: str, loader, dumper) -> Backend:
+    _yaml_dumpers[name] = dumper
+    # Add ordered dictionary to safe dumpers
+    yaml.add_representer(OrderedDict,
+                         lambda d, data: d.represent_mapping('tag:yaml.org,2002:map', data.items()),
+                         Dumper=dumper)
+    # Read-only views, see ``BaseRickle.as_mapping``
+    yaml.add_multi_representer(Mapping, lambda d, data: d.represent_dict(data), Dumper=dumper)
+    yaml.add_multi_representer(Sequence, lambda d, data: d.represent_list(data), Dumper=dumper)
+    return Backend(name=name,
+                   format='yaml',
+                   loads=lambda s: yaml.load(s, Loader=loader),
+                   loads_all=lambda s: list(yaml.load_all(s, Loader=loader)),
+                   dump=lambda obj, stream=None, **kwargs: yaml.dump(obj, stream, Dumper=dumper, **kwargs),
+                   dump_all=lambda objs, stream=None, **kwargs: yaml.dump_all(objs, stream, Dumper=dumper, **kwargs))
+
+
+register_backend(_yaml_backend('pyyaml', yaml.SafeLoader, yaml.SafeDumper))
+
+if getattr(yaml, '__with_libyaml__', False):
+    register_backend(_yaml_backend('libyaml', yaml.CSafeLoader, yaml.CSafeDumper), preferred=True)
+
+
+def _tomlw_dump(obj, stream=None):
+    if stream is None:
+        return tomlw.dumps(obj)
+    tomlw.dump(obj, stream)
+
+
+register_backend(Backend(name='tomllib',
+                         format='toml',
+                         loads=toml.loads,
+                         loads_all=lambda s: [toml.loads(s)],
+                         dump=_tomlw_dump,
+                         dump_all=None))
+
+# rtoml is faster but writes tables last, lists of dicts as [[name]] tables, and lists on one line, it is registered
+# after tomllib and only used when picked
+if importlib.util.find_spec('rtoml'):
+    import rtoml
+
+    def _rtoml_dump(obj, stream=None):
+        dumped = rtoml.dumps(obj)
+        if stream is None:
+            return dumped
+        stream.write(dumped.encode('utf-8'))
+
+    register_backend(Backend(name='rtoml',
+                             format='toml',
+                             loads=rtoml.loads,
+                             loads_all=lambda s: [rtoml.loads(s)],
+                             dump=_rtoml_dump,
+                             dump_all=None))
+
+
+SniffResult = namedtuple('SniffResult', ['format', 'candidates', 'elapsed'])
+InferredData = namedtuple('InferredData', ['data', 'input_type', 'format', 'elapsed'])
+
+# Order in which formats are attempted when nothing can be learned from the content
+_INFER_ORDER = ('jsonl', 'json', 'yaml', 'toml', 'ini', 'env', 'xml')
+_SNIFF_HEAD_SIZE = 4096
+_SNIFF_SECTION_PAT = re.compile(r'\[\[?\s*(?!(?:true|false|null)\s*\])[A-Za-z_][\w\-. ]*\]\]?\s*([#;].*)?$')
+_SNIFF_ASSIGN_PAT = re.compile(r'(export\s+)?[\w\-.]+\s*=')
+_SNIFF_QUOTED_ASSIGN_PAT = re.compile(r'"[^"]*"\s*=')
+_SNIFF_YAML_PAT = re.compile(r'(-(\s|$)|\?\s|[^\s:#\[\]{},"\'][^:#]*:(\s|$))')
+
+
+def _ini_options(init_args: dict = None) -> tuple:
+    init_args = init_args if init_args else dict()
+    path_sep = init_args.get('RICKLE_INI_PATH_SEP', os.getenv("RICKLE_INI_PATH_SEP", "."))
+    list_brackets = (
+        init_args.get("RICKLE_INI_OPENING_BRACES", os.getenv("RICKLE_INI_OPENING_BRACES", "(")),
+        init_args.get("RICKLE_INI_CLOSING_BRACES", os.getenv("RICKLE_INI_CLOSING_BRACES", ")"))
+    )
+    return path_sep, list_brackets
+
+
+def sniff_string(input_string: str) -> SniffResult:
+    """
+    Classify a string by only looking at the leading characters and line structure, without parsing the document.
+
+    Notes:
+        The ``candidates`` are all formats in the order they should be attempted, the best guess being first.
+        Only the first few KB of the string are inspected.
 
     Args:
         input_string (str): String to classify.
 
     Returns:
-        str: The classified type ("json", "yaml", "toml", "xml", "ini", "env", "unknown")
+        SniffResult: Named tuple of ``format`` (best guess), ``candidates`` (tuple), and ``elapsed`` (seconds).
     """
+    start = time.perf_counter()
+
+    lines = list()
+    for line in input_string[:_SNIFF_HEAD_SIZE].lstrip('\ufeff').splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#') or stripped.startswith(';'):
+            continue
+        lines.append(stripped)
+        if len(lines) == 2:
+            break
+
+    if not lines:
+        preferred = ('yaml',)
+    else:
+        first = lines[0]
+        second = lines[1] if len(lines) > 1 else ''
+        if first.startswith('<'):
+            preferred = ('xml',)
+        elif first.startswith('{'):
+            preferred = ('jsonl', 'json') if second.startswith('{') else ('json', 'jsonl')
+        elif first.startswith('['):
+            if _SNIFF_SECTION_PAT.match(first):
+                preferred = ('toml', 'ini')
+            elif second.startswith('['):
+                preferred = ('jsonl', 'json')
+            else:
+                preferred = ('json', 'jsonl')
+        elif first.startswith('---') or first.startswith('%'):
+            preferred = ('yaml',)
+        elif _SNIFF_QUOTED_ASSIGN_PAT.match(first):
+            preferred = ('toml',)
+        elif first.startswith('"') or first[0].isdigit() or (first[0] == '-' and first[1:2].isdigit()):
+            preferred = ('json', 'yaml')
+        elif _SNIFF_ASSIGN_PAT.match(first):
+            preferred = ('toml', 'env', 'ini')
+        elif _SNIFF_YAML_PAT.match(first):
+            preferred = ('yaml',)
+        else:
+            preferred = ('yaml',)
 
-    try:
-        json.loads(input_string)
-        return "json"
-    except json.JSONDecodeError:
-        pass
+    candidates = preferred + tuple(f for f in _INFER_ORDER if f not in preferred)
 
-    try:
-        yaml.safe_load(input_string)
-        return "yaml"
-    except yaml.YAMLError:
-        pass
+    return SniffResult(format=candidates[0], candidates=candidates, elapsed=time.perf_counter() - start)
 
-    try:
-        toml.loads(input_string)
-        return "toml"
-    except toml.TOMLDecodeError:
-        pass
 
-    if importlib.util.find_spec('xmltodict'):
+def load_string(input_string: str, input_type: str, **init_args) -> tuple:
+    """
+    Load a string as the given format.
+
+    Notes:
+        Multi-document YAML and JSONL are returned as a list, with the type ``array``.
+
+    Args:
+        input_string (str): String to load.
+        input_type (str): Either "json", "jsonl", "yaml", "toml", "ini", "env", or "xml".
+        **init_args (kw_args): Additional INI and XML options, such as ``RICKLE_INI_PATH_SEP`` or ``process_namespaces``.
+
+    Raises:
+        ModuleNotFoundError: If the optional package for the format is not installed.
+
+    Returns:
+        tuple: Loaded data and the input type.
+    """
+    input_type = input_type.strip().lower()
+    if input_type in ['yaml', 'yml']:
+        _d = get_backend('yaml', init_args=init_args).loads_all(input_string)
+        if len(_d) == 1:
+            return _d[0], 'yaml'
+        return _d, 'array'
+    if input_type == 'json':
+        return get_backend('json', init_args=init_args).loads(input_string), 'json'
+    if input_type == 'jsonl':
+        loads = get_backend('json', init_args=init_args).loads
+        return [loads(line) for line in input_string.splitlines() if line.strip()], 'array'
+    if input_type == 'toml':
+        return get_backend('toml', init_args=init_args).loads(input_string), 'toml'
+    if input_type == 'ini':
+        config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
+        config.read_string(input_string)
+        path_sep, list_brackets = _ini_options(init_args)
+        return parse_ini(config=config, path_sep=path_sep, list_brackets=list_brackets), 'ini'
+    if input_type == 'env':
+        if not importlib.util.find_spec('dotenv'):
+            raise ModuleNotFoundError("Missing 'python-dotenv' package!")
+        from dotenv import dotenv_values
+        return dotenv_values(stream=StringIO(input_string)), 'env'
+    if input_type == 'xml':
+        if not importlib.util.find_spec('xmltodict'):
+            raise ModuleNotFoundError("Missing 'xmltodict' package!")
         import xmltodict
-        try:
-            xmltodict.parse(input_string, process_namespaces=True)
-            return "xml"
-        except xmltodict.ParsingInterrupted:
-            pass
-    elif input_string.startswith("<") and input_string.endswith(">"):
-        if re.match(r'<\?xml\s+version\s*=\s*["\']1\.\d["\']', input_string) or re.match(r'<[a-zA-Z]', input_string):
-            return "xml"
+        return xmltodict.parse(input_string, process_namespaces=init_args.get('process_namespaces', False)), 'xml'
+    raise ValueError(f"Unsupported input type '{input_type}'")
 
-    config = configparser.ConfigParser()
-    if input_string.strip().startswith("["):
-        try:
-            config.read_string(input_string)
-            return "ini"
-        except configparser.Error:
-            pass
 
-    if importlib.util.find_spec('dotenv'):
+def infer_load_string(input_string: str, **init_args) -> InferredData:
+    """
+    Sniff the format of a string and load it with the matching parser. Other parsers are only tried if that fails.
+
+    Args:
+        input_string (str): String to load.
+        **init_args (kw_args): Additional INI and XML options, see ``load_string``.
+
+    Raises:
+        ValueError: If the string could not be loaded as any format.
+
+    Returns:
+        InferredData: Named tuple of ``data``, ``input_type``, ``format``, and ``elapsed`` (detection seconds).
+    """
+    sniffed = sniff_string(input_string)
+    error_list = list()
+    for candidate in sniffed.candidates:
         try:
-            from dotenv import dotenv_values
-            dotenv_values(stream=StringIO(input_string))
-            return "env"
-        except:
-            pass
-    elif re.match(r'^\s*[A-Za-z_][A-Za-z0-9_]*\s*=', input_string):
-        return "env"
+            _d, input_type = load_string(input_string, input_type=candidate, **init_args)
+        except ModuleNotFoundError:
+            continue
+        except Exception as exc:
+            error_list.append(f"{candidate.upper()}: {exc}")
+            continue
+        if candidate == 'jsonl' and len(_d) == 1:
+            return InferredData(data=_d[0], input_type='json', format='json', elapsed=sniffed.elapsed)
+        return InferredData(data=_d, input_type=input_type, format=candidate, elapsed=sniffed.elapsed)
+
+    raise ValueError("Unable to infer data type: {}".format('; '.join(error_list)))
+
+
+def classify_string(input_string: str):
+    """
+    Try to classify the type from a string. The format is sniffed from the leading characters and then confirmed by
+    loading the string with that format, falling back to the other formats only if that fails.
+    In the cases where the base decoder is not installed the sniffed guess is returned.
 
-    return "unknown"
+    Args:
+        input_string (str): String to classify.
+
+    Returns:
+        str: The classified type ("json", "jsonl", "yaml", "toml", "xml", "ini", "env", "unknown")
+    """
+    sniffed = sniff_string(input_string)
+    if sniffed.format == 'xml' and not importlib.util.find_spec('xmltodict'):
+        return "xml"
+
+    try:
+        return infer_load_string(input_string).format
+    except ValueError:
+        return "unknown"
 
 def toml_null_stripper(input: Union[dict, list]):
     """
@@ -274,26 +604,26 @@ def toml_null_stripper(input: Union[dict, list]):
     Returns:
         dict: Output dictionary (or list).
     """
-    if isinstance(input, dict):
+    if isinstance(input, Mapping):
         new_dict = dict()
 
         for k, v in input.items():
-            if isinstance(v, dict):
+            if isinstance(v, Mapping):
                 v = toml_null_stripper(v)
-            if isinstance(v, list):
+            if _is_sequence(v):
                 v = toml_null_stripper(v)
             if v not in (u"", None, {}):
                 new_dict[k] = v
 
         return new_dict
-    elif isinstance(input, list):
+    elif _is_sequence(input):
         new_list = list()
 
         for v in input:
-            if isinstance(v, dict):
+            if isinstance(v, Mapping):
                 v = toml_null_stripper(v)
-            if isinstance(v, list):
-                v = [toml_null_stripper(vv) if (isinstance(vv, dict) or isinstance(vv, list)) else vv for vv in v]
+            if _is_sequence(v):
+                v = [toml_null_stripper(vv) if (isinstance(vv, Mapping) or _is_sequence(vv)) else vv for vv in v]
             if v not in (u"", None, {}):
                 new_list.append(v)
 
@@ -363,9 +693,10 @@ def flatten_dict(dictionary, path_sep: str = None, list_brackets: tuple = ('(',
 
     Notes:
         Dictionary can only contain types str, bool, int, float, dict, list. Any other types won't be expanded upon.
+        Read-only views given by ``as_mapping`` are expanded like dicts and lists.
 
     Args:
-        dictionary (dict): Input dictionary.
+        dictionary (dict, Mapping): Input dictionary.
         path_sep (str): Path separator.
         list_brackets (tuple): Tuple of strings for list index values (default = ('(', ')')).
 
@@ -375,22 +706,22 @@ def flatten_dict(dictionary, path_sep: str = None, list_brackets: tuple = ('(',
     def __flatten_dict(d, parent_path: str = None, sep: str = None):
 
         values = list()
-        if isinstance(d, dict):
+        if isinstance(d, Mapping):
             for k, v in d.items():
-                if isinstance(v, dict):
+                if isinstance(v, Mapping):
                     value = __flatten_dict(d=v, parent_path=f'{parent_path}{sep}{k}', sep=sep)
                     values.extend(value)
-                elif isinstance(v, list):
+                elif _is_sequence(v):
                     value = __flatten_dict(d=v, parent_path=f'{parent_path}{sep}{k}', sep=sep)
                     values.extend(value)
                 else:
                     values.append({f'{parent_path}{sep}{k}': v})
-        if isinstance(d, list):
+        if _is_sequence(d):
             for i, val in enumerate(d):
-                if isinstance(val, dict):
+                if isinstance(val, Mapping):
                     value = __flatten_dict(d=val, parent_path=f'{parent_path}{sep}{list_brackets[0]}{i}{list_brackets[1]}', sep=sep)
                     values.extend(value)
-                elif isinstance(val, list):
+                elif _is_sequence(val):
                     value = __flatten_dict(d=val, parent_path=f'{parent_path}{sep}{list_brackets[0]}{i}{list_brackets[1]}', sep=sep)
                     values.extend(value)
                 else:
@@ -475,6 +806,1012 @@ def inflate_dict(flat_dict: dict, path_sep: str = None, list_brackets: tuple = (
     return main_d
 
 
+@lru_cache(maxsize=32)
+def template_pattern(opening: str = '{{', closing: str = '}}') -> re.Pattern:
+    """
+    Compiled pattern matching any ``{{key}}`` placeholder for the given brace pair. Patterns are cached per brace pair.
+
+    Args:
+        opening (str): Opening braces (default = '{{').
+        closing (str): Closing braces (default = '}}').
+
+    Returns:
+        re.Pattern: Pattern with the placeholder key in group 1.
+    """
+    opening, closing = re.escape(opening), re.escape(closing)
+    # A key can not contain the opening braces, so "{{ {{key}}" still matches "{{key}}"
+    return re.compile(f"{opening}((?:(?!{opening}).)+?){closing}")
+
+
+def template_options(init_args: dict = None) -> tuple:
+    """
+    Placeholder braces and what to do with unresolved placeholders, as given to ``substitute_template``.
+    Set with init args or env vars ``RICKLE_OPENING_BRACES``, ``RICKLE_CLOSING_BRACES``, and
+    ``RICKLE_UNRESOLVED_PLACEHOLDERS``.
+
+    Args:
+        init_args (dict): Init args possibly containing the options (default = None).
+
+    Returns:
+        tuple: Opening braces, closing braces, and how unresolved placeholders are handled.
+    """
+    init_args = init_args if init_args else dict()
+    opening = init_args.get('RICKLE_OPENING_BRACES', os.getenv('RICKLE_OPENING_BRACES', '{{'))
+    closing = init_args.get('RICKLE_CLOSING_BRACES', os.getenv('RICKLE_CLOSING_BRACES', '}}'))
+    unresolved = init_args.get('RICKLE_UNRESOLVED_PLACEHOLDERS', os.getenv('RICKLE_UNRESOLVED_PLACEHOLDERS', 'ignore'))
+    return opening, closing, unresolved
+
+
+def substitute_template(input_string: str, mapping: dict, opening: str = '{{', closing: str = '}}',
+                        unresolved: str = 'ignore') -> str:
+    """
+    Replace all placeholders in a single pass of the string. Each placeholder key is looked up in the mapping,
+    and replaced by the JSON dump of the value.
+
+    Notes:
+        Placeholders with keys not in the mapping are left as is, and are either ignored, warned about, or raised.
+
+    Args:
+        input_string (str): Templated string.
+        mapping (dict): Values to substitute.
+        opening (str): Opening braces (default = '{{').
+        closing (str): Closing braces (default = '}}').
+        unresolved (str): What to do with unresolved placeholders, 'ignore', 'warn', or 'raise' (default = 'ignore').
+
+    Returns:
+        str: Substituted string.
+
+    Raises:
+        ValueError: If ``unresolved='raise'`` and any placeholder has no value in the mapping.
+    """
+    unresolved = str(unresolved).strip().lower()
+    report = unresolved in ['warn', 'raise']
+    if (not mapping and not report) or opening not in input_string:
+        return input_string
+
+    dumped = dict()
+    missing = list()
+
+    def _replace(match):
+        key = match.group(1)
+        if key in dumped:
+            return dumped[key]
+        if key in mapping:
+            dumped[key] = json.dumps(mapping[key])
+            return dumped[key]
+        if report and key not in missing:
+            missing.append(key)
+        return match.group(0)
+
+    output_string = template_pattern(opening, closing).sub(_replace, input_string)
+
+    if missing:
+        message = f"Unresolved template placeholders: {', '.join(missing)}"
+        if unresolved == 'raise':
+            raise ValueError(message)
+        warnings.warn(message)
+
+    return output_string
+
+
+PathStep = namedtuple('PathStep', ['segment', 'key', 'index', 'params', 'wildcard', 'descendant'],
+                      defaults=(False, False))
+CompiledPath = namedtuple('CompiledPath', ['path', 'path_sep', 'root_index', 'steps', 'pattern'], defaults=(False,))
+PathMatch = namedtuple('PathMatch', ['path', 'value'])
+
+_path_index_pat = re.compile(r'\[(\d+)\]')
+_path_wildcards = ('*', '[*]')
+
+
+@lru_cache(maxsize=int(os.getenv('RICKLE_PATH_CACHE_SIZE', 1024)))
+def path_step(segment: str, descendant: bool = False) -> PathStep:
+    """
+    Parse a single path segment like '[0]' or 'name?param=1' into a step of a compiled path.
+
+    Args:
+        segment (str): Path segment without separators.
+        descendant (bool): Whether the step matches at any depth below the previous one (default = False).
+
+    Returns:
+        PathStep: Parsed step.
+    """
+    # Steps are shared by every path they appear in, so that paths missing the path cache are still compiled quickly
+    index_match = _path_index_pat.match(segment)
+    return PathStep(segment=segment,
+                    key=segment.split('?')[0],
+                    index=int(index_match.group(1)) if index_match else None,
+                    params=segment.split('?')[-1] if '?' in segment else None,
+                    wildcard=segment in _path_wildcards,
+                    descendant=descendant)
+
+
+@lru_cache(maxsize=int(os.getenv('RICKLE_PATH_CACHE_SIZE', 1024)))
+def compile_path(path: str, path_sep: str = '/') -> CompiledPath:
+    """
+    Parse a document path like '/root/[0]/name?param=1' once into typed steps. Compiled paths are kept in a bounded
+    LRU cache, sized with env var ``RICKLE_PATH_CACHE_SIZE`` (default = 1024).
+
+    Notes:
+        The path is expected to start with the path separator.
+        Each step has the raw ``segment``, the ``key`` without function params, the list ``index`` (or None),
+        and the raw ``params`` string after '?' (or None).
+        A leading list index, as in '/[0]/name', is given as ``root_index``.
+        Paths can be patterns, with '*' for any key, '[*]' for any list item, and an empty step as in '//timeout'
+        for a step matched at any depth (``descendant``). Patterns are flagged with ``pattern``.
+
+    Args:
+        path (str): Path to compile.
+        path_sep (str): Path separator (default = '/').
+
+    Returns:
+        CompiledPath: Path, path separator, root index, steps, and whether the path is a pattern.
+    """
+    if path == path_sep:
+        return CompiledPath(path=path, path_sep=path_sep, root_index=None, steps=tuple())
+
+    steps = list()
+    segments = path.split(path_sep)[1:]
+    descendant = False
+    for i, segment in enumerate(segments):
+        if segment == '' and i < len(segments) - 1:
+            descendant = True
+            continue
+        steps.append(path_step(segment, descendant))
+        descendant = False
+
+    root_index = None
+    if steps and steps[0].index is not None and not steps[0].descendant:
+        root_index = steps.pop(0).index
+
+    return CompiledPath(path=path, path_sep=path_sep, root_index=root_index, steps=tuple(steps),
+                        pattern=any(step.wildcard or step.descendant for step in steps))
+
+
+Condition = namedtuple('Condition', ['key', 'op', 'value'])
+
+comparison_ops = {'=': operator.eq, 'eq': operator.eq, '!=': operator.ne, 'ne': operator.ne,
+                  '>': operator.gt, 'gt': operator.gt, '>=': operator.ge, 'gte': operator.ge,
+                  '<': operator.lt, 'lt': operator.lt, '<=': operator.le, 'lte': operator.le}
+
+_condition_pat = re.compile(
+    r'\s*(?P<key>[\w\-.]+)'
+    r'(?:\s*(?P<symbol>>=|<=|!=|=|>|<)\s*|\s+(?P<word>eq|ne|gte|lte|gt|lt)\s+)'
+    r'(?P<value>.+?)\s*'
+)
+
+
+def parse_condition(condition: Union[str, tuple, list]) -> Condition:
+    """
+    Parse a condition like 'threshold >= 0.2' or 'name eq larry' into a key, comparison, and value.
+    The value is parsed as YAML, so numbers, booleans, and null are typed.
+
+    Notes:
+        Conditions can also be given as (key, op, value) tuples, which are only validated.
+
+    Args:
+        condition (str, tuple): Condition string, or (key, op, value).
+
+    Returns:
+        Condition: Key, comparison operator, and value.
+
+    Raises:
+        ValueError: If the condition can not be parsed or the comparison operator is unknown.
+    """
+    if isinstance(condition, (tuple, list)):
+        key, op, value = condition
+    else:
+        m = _condition_pat.fullmatch(condition)
+        if not m:
+            raise ValueError(f"Could not match <key><comp><value> with {condition}")
+        key, op = m.group('key'), m.group('symbol') or m.group('word')
+        value = get_backend('yaml').loads(m.group('value'))
+    if op not in comparison_ops:
+        raise ValueError(f"Unknown comparison operator '{op}'")
+    return Condition(key=key, op=op, value=value)
+
+
+# A separator before the token, then structural characters, strings without escapes, other strings, and numbers or
+# literals, which may not run into the next token
+_json_token_pat = re.compile(r'\s*(?:([,:])\s*)?(?:([{}\[\]])|"([^"\\\x00-\x1f]*)"|(")|'
+                             r'((?:-?(?:(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|Infinity)|true|false|null|NaN)'
+                             r'(?![\w.])))')
+# What an open container expects next: a key or '}', a key after ',', ':' and a value, ',' or '}',
+# a value or ']', a value after ',', and ',' or ']'
+_MAP_START, _MAP_KEY, _MAP_COLON, _MAP_NEXT, _SEQ_START, _SEQ_VALUE, _SEQ_NEXT = range(7)
+_json_literals = {'true': True, 'false': False, 'null': None, 'NaN': float('nan'),
+                  'Infinity': float('inf'), '-Infinity': float('-inf')}
+# Number of characters (or bytes) streams are read and written in at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+# Containers with more items than this are written item by item by stream_dump
+_STREAM_SPLIT_SIZE = 1000
+
+
+class _PrefixedStream:
+    # Gives the characters read ahead to detect the format first, then the rest of the stream
+
+    def __init__(self, prefix: str, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> str:
+        if not self.prefix:
+            return self.stream.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.stream.read(), ''
+            return data
+        data, self.prefix = self.prefix[:size], self.prefix[size:]
+        return data
+
+
+def iter_json_events(stream, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    Tokenize a JSON (or JSON lines) stream into parse events, reading it in chunks.
+    Only the current chunk and the token being read are kept in memory.
+
+    Notes:
+        Events are ``('start_map', None)``, ``('end_map', None)``, ``('start_seq', None)``, ``('end_seq', None)``,
+        ``('key', name)``, and ``('scalar', value)``. Several top level values, as in JSON lines, follow each other.
+
+    Args:
+        stream: Text stream to read from.
+        chunk_size (int): Number of characters read at a time (default = 64 KiB).
+
+    Returns:
+        Iterator[tuple]: Events in document order.
+
+    Raises:
+        ValueError: If the stream is not valid JSON.
+    """
+    buffer, position, eof = '', 0, False
+    match = _json_token_pat.match
+    # Per open container, what it expects next
+    expect = list()
+    while True:
+        m = match(buffer, position)
+        if m is None or (m.lastindex == 5 and m.end() > len(buffer) - 3 and not eof):
+            # Tokens cut off at the end of the chunk are read again with the next chunk, numbers like '1e+5' could
+            # continue for two more characters
+            rest = buffer[position:].lstrip()
+            if eof or len(rest) > 64:
+                if rest:
+                    raise ValueError(f"Unexpected JSON at '{rest[:20]}'")
+                if expect:
+                    raise ValueError('Unexpected end of JSON')
+                return
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        kind = m.lastindex
+        separator = m.group(1)
+        state = expect[-1] if expect else None
+        if kind == 2 and m.group(2) in '}]':
+            structural = m.group(2)
+            if separator is not None or (state not in (_MAP_START, _MAP_NEXT) if structural == '}'
+                                         else state not in (_SEQ_START, _SEQ_NEXT)):
+                raise ValueError(f"Unexpected '{(separator or '') + structural}' in JSON")
+            position = m.end()
+            expect.pop()
+            yield ('end_map' if structural == '}' else 'end_seq'), None
+            continue
+        if state == _MAP_NEXT or state == _SEQ_NEXT:
+            expected = ','
+        elif state == _MAP_COLON:
+            expected = ':'
+        else:
+            expected = None
+        if separator != expected:
+            raise ValueError(f"Expected '{expected}' in JSON" if expected else f"Unexpected '{separator}' in JSON")
+        if state == _MAP_NEXT:
+            state = _MAP_KEY
+        elif state == _SEQ_NEXT:
+            state = _SEQ_VALUE
+        if kind == 2:
+            if state == _MAP_START or state == _MAP_KEY:
+                raise ValueError(f"Unexpected '{m.group(2)}' for a key in JSON")
+            position = m.end()
+            if state is not None:
+                expect[-1] = _SEQ_NEXT if state >= _SEQ_START else _MAP_NEXT
+            if m.group(2) == '{':
+                expect.append(_MAP_START)
+                yield 'start_map', None
+            else:
+                expect.append(_SEQ_START)
+                yield 'start_seq', None
+            continue
+        if kind == 3:
+            value = m.group(3)
+            position = m.end()
+        elif kind == 4:
+            try:
+                value, end = json.decoder.scanstring(buffer, m.end())
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError('Unterminated JSON string')
+                chunk = stream.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            position = end
+        else:
+            literal = m.group(5)
+            position = m.end()
+            if literal in _json_literals:
+                value = _json_literals[literal]
+            elif '.' in literal or 'e' in literal or 'E' in literal:
+                value = float(literal)
+            else:
+                value = int(literal)
+        if state == _MAP_START or state == _MAP_KEY:
+            if kind == 5:
+                raise ValueError(f"Unexpected key {value} in JSON")
+            expect[-1] = _MAP_COLON
+            yield 'key', value
+            continue
+        if state is not None:
+            expect[-1] = _SEQ_NEXT if state >= _SEQ_START else _MAP_NEXT
+        yield 'scalar', value
+
+
+def iter_yaml_events(stream) -> Iterator[tuple]:
+    """
+    Parse a YAML stream into the same events as ``iter_json_events``, with PyYAML reading it in chunks.
+    Scalars are typed as the safe loader would type them.
+
+    Notes:
+        Aliases are not followed, they are given as None. Every document in the stream follows the one before.
+
+    Args:
+        stream: Text stream to read from.
+
+    Returns:
+        Iterator[tuple]: Events in document order.
+    """
+    loader = (yaml.CSafeLoader if hasattr(yaml, 'CSafeLoader') else yaml.SafeLoader)(stream)
+    constructors = loader.yaml_constructors
+    expect_key = list()
+    try:
+        while loader.check_event():
+            event = loader.get_event()
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                if expect_key and expect_key[-1] is False:
+                    expect_key[-1] = True
+                is_map = isinstance(event, yaml.MappingStartEvent)
+                expect_key.append(True if is_map else None)
+                yield ('start_map' if is_map else 'start_seq'), None
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                expect_key.pop()
+                yield ('end_map' if isinstance(event, yaml.MappingEndEvent) else 'end_seq'), None
+            elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                value = None
+                if isinstance(event, yaml.ScalarEvent):
+                    tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+                    value = constructors[tag](loader, yaml.ScalarNode(tag, event.value, style=event.style)) \
+                        if tag in constructors else event.value
+                if expect_key and expect_key[-1]:
+                    expect_key[-1] = False
+                    yield 'key', str(value)
+                    continue
+                if expect_key and expect_key[-1] is False:
+                    expect_key[-1] = True
+                yield 'scalar', value
+    finally:
+        loader.dispose()
+
+
+def iter_stream_events(path_or_stream: Union[str, Path, 'TextIOWrapper'], input_type: str = None,
+                       encoding: str = 'utf-8') -> Iterator[tuple]:
+    """
+    Parse a JSON, JSON lines, or YAML file or text stream into events, see ``iter_json_events``.
+
+    Notes:
+        The input type is taken from the file suffix, or else sniffed from the start of the stream.
+        JSON lines are given as the items of a list.
+
+    Args:
+        path_or_stream (str, Path, TextIOWrapper): File path or text stream.
+        input_type (str): One of 'json', 'jsonl', or 'yaml' (default = None).
+        encoding (str): Encoding of the file (default = 'utf-8').
+
+    Returns:
+        Iterator[tuple]: Events in document order.
+    """
+    if isinstance(path_or_stream, (str, Path)):
+        suffix = Path(path_or_stream).suffix.lower()
+        if input_type is None and suffix in ('.json', '.jsonl', '.yaml', '.yml'):
+            input_type = 'yaml' if suffix in ('.yaml', '.yml') else suffix[1:]
+        with open(path_or_stream, 'r', encoding=encoding) as stream:
+            yield from iter_stream_events(stream, input_type=input_type)
+        return
+
+    stream = path_or_stream
+    if input_type is None:
+        prefix = ''
+        while True:
+            chunk = stream.read(_SNIFF_HEAD_SIZE)
+            prefix += chunk
+            if not chunk or prefix.strip():
+                break
+        input_type = sniff_string(prefix).format
+        stream = _PrefixedStream(prefix, stream)
+    if input_type.lower() == 'json':
+        yield from iter_json_events(stream)
+    elif input_type.lower() == 'jsonl':
+        # Lines are the items of a list, as when loaded
+        yield 'start_seq', None
+        yield from iter_json_events(stream)
+        yield 'end_seq', None
+    elif input_type.lower() == 'yaml':
+        yield from iter_yaml_events(stream)
+    else:
+        raise ValueError(f"Streaming is only supported for JSON, JSON lines, and YAML, not {input_type}")
+
+
+_stream_end = object()
+
+
+def _iter_stream_items(events: Iterator[tuple], path_sep: str) -> Iterator[tuple]:
+    # Gives (parent path, key, value) for every key as it is read, with an empty dict or list for nested values.
+    # The end of every mapping is given as (parent path, None, _stream_end).
+    # Open containers are kept as [is mapping, path, current key or next list index].
+    stack = list()
+    for event, value in events:
+        if event == 'key':
+            stack[-1][2] = value
+            continue
+        if stack:
+            frame = stack[-1]
+            if frame[0]:
+                path, key = f'{frame[1]}{path_sep}{frame[2]}', frame[2]
+            else:
+                path, key = f'{frame[1]}{path_sep}[{frame[2]}]', None
+                frame[2] += 1
+        else:
+            path, key = '', None
+        if event == 'scalar':
+            if key is not None:
+                yield frame[1], key, value
+        elif event == 'start_map' or event == 'start_seq':
+            if key is not None:
+                yield frame[1], key, dict() if event == 'start_map' else list()
+            stack.append([event == 'start_map', path, 0])
+        elif event == 'end_map':
+            yield stack.pop()[1], None, _stream_end
+        elif event == 'end_seq':
+            stack.pop()
+
+
+def stream_search(path_or_stream: Union[str, Path, 'TextIOWrapper'], key: str, report_parent: bool = False,
+                  input_type: str = None, path_sep: str = '/', encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Search a JSON, JSON lines, or YAML file or stream for all paths to a key, without loading the document.
+    Paths are given as soon as the key is read, the memory used only depends on the depth of the document.
+
+    Args:
+        path_or_stream (str, Path, TextIOWrapper): File path or text stream.
+        key (str): The key to search.
+        report_parent (bool): Give the path to the parent of the key instead (default = False).
+        input_type (str): One of 'json', 'jsonl', or 'yaml', inferred if not given (default = None).
+        path_sep (str): Path separator (default = '/').
+        encoding (str): Encoding of the file (default = 'utf-8').
+
+    Returns:
+        Iterator[str]: paths found, in the order they are read.
+    """
+    events = iter_stream_events(path_or_stream, input_type=input_type, encoding=encoding)
+    for parent, name, _ in _iter_stream_items(events, path_sep):
+        if name == key:
+            yield parent if report_parent else f'{parent}{path_sep}{key}'
+
+
+def stream_find(path_or_stream: Union[str, Path, 'TextIOWrapper'], where: list = None, any_of: list = None,
+                report_parent: bool = False, input_type: str = None, path_sep: str = '/',
+                encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Find paths matching conditions in a JSON, JSON lines, or YAML file or stream, without loading the document.
+    Conditions work as with ``find``, the ``where`` conditions all have to hold under the same parent.
+
+    Notes:
+        Paths under a parent are given when the end of the parent is read, only the values of the condition keys
+        of the open parents are kept in memory. Nested values compare as an empty dict or list,
+        so conditions can only compare to plain values.
+
+    Args:
+        path_or_stream (str, Path, TextIOWrapper): File path or text stream.
+        where (list): Conditions that all have to match (default = None).
+        any_of (list): Conditions of which any has to match (default = None).
+        report_parent (bool): Give the path to the parent of the keys instead (default = False).
+        input_type (str): One of 'json', 'jsonl', or 'yaml', inferred if not given (default = None).
+        path_sep (str): Path separator (default = '/').
+        encoding (str): Encoding of the file (default = 'utf-8').
+
+    Returns:
+        Iterator[str]: paths found, in the order their parents end.
+
+    Raises:
+        ValueError: If a condition can not be parsed, or compares to a dict or list.
+    """
+    where = [parse_condition(c) for c in where or list()]
+    any_of = [parse_condition(c) for c in any_of or list()]
+    if any(isinstance(c.value, (dict, list)) for c in where + any_of):
+        raise ValueError('Streamed conditions can only compare to plain values')
+    if not where and not any_of:
+        return iter(())
+    events = iter_stream_events(path_or_stream, input_type=input_type, encoding=encoding)
+    return _iter_stream_where(events, where, any_of, report_parent, path_sep)
+
+
+def _iter_stream_where(events: Iterator[tuple], where: list, any_of: list, report_parent: bool,
+                       path_sep: str) -> Iterator[str]:
+    # Values of the condition keys per open mapping, by path
+    condition_keys = {c.key for c in where + any_of}
+    found = dict()
+    for parent, name, value in _iter_stream_items(events, path_sep):
+        if value is not _stream_end:
+            if name in condition_keys:
+                found.setdefault(parent, dict())[name] = value
+            continue
+        values = found.pop(parent, None)
+        if not values:
+            continue
+        keys = [c.key for c in any_of if c.key in values and comparison_ops[c.op](values[c.key], c.value)]
+        if where and all(c.key in values and comparison_ops[c.op](values[c.key], c.value) for c in where):
+            keys.extend(c.key for c in where)
+        if not keys:
+            continue
+        if report_parent:
+            yield parent
+        else:
+            for key in dict.fromkeys(keys):
+                yield f'{parent}{path_sep}{key}'
+
+
+class ChunkWriter:
+    """
+    Collects small writes and passes them on to the stream in chunks of about ``chunk_size`` characters (or bytes).
+    Call ``flush`` after the last write.
+
+    Args:
+        stream: Text or binary stream to write to.
+        chunk_size (int): Number of characters (or bytes) written at a time (default = 64 KiB).
+        encoding (str): Encode text with this encoding, for binary streams (default = None).
+    """
+
+    def __init__(self, stream, chunk_size: int = STREAM_CHUNK_SIZE, encoding: str = None):
+        self.stream = stream
+        self.chunk_size = max(1, chunk_size)
+        # Text is encoded for binary streams, the C YAML emitter writes text to streams that have an encoding
+        self.encoding = encoding if encoding else getattr(stream, 'encoding', None)
+        self._encode = encoding is not None
+        self._buffer = list()
+        self._size = 0
+
+    def write(self, data):
+        self._buffer.append(data)
+        self._size += len(data)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data = self._buffer[0][:0].join(self._buffer)
+        self._buffer = list()
+        self._size = 0
+        self.stream.write(data.encode(self.encoding) if self._encode and isinstance(data, str) else data)
+
+
+def _iter_json_chunks(value, dump, separators: tuple, split_size: int, root: bool = True) -> Iterator[str]:
+    # Containers with more than split_size items are written item by item, smaller ones are dumped whole by the backend
+    item_sep, key_sep = separators
+    if isinstance(value, Mapping) and (root or len(value) > split_size):
+        yield '{'
+        for i, (k, v) in enumerate(value.items()):
+            if i:
+                yield item_sep
+            yield dump(k if isinstance(k, str) else str(k))
+            yield key_sep
+            yield from _iter_json_chunks(v, dump, separators, split_size, root=False)
+        yield '}'
+    elif _is_sequence(value) and (root or len(value) > split_size):
+        yield '['
+        for i, v in enumerate(value):
+            if i:
+                yield item_sep
+            yield from _iter_json_chunks(v, dump, separators, split_size, root=False)
+        yield ']'
+    else:
+        yield dump(value)
+
+
+def _iter_yaml_node_events(dumper, node) -> Iterator:
+    # Same events as the serializer of the dumper gives for a represented node, without anchors
+    if isinstance(node, yaml.ScalarNode):
+        implicit = (node.tag == dumper.resolve(yaml.ScalarNode, node.value, (True, False)),
+                    node.tag == dumper.resolve(yaml.ScalarNode, node.value, (False, True)))
+        yield yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style)
+    elif isinstance(node, yaml.SequenceNode):
+        implicit = node.tag == dumper.resolve(yaml.SequenceNode, node.value, True)
+        yield yaml.SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+        for item in node.value:
+            yield from _iter_yaml_node_events(dumper, item)
+        yield yaml.SequenceEndEvent()
+    else:
+        implicit = node.tag == dumper.resolve(yaml.MappingNode, node.value, True)
+        yield yaml.MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+        for key, value in node.value:
+            yield from _iter_yaml_node_events(dumper, key)
+            yield from _iter_yaml_node_events(dumper, value)
+        yield yaml.MappingEndEvent()
+
+
+def _iter_yaml_value_events(dumper, value) -> Iterator:
+    # Mappings and sequences are walked, only their own items are listed (to sort them), values are represented
+    # one at a time
+    if isinstance(value, Mapping):
+        items = list(value.items())
+        if dumper.sort_keys:
+            try:
+                items = sorted(items)
+            except TypeError:
+                pass
+        yield yaml.MappingStartEvent(None, 'tag:yaml.org,2002:map', True, flow_style=dumper.default_flow_style)
+        for k, v in items:
+            yield from _iter_yaml_value_events(dumper, k)
+            yield from _iter_yaml_value_events(dumper, v)
+        yield yaml.MappingEndEvent()
+    elif _is_sequence(value):
+        yield yaml.SequenceStartEvent(None, 'tag:yaml.org,2002:seq', True, flow_style=dumper.default_flow_style)
+        for v in value:
+            yield from _iter_yaml_value_events(dumper, v)
+        yield yaml.SequenceEndEvent()
+    else:
+        node = dumper.represent_data(value)
+        # Represented values are not kept for aliases
+        dumper.represented_objects = dict()
+        dumper.object_keeper = list()
+        yield from _iter_yaml_node_events(dumper, node)
+
+
+def _stream_toml(obj, writer, dump):
+    # Keys and values first, then the tables. Each top level entry is dumped on its own, so only the largest one is
+    # held in memory at once.
+    tables = list()
+    written = False
+    for key, value in obj.items():
+        if value in (u"", None) or (isinstance(value, Mapping) and not value):
+            continue
+        if isinstance(value, Mapping):
+            tables.append(key)
+            continue
+        dumped = dump(toml_null_stripper({key: value}))
+        if dumped.startswith('['):
+            # Arrays of tables
+            tables.append(key)
+            continue
+        writer.write(dumped)
+        written = True
+    for key in tables:
+        dumped = dump(toml_null_stripper({key: obj[key]}))
+        if not dumped:
+            continue
+        if written:
+            writer.write('\n')
+        writer.write(dumped)
+        written = True
+
+
+def stream_dump(obj, stream, format_type: str = 'json', chunk_size: int = STREAM_CHUNK_SIZE,
+                documents: bool = False, encoding: str = None, init_args: dict = None):
+    """
+    Write an object to a stream while walking it, in chunks of about ``chunk_size`` characters, instead of first
+    encoding it whole. Dicts, lists, and the read-only views given by ``as_mapping`` can be written.
+
+    Notes:
+        JSON is written by the JSON backend one item at a time for the top level and for any object or array with
+        more than 1000 items, smaller ones are dumped whole. YAML is emitted from parse events, with the dumper of the
+        YAML backend. TOML is written one top level entry at a time, as tables have to come after plain values.
+
+    Args:
+        obj: The object, or an iterable of documents (records) if ``documents`` is set.
+        stream: Stream to write to.
+        format_type (str): Either "json", "yaml", or "toml" (default = "json").
+        chunk_size (int): Number of characters collected before writing to the stream (default = 64 KiB).
+        documents (bool): Write every item of ``obj`` as a line of JSON lines, or as a YAML document (default = False).
+        encoding (str): Encode the text to this encoding, for binary streams (default = None).
+        init_args (dict): Init args that may define the backend, see ``get_backend`` (default = None).
+    """
+    format_type = format_type.strip().lower()
+    writer = ChunkWriter(stream, chunk_size=chunk_size, encoding=encoding)
+    backend = get_backend(format_type, init_args=init_args)
+    if format_type == 'json':
+        if documents:
+            for document in obj:
+                writer.write(backend.dump(document))
+                writer.write('\n')
+        else:
+            separators = (',', ':') if backend.name == 'orjson' else (', ', ': ')
+            for chunk in _iter_json_chunks(obj, backend.dump, separators, _STREAM_SPLIT_SIZE):
+                writer.write(chunk)
+    elif format_type == 'yaml':
+        dumper = _yaml_dumpers.get(backend.name, yaml.SafeDumper)(writer, default_flow_style=False, sort_keys=True)
+        try:
+            dumper.emit(yaml.StreamStartEvent())
+            for document in (obj if documents else [obj]):
+                dumper.emit(yaml.DocumentStartEvent(explicit=False))
+                for event in _iter_yaml_value_events(dumper, document):
+                    dumper.emit(event)
+                dumper.emit(yaml.DocumentEndEvent(explicit=False))
+            dumper.emit(yaml.StreamEndEvent())
+        finally:
+            dumper.dispose()
+    elif format_type == 'toml':
+        if documents:
+            raise ValueError('TOML has no documents')
+        _stream_toml(obj, writer, backend.dump)
+    else:
+        raise ValueError(f"Can not stream format '{format_type}'")
+    writer.flush()
+
+
+def mmap_threshold(init_args: dict = None) -> int:
+    """
+    File size from where JSON and JSONL files are read memory mapped, instead of into a string.
+    Set with init arg or env var ``RICKLE_MMAP_THRESHOLD`` in bytes (default = 8 MiB). A negative value disables it.
+
+    Args:
+        init_args (dict): Init args possibly containing ``RICKLE_MMAP_THRESHOLD`` (default = None).
+
+    Returns:
+        int: Threshold in bytes.
+    """
+    init_args = init_args if init_args else dict()
+    return int(init_args.get('RICKLE_MMAP_THRESHOLD', os.getenv('RICKLE_MMAP_THRESHOLD', 8 * 1024 * 1024)))
+
+
+def use_mmap(file_path: Union[str, Path], init_args: dict = None) -> bool:
+    """
+    Whether a file should be read memory mapped, based on the suffix (``.json`` or ``.jsonl``) and the size.
+
+    Notes:
+        A JSON document is only mapped when it can be parsed from bytes, that is with a UTF-8 encoding and the
+        ``orjson`` backend. The stdlib backend needs the whole document as a string, which is no better than reading it.
+
+    Args:
+        file_path (str, Path): File path.
+        init_args (dict): Init args possibly containing ``RICKLE_MMAP_THRESHOLD`` (default = None).
+
+    Returns:
+        bool: True if the file is a large JSONL file, or a large JSON file that can be parsed from the map.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix not in ['.json', '.jsonl']:
+        return False
+    threshold = mmap_threshold(init_args)
+    if threshold < 0:
+        return False
+    if suffix == '.json' and not _parses_mapped(init_args):
+        return False
+    size = file_path.stat().st_size
+    return size > 0 and size >= threshold
+
+
+def _parses_mapped(init_args: dict = None) -> bool:
+    # Only orjson parses a JSON document from the mapped bytes without decoding a copy first
+    init_args = init_args if init_args else dict()
+    utf8 = init_args.get('encoding', 'utf-8').replace('_', '-').lower() in ['utf-8', 'utf8']
+    return utf8 and get_backend('json', init_args=init_args).name == 'orjson'
+
+
+def iter_mapped_lines(mapped: mmap.mmap, encoding: str = None) -> Iterator[Union[bytes, str]]:
+    """
+    Split a memory mapped file into lines at the byte level. Only one line at a time is copied out of the map.
+
+    Args:
+        mapped (mmap.mmap): Memory mapped file.
+        encoding (str): Decode lines with this encoding, else lines are yielded as bytes (default = None).
+
+    Returns:
+        Iterator: Non-empty lines.
+    """
+    position = 0
+    size = len(mapped)
+    while position < size:
+        end = mapped.find(b'\n', position)
+        if end == -1:
+            end = size
+        line = mapped[position:end]
+        position = end + 1
+        if line.strip():
+            yield line.decode(encoding) if encoding else line
+
+
+def load_mapped_file(file_path: Union[str, Path], input_type: str, init_args: dict = None,
+                     substitute: bool = False) -> tuple:
+    """
+    Load a JSON or JSONL file through a memory map, never holding both the file text and a copy of it in memory.
+    JSONL records are split at the byte level and decoded one at a time.
+
+    Notes:
+        With a UTF-8 encoding and the ``orjson`` backend, a JSON document is parsed straight from the map. With other
+        backends, or when templates are substituted, the document is decoded into a string first, so mapping only
+        helps JSONL files (see ``use_mmap``).
+        Init arg template substitution is only done when the opening braces appear in the file.
+
+    Args:
+        file_path (str, Path): File path.
+        input_type (str): Either "json" or "jsonl".
+        init_args (dict): Encoding, backend, and template arguments (default = None).
+        substitute (bool): Substitute init arg templates (default = False).
+
+    Raises:
+        ValueError: If the input type is not JSON or JSONL.
+
+    Returns:
+        tuple: Loaded data and the input type.
+    """
+    input_type = input_type.strip().lower()
+    if input_type not in ['json', 'jsonl']:
+        raise ValueError(f"Unsupported input type '{input_type}' for memory mapped loading")
+
+    init_args = init_args if init_args else dict()
+    encoding = init_args.get('encoding', 'utf-8')
+    backend = get_backend('json', init_args=init_args)
+    opening, closing, unresolved = template_options(init_args)
+    utf8 = encoding.replace('_', '-').lower() in ['utf-8', 'utf8']
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        substitute = substitute and mapped.find(opening.encode(encoding)) != -1
+
+        def _prepare(text):
+            if substitute:
+                return substitute_template(text, init_args, opening=opening, closing=closing, unresolved=unresolved)
+            return text
+
+        if input_type == 'jsonl':
+            # The stdlib and orjson both parse UTF-8 bytes directly
+            decode_as = encoding if (substitute or not utf8) else None
+            return [backend.loads(_prepare(line)) for line in iter_mapped_lines(mapped, encoding=decode_as)], 'array'
+
+        if not substitute and _parses_mapped(init_args):
+            view = memoryview(mapped)
+            try:
+                return backend.loads(view), 'json'
+            finally:
+                view.release()
+        return backend.loads(_prepare(str(mapped, encoding))), 'json'
+
+
+def clone_tree(value):
+    """
+    Fast structural clone of a loaded (JSON like) tree. Dicts and lists are copied, all other values are shared.
+
+    Args:
+        value: Loaded dict, list, or scalar.
+
+    Returns:
+        Independent copy of the tree.
+    """
+    if isinstance(value, dict):
+        return {k: clone_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [clone_tree(v) for v in value]
+    return value
+
+
+class ParseCache:
+    """
+    A process wide LRU cache of parsed files, keyed on the file identity (path, mtime, size, inode),
+    encoding and the init args used for templating. Every hit returns an independent clone of the parsed tree.
+
+    Notes:
+        Entries are evicted once either ``max_entries`` or ``max_bytes`` (measured as source file size) is exceeded.
+
+    Args:
+        max_entries (int): Maximum number of cached files (default = 128).
+        max_bytes (int): Maximum total size of cached source files in bytes (default = 64 MB).
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_key(file_path: Union[str, Path], encoding: str = 'utf-8', init_args: dict = None) -> tuple:
+        """
+        Create the cache key for a file.
+
+        Args:
+            file_path (str, Path): Path to the file.
+            encoding (str): File encoding (default = 'utf-8').
+            init_args (dict): Init args used for templating (default = None).
+
+        Returns:
+            tuple: Cache key.
+        """
+        file_path = Path(file_path).absolute()
+        stat = file_path.stat()
+        templating = json.dumps(init_args if init_args else dict(), sort_keys=True, default=str)
+        return str(file_path), stat.st_mtime_ns, stat.st_size, stat.st_ino, encoding, templating
+
+    def get(self, key: tuple):
+        """
+        Get a clone of a cached parse result.
+
+        Args:
+            key (tuple): Cache key, see ``file_key``.
+
+        Returns:
+            tuple: Cloned data and input type, or None if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        data, input_type, _ = entry
+        return clone_tree(data), input_type
+
+    def put(self, key: tuple, data, input_type: str):
+        """
+        Cache a clone of a parse result, evicting the least recently used entries if over budget.
+
+        Args:
+            key (tuple): Cache key, see ``file_key``.
+            data: Parsed data.
+            input_type (str): The input type of the parsed data.
+        """
+        size = key[2]
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+        entry = (clone_tree(data), input_type, size)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[2]
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> dict:
+        """
+        Cache statistics.
+
+        Returns:
+            dict: Hits, misses, evictions, entries, and bytes.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+
+parse_cache = ParseCache(max_entries=int(os.getenv("RICKLE_PARSE_CACHE_ENTRIES", 128)),
+                         max_bytes=int(os.getenv("RICKLE_PARSE_CACHE_BYTES", 64 * 1024 * 1024)))
+
+
 class cli_bcolors:
     HEADER = '\033[95m'
     OKBLUE = '\033[94m'
@@ -590,15 +1927,15 @@ class Schema:
 
                 if suffix == '.yaml':
                     with output_file.open("w") as fout:
-                        yaml.dump(schema, fout)
+                        get_backend('yaml').dump(schema, fout)
 
                 elif suffix == '.json':
                     with output_file.open("w") as fout:
-                        json.dump(schema, fout)
+                        get_backend('json').dump(schema, fout)
 
                 elif suffix == '.toml':
                     with output_file.open("wb") as fout:
-                        tomlw.dump(toml_null_stripper(schema), fout)
+                        get_backend('toml').dump(toml_null_stripper(schema), fout)
                 else:
                     raise ValueError(f"Cannot dump to format {suffix}, only supported {Schema.supported_output}")
 
@@ -665,12 +2002,12 @@ class Schema:
 
     @staticmethod
     def _extract_data_types(value: Union[list, dict, str, int, float, bool]):
-        if isinstance(value, list):
+        if _is_sequence(value):
             schema = list()
             for v in value:
                 schema.append(Schema._extract_data_types(v))
             return schema
-        if isinstance(value, dict):
+        if isinstance(value, Mapping):
             schema = OrderedDict()
             for k, v in value.items():
                 schema[k] = Schema._extract_data_types(v)
@@ -755,7 +2092,7 @@ class Schema:
         Validates if obj conforms to schema.
 
         Args:
-            obj: The object to check.
+            obj: The object to check, a dict or a read-only view given by ``as_mapping``.
             schema (dict): The schema in dict form.
             path (str): The current path of the object tree (default = 'root').
             no_print (bool): If failures should not be printed (default = False).
@@ -790,7 +2127,7 @@ class Schema:
             if not 'type' in schema_info.keys():
                 raise ValueError(f'No type defined in {str(schema_info)}!')
             schema_type = schema_info['type'].lower().strip()
-            object_type = type(object_value).__name__
+            object_type = _type_name(object_value)
             object_type_matches = False
 
             if schema_type == 'regex':
@@ -1053,7 +2390,7 @@ class Schema:
                     for i in range(obj_length):
                         new_path = f"{new_path}{_path_sep}[{i}]"
                         o = obj[i]
-                        elem_type = get_native_type_name(type(o).__name__, 'json')
+                        elem_type = get_native_type_name(_type_name(o), 'json')
                         if (single_type['type'] != 'any' and elem_type != single_type['type']) or (elem_type == 'integer' and single_type['type'] == 'number'):
                             if not no_print:
                                 print(
@@ -1137,11 +2474,11 @@ class Converter:
         else:
             input_type = input_type.strip().lower()
             if input_type == 'yaml':
-                d = yaml.safe_load(input_string)
+                d = get_backend('yaml').loads(input_string)
             elif input_type == 'json':
-                d = json.loads(input_string)
+                d = get_backend('json').loads(input_string)
             elif input_type == 'toml':
-                d = toml.loads(input_string)
+                d = get_backend('toml').loads(input_string)
             elif input_type == 'xml':
                 if importlib.util.find_spec('xmltodict'):
                     import xmltodict
@@ -1164,11 +2501,11 @@ class Converter:
                 raise ValueError(f"Input type must be string of value {','.join(Converter.supported_input)}")
 
         if output_type == 'yaml':
-            return yaml.safe_dump(d)
+            return get_backend('yaml').dump(d)
         elif output_type == 'json':
-            return json.dumps(d)
+            return get_backend('json').dump(d)
         elif output_type == 'toml':
-            return tomlw.dumps(toml_null_stripper(d))
+            return get_backend('toml').dump(toml_null_stripper(d))
         elif output_type == 'xml':
             if importlib.util.find_spec('xmltodict'):
                 import xmltodict
@@ -1192,7 +2529,7 @@ class Converter:
     @staticmethod
     def infer_read_string_type(string: str):
         """
-        Brute force try every possible loading.
+        Sniff the string type and load it, only trying other types if the sniffed type fails to load.
 
         Args:
             string (str): Input.
@@ -1201,47 +2538,9 @@ class Converter:
             dict: Loaded.
         """
         try:
-            return json.loads(string)
-        except:
-            pass
-
-        try:
-            return yaml.safe_load(string)
-        except:
-            pass
-
-        try:
-            return toml.loads(string)
-        except:
-            pass
-
-        try:
-            if importlib.util.find_spec('xmltodict'):
-                import xmltodict
-
-                return xmltodict.parse(string, process_namespaces=True)
-        except:
-            pass
-
-        try:
-            config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
-            config.read_string(string=string)
-            path_sep = os.getenv("RICKLE_INI_PATH_SEP", ".")
-            list_brackets = (os.getenv("RICKLE_INI_OPENING_BRACES", "("), os.getenv("RICKLE_INI_CLOSING_BRACES", ")"))
-
-            return parse_ini(config=config, path_sep=path_sep, list_brackets=list_brackets)
-        except:
-            pass
-
-        try:
-            if importlib.util.find_spec('dotenv'):
-                from dotenv import dotenv_values
-
-                return dotenv_values(stream=StringIO(string))
-        except:
-            pass
-
-        raise ValueError(f"Input type could not be inferred!")
+            return infer_load_string(string, process_namespaces=True).data
+        except ValueError:
+            raise ValueError(f"Input type could not be inferred!")
 
 
     @staticmethod
@@ -1265,17 +2564,23 @@ class Converter:
 
         suffix = input_file.suffix.lower() if input_file.suffix else None
 
+        if use_mmap(input_file):
+            try:
+                return load_mapped_file(input_file, input_type=suffix[1:])[0]
+            except ValueError:
+                pass
+
         if suffix == '.json':
             with input_file.open("r") as fin:
-                return json.load(fin)
+                return get_backend('json').loads(fin.read())
 
         if suffix in ['.yaml', '.yml']:
             with input_file.open("r") as fin:
-                return yaml.safe_load(fin)
+                return get_backend('yaml').loads(fin.read())
 
         if suffix == '.toml':
-            with input_file.open("rb") as fin:
-                return toml.load(fin)
+            with input_file.open("r", encoding='utf-8') as fin:
+                return get_backend('toml').loads(fin.read())
 
         if suffix == '.ini':
             config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
@@ -1303,47 +2608,7 @@ class Converter:
 
         try:
             with input_file.open("r") as fin:
-                return json.load(fin)
-        except:
-            pass
-
-        try:
-            with input_file.open("r") as fin:
-                return yaml.safe_load(fin)
-        except:
-            pass
-
-        try:
-            with input_file.open("rb") as fin:
-                return toml.load(fin)
-        except:
-            pass
-
-        try:
-            if importlib.util.find_spec('xmltodict'):
-                import xmltodict
-
-                with input_file.open("rb") as fin:
-                    return xmltodict.parse(fin, process_namespaces=True)
-        except:
-            pass
-
-        try:
-            config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
-            with input_file.open("r") as fin:
-                config.read_file(fin)
-            path_sep = os.getenv("RICKLE_INI_PATH_SEP", ".")
-            list_brackets = (os.getenv("RICKLE_INI_OPENING_BRACES", "("), os.getenv("RICKLE_INI_CLOSING_BRACES", ")"))
-
-            return parse_ini(config=config, path_sep=path_sep, list_brackets=list_brackets)
-        except:
-            pass
-
-        try:
-            if importlib.util.find_spec('dotenv'):
-                from dotenv import dotenv_values
-
-                return dotenv_values(dotenv_path=str(input_file.absolute()))
+                return Converter.infer_read_string_type(fin.read())
         except:
             pass
 
@@ -1389,15 +2654,15 @@ class Converter:
 
                 if suffix == '.yaml':
                     with output_file.open("w") as fout:
-                        yaml.safe_dump(input_data, fout)
+                        get_backend('yaml').dump(input_data, fout)
 
                 if suffix == '.json':
                     with output_file.open("w") as fout:
-                        json.dump(input_data, fout)
+                        get_backend('json').dump(input_data, fout)
 
                 if suffix == '.toml':
                     with output_file.open("wb") as fout:
-                        tomlw.dump(toml_null_stripper(input_data), fout)
+                        get_backend('toml').dump(toml_null_stripper(input_data), fout)
 
                 if suffix == '.xml':
                     if importlib.util.find_spec('xmltodict'):
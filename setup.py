@@ -51,6 +51,7 @@ setup(
         'dotenv':  ['python-dotenv'],
         'validators':  ["py.validator;python_version>'3.7'"],
         'jsonschema': ["jsonschema'[format]'"],
+        'fast':  ['orjson', 'rtoml'],
         'full': ["py.validator;python_version>'3.7'", 'python-dotenv', 'xmltodict', 'twisted', 'pyopenssl', "jsonschema'[format]'"]
     },
     entry_points={
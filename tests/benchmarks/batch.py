@@ -0,0 +1,55 @@
+"""
+Benchmark applying many overrides with ``put`` one by one, and at once with ``put_many``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.batch --overrides 5000
+"""
+import argparse
+import itertools
+import string
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import best_of
+
+
+def generate_overrides(overrides: int, depth: int = 4) -> dict:
+    """
+    Generate overrides for paths that share their prefixes, like '/level_a/level_c/level_b/key_abc'.
+    """
+    names = 'abcdefgh'
+    keys = (''.join(p) for p in itertools.product(string.ascii_lowercase, repeat=3))
+    return {''.join(f'/level_{names[(i >> (3 * d)) % len(names)]}' for d in range(depth - 1)) + f'/key_{key}': i
+            for i, key in zip(range(overrides), keys)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched overrides')
+    parser.add_argument('--overrides', type=int, default=5000, help='Number of overrides per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    overrides = generate_overrides(args.overrides)
+
+    def put():
+        test_rickle = BaseRickle({})
+        for path, value in overrides.items():
+            test_rickle.put(path, value)
+
+    def put_many():
+        BaseRickle({}).put_many(overrides)
+
+    results = [('put', best_of(args.repeat, put))]
+    if hasattr(BaseRickle, 'put_many'):
+        results.append(('put_many', best_of(args.repeat, put_many)))
+        test_rickle = BaseRickle({})
+        test_rickle.put_many(overrides)
+        paths = list(overrides)
+        results.append(('get', best_of(args.repeat, lambda: [test_rickle.get(path) for path in paths])))
+        results.append(('get_many', best_of(args.repeat, lambda: test_rickle.get_many(paths))))
+    for name, timing in results:
+        print(f"{name:<10} {args.overrides} paths: {timing * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
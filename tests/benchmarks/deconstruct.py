@@ -0,0 +1,41 @@
+"""
+Benchmark repeated ``dict()`` and ``to_json`` calls, with and without ``RICKLE_DICT_CACHE``, and after a single change.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.deconstruct --nodes 100000
+"""
+import argparse
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import generate_document, best_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark repeated deconstruction')
+    parser.add_argument('--nodes', type=int, default=100000, help='Approximate number of nodes in the document')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    document = generate_document(args.nodes)
+    path = '/' + '/'.join(['aaa'] * 5)
+
+    for name, init_args in [('plain', dict()), ('cached', {'RICKLE_DICT_CACHE': True})]:
+        test_rickle = BaseRickle(document, strict=False, **init_args)
+        test_rickle.dict()
+
+        def changed():
+            test_rickle.set(path, 0)
+            return test_rickle.dict()
+
+        results = [
+            ('dict', best_of(args.repeat, test_rickle.dict)),
+            ('to_json', best_of(args.repeat, test_rickle.to_json)),
+            ('set+dict', best_of(args.repeat, changed)),
+        ]
+        for action, timing in results:
+            print(f"{name:<8} {action:<10} {args.nodes} nodes: {timing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
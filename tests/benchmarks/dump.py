@@ -0,0 +1,61 @@
+"""
+Measure the peak memory and time of writing a large array (JSON lines and YAML documents) and a large object to a
+stream, encoding the whole document first against the streaming encoders of ``to_json`` and ``to_yaml``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.dump --records 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from rickle import BaseRickle
+from rickle.tools import get_backend
+from tests.benchmarks.internalize import generate_document
+from tests.benchmarks.memory import measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure streamed serializer output')
+    parser.add_argument('--records', type=int, default=20000, help='Number of records in the array')
+    parser.add_argument('--nodes', type=int, default=20, help='Approximate number of nodes per record')
+    parser.add_argument('--chunk-size', type=int, default=64 * 1024, help='Write buffer size')
+    args = parser.parse_args()
+
+    records = BaseRickle([generate_document(args.nodes) for _ in range(args.records)], strict=False)
+    document = BaseRickle({'records': records.list()}, strict=False)
+    json_backend = get_backend('json')
+    yaml_backend = get_backend('yaml')
+
+    def whole_lines(fs):
+        fs.write('\n'.join(json_backend.dump(r) for r in records.list()))
+
+    def whole_yaml(fs):
+        fs.write(yaml_backend.dump_all(records.list()))
+
+    def whole_json(fs):
+        fs.write(json_backend.dump(document.dict()))
+
+    tasks = [
+        ('jsonl', whole_lines, lambda fs: records.to_json(fs, chunk_size=args.chunk_size)),
+        ('yaml', whole_yaml, lambda fs: records.to_yaml(fs, chunk_size=args.chunk_size)),
+        ('json', whole_json, lambda fs: document.to_json(fs, chunk_size=args.chunk_size)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dump')
+        for task, whole, streamed in tasks:
+            for name, func in [('whole', whole), ('streamed', streamed)]:
+                with open(path, 'w', encoding='utf-8') as fs:
+                    start = time.perf_counter()
+                    _, peak = measure(lambda: func(fs))
+                    elapsed = time.perf_counter() - start
+                size = os.path.getsize(path)
+                print(f"{task:<6} {name:<9} {args.records} records ({size / 2 ** 20:.1f} MiB): "
+                      f"{peak / 2 ** 20:.1f} MiB peak, {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
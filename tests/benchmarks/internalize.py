@@ -0,0 +1,78 @@
+"""
+Benchmark internalizing a large document into a Rickle.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.internalize --nodes 100000
+"""
+import argparse
+import itertools
+import string
+import time
+
+from rickle import BaseRickle, Rickle
+
+
+def generate_document(nodes: int, fan_out: int = 10) -> dict:
+    """
+    Generate a nested document with roughly the given number of nodes (dicts and leaves), with ``fan_out`` keys per dict.
+    """
+    names = [''.join(p) for p in itertools.product(string.ascii_lowercase, repeat=3)][:fan_out]
+    count = 0
+
+    def _node(depth):
+        nonlocal count
+        node = dict()
+        for name in names:
+            if count >= nodes:
+                break
+            count += 1
+            if depth > 0:
+                node[name] = _node(depth - 1)
+            else:
+                node[name] = count
+        return node
+
+    depth = 0
+    while fan_out ** (depth + 1) < nodes:
+        depth += 1
+    return _node(depth)
+
+
+def best_of(repeat: int, func) -> float:
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Rickle internalization')
+    parser.add_argument('--nodes', type=int, default=100000, help='Number of nodes in the document')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    document = generate_document(args.nodes)
+
+    first_path = ''
+    node = document
+    while isinstance(node, dict):
+        key = next(iter(node))
+        first_path += f'/{key}'
+        node = node[key]
+
+    for cls in [BaseRickle, Rickle]:
+        eager = cls(document)
+        results = [
+            ('construct', best_of(args.repeat, lambda: cls(document))),
+            ('dict', best_of(args.repeat, lambda: eager.dict())),
+            ('lazy construct and get', best_of(args.repeat, lambda: cls(document, lazy=True).get(first_path))),
+        ]
+        for name, timing in results:
+            print(f"{cls.__name__:<12} {name:<24} {args.nodes} nodes: {timing * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark looking up keys by their original (uncleaned) names, like ``x-request-id``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.keys --keys 1000
+"""
+import argparse
+import itertools
+import string
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import best_of
+
+
+def generate_headers(keys: int) -> dict:
+    """
+    Generate a flat document of hyphenated keys that all change under name cleanup.
+    """
+    names = (''.join(p) for p in itertools.product(string.ascii_lowercase, repeat=3))
+    return {f'x-{name}-id': i for i, name in zip(range(keys), names)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lookups by original key name')
+    parser.add_argument('--keys', type=int, default=1000, help='Number of hyphenated keys in the document')
+    parser.add_argument('--lookups', type=int, default=10000, help='Number of lookups per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    document = generate_headers(args.keys)
+    test_rickle = BaseRickle(document)
+    test_rickle.add('x-last-id', 0)
+    names = list(document.keys())
+    lookups = [names[i % len(names)] for i in range(args.lookups)]
+
+    results = [
+        ('get', best_of(args.repeat, lambda: [test_rickle.get(name) for name in lookups])),
+        ('meta', best_of(args.repeat, lambda: [test_rickle.meta('x-last-id') for _ in lookups])),
+    ]
+    for name, timing in results:
+        print(f"{name:<8} {args.lookups} lookups over {args.keys} keys: {timing * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
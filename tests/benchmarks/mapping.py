@@ -0,0 +1,39 @@
+"""
+Measure the peak memory and time of encoding and validating a Rickle through ``dict()`` and through ``as_mapping()``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.mapping --nodes 20000
+"""
+import argparse
+import time
+
+from rickle import BaseRickle
+from rickle.tools import Schema, get_backend
+from tests.benchmarks.internalize import generate_document
+from tests.benchmarks.memory import measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure read-only views against deconstructed dicts')
+    parser.add_argument('--nodes', type=int, default=20000, help='Approximate number of nodes in the document')
+    args = parser.parse_args()
+
+    test_rickle = BaseRickle(generate_document(args.nodes), strict=False)
+    schema = Schema.generate_schema_from_obj(test_rickle.dict(), include_extended_properties=False)
+    dump = get_backend('json').dump
+
+    tasks = [
+        ('json', lambda data: dump(data)),
+        ('validate', lambda data: Schema.schema_validation(data, schema)),
+    ]
+    for task, func in tasks:
+        for name, source in [('dict', test_rickle.dict), ('as_mapping', test_rickle.as_mapping)]:
+            start = time.perf_counter()
+            _, peak = measure(lambda: func(source()))
+            elapsed = time.perf_counter() - start
+            print(f"{task:<10} {name:<12} {args.nodes} nodes: {peak / 2 ** 20:.1f} MiB peak, {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
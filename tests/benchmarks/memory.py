@@ -0,0 +1,53 @@
+"""
+Measure the memory used by internalized Rickle nodes with tracemalloc.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.memory --nodes 100000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from rickle import BaseRickle, Rickle
+from tests.benchmarks.internalize import generate_document
+
+
+def measure(func) -> tuple:
+    """
+    Returns the retained and peak bytes allocated by calling ``func``, the result is kept alive while measuring.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak
+
+
+def count_objects(value) -> int:
+    if isinstance(value, dict):
+        return 1 + sum(count_objects(v) for v in value.values())
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure Rickle node memory')
+    parser.add_argument('--nodes', type=int, default=100000, help='Number of nodes in the document')
+    parser.add_argument('--fan-out', type=int, default=2, help='Keys per object, small values give many small objects')
+    args = parser.parse_args()
+
+    document = generate_document(args.nodes, fan_out=args.fan_out)
+    objects = count_objects(document)
+    data_retained, _ = measure(lambda: generate_document(args.nodes, fan_out=args.fan_out))
+    print(f"{'raw dict':<12} {objects} objects: {data_retained / 2 ** 20:.1f} MiB, "
+          f"{data_retained / objects:.0f} bytes per object")
+
+    for cls in [BaseRickle, Rickle]:
+        retained, peak = measure(lambda: cls(document))
+        print(f"{cls.__name__:<12} {objects} objects: {retained / 2 ** 20:.1f} MiB retained, "
+              f"{peak / 2 ** 20:.1f} MiB peak, {retained / objects:.0f} bytes per object")
+
+if __name__ == '__main__':
+    main()
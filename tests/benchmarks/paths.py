@@ -0,0 +1,65 @@
+"""
+Benchmark resolving deep paths with ``__call__``, with and without the path index, and wildcard patterns.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.paths --depth 8
+"""
+import argparse
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import best_of
+
+
+def generate_deep_document(depth: int, fan_out: int = 4) -> tuple:
+    """
+    Generate a document nested ``depth`` levels deep, returns the document and the path to its deepest leaf.
+    """
+    def _node(level):
+        if level == 0:
+            return {f'leaf_{name}': name for name in 'abcd'[:fan_out]}
+        return {f'node_{name}': _node(level - 1) for name in 'abcd'[:fan_out]}
+
+    path = '/node_a' * depth + '/leaf_a'
+    return _node(depth), path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark deep path lookups')
+    parser.add_argument('--depth', type=int, default=8, help='Depth of the document')
+    parser.add_argument('--lookups', type=int, default=100000, help='Number of lookups per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    document, path = generate_deep_document(args.depth, fan_out=2)
+    test_rickle = BaseRickle(document)
+    compiled = test_rickle.compile_path(path)
+    lookups = range(args.lookups)
+
+    results = [
+        ('path', best_of(args.repeat, lambda: [test_rickle(path) for _ in lookups])),
+        ('compiled', best_of(args.repeat, lambda: [test_rickle(compiled) for _ in lookups])),
+    ]
+    test_rickle.build_index()
+    results.append(('indexed', best_of(args.repeat, lambda: [test_rickle(path) for _ in lookups])))
+
+    for name, timing in results:
+        print(f"{name:<10} {args.lookups} lookups at depth {args.depth}: {timing * 1000:.1f} ms")
+
+    # Every leaf_a, as a pattern and as a loop over keys()
+    pattern_rickle = BaseRickle(document)
+    pattern = '/*' * args.depth + '/leaf_a'
+
+    def loop():
+        level = [('', pattern_rickle)]
+        for _ in range(args.depth):
+            level = [(f'{p}/{k}', node.get(k)) for p, node in level for k in node.keys()]
+        return [(f'{p}/leaf_a', node.get('leaf_a')) for p, node in level]
+
+    matches = len(pattern_rickle(pattern))
+    for name, func in [('loop', loop), ('pattern', lambda: pattern_rickle(pattern))]:
+        print(f"{name:<10} {matches} matches at depth {args.depth}: {best_of(args.repeat, func) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
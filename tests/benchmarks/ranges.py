@@ -0,0 +1,54 @@
+"""
+Benchmark range and equality queries with ``find_key_value`` over an array of records, with and without a sorted index.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.ranges --records 1000000
+"""
+import argparse
+import random
+import time
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import best_of
+
+
+def generate_records(records: int, seed: int = 0) -> list:
+    """
+    Generate records like ``{'host': 'host_abc', 'port': 8080}``, with ports spread over a wide range.
+    """
+    rng = random.Random(seed)
+    return [{'host': f'host_{i}', 'port': rng.randrange(records * 10)} for i in range(records)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sorted indexes for find_key_value')
+    parser.add_argument('--records', type=int, default=1000000, help='Number of records in the array')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    test_rickle = BaseRickle(generate_records(args.records))
+    # A range query selecting about 100 records, and an equality query
+    low = args.records * 10 - 1000
+    port = test_rickle[0]['port']
+
+    results = [
+        ('scan >', best_of(args.repeat, lambda: test_rickle.find_key_value('port', low, '>'))),
+        ('scan =', best_of(args.repeat, lambda: test_rickle.find_key_value('port', port, '='))),
+    ]
+    if hasattr(test_rickle, 'create_index'):
+        start = time.perf_counter()
+        test_rickle.create_index('port')
+        results.append(('create', time.perf_counter() - start))
+        results.append(('index >', best_of(args.repeat, lambda: test_rickle.find_key_value('port', low, '>'))))
+        results.append(('index =', best_of(args.repeat, lambda: test_rickle.find_key_value('port', port, '='))))
+        results.append(('update', best_of(args.repeat, lambda: [test_rickle[i].set('port', i) for i in range(1000)])
+                        / 1000))
+
+    matches = len(test_rickle.find_key_value('port', low, '>'))
+    for name, timing in results:
+        print(f"{name:<8} {args.records} records, {matches} in range: {timing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark searching paths by key name with ``search_path``, and by key and value with ``find_key_value``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.search --nodes 100000
+"""
+import argparse
+import time
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import generate_document, best_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Rickle path searches')
+    parser.add_argument('--nodes', type=int, default=100000, help='Number of nodes in the document')
+    parser.add_argument('--searches', type=int, default=100, help='Number of searches per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    test_rickle = BaseRickle(generate_document(args.nodes))
+    key = next(iter(test_rickle.keys()))
+
+    start = time.perf_counter()
+    paths = test_rickle.search_path(key)
+    walk = time.perf_counter() - start
+    print(f"{'walk':<10} {args.nodes} nodes, {len(paths)} paths: {walk * 1000:.1f} ms")
+
+    if hasattr(test_rickle, 'build_index'):
+        start = time.perf_counter()
+        test_rickle.build_index()
+        build = time.perf_counter() - start
+        repeated = best_of(args.repeat, lambda: [test_rickle.search_path(key) for _ in range(args.searches)])
+        print(f"{'build':<10} {args.nodes} nodes: {build * 1000:.1f} ms")
+        print(f"{'indexed':<10} {args.nodes} nodes, {len(paths)} paths: "
+              f"{repeated / args.searches * 1000:.3f} ms per search")
+        test_rickle.drop_index()
+
+    results = [('find', best_of(args.repeat, lambda: test_rickle.find_key_value(key, 0, '!=')))]
+    if hasattr(test_rickle, 'iter_find'):
+        results.append(('find first', best_of(args.repeat, lambda: next(test_rickle.iter_find(key, 0, '!=')))))
+    for name, timing in results:
+        print(f"{name:<10} {args.nodes} nodes: {timing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark taking a read-only copy of a large Rickle and changing one value, with ``snapshot()`` against rebuilding
+the tree from ``dict()``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.snapshot --nodes 100000
+"""
+import argparse
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import generate_document, best_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark snapshots')
+    parser.add_argument('--nodes', type=int, default=100000, help='Approximate number of nodes in the document')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    test_rickle = BaseRickle(generate_document(args.nodes), strict=False)
+    path = '/' + '/'.join(['aaa'] * 5)
+
+    def rebuild():
+        copy = BaseRickle(test_rickle.dict(), strict=False)
+        test_rickle.set(path, 0)
+        return copy
+
+    def snapshot():
+        copy = test_rickle.snapshot()
+        test_rickle.set(path, 0)
+        return copy
+
+    results = [
+        ('rebuild+set', best_of(args.repeat, rebuild)),
+        ('snapshot+set', best_of(args.repeat, snapshot)),
+    ]
+    for name, timing in results:
+        print(f"{name:<14} {args.nodes} nodes: {timing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
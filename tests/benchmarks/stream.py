@@ -0,0 +1,44 @@
+"""
+Benchmark searching a large JSON file with ``stream_search``, against loading it into a Rickle and using ``search_path``.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.stream --records 200000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from rickle import BaseRickle
+from rickle.tools import stream_search
+from tests.benchmarks.memory import measure
+from tests.benchmarks.ranges import generate_records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streamed searches')
+    parser.add_argument('--records', type=int, default=200000, help='Number of records in the file')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as fp:
+        json.dump({'export': generate_records(args.records)}, fp)
+    size = os.path.getsize(fp.name)
+
+    try:
+        # Paths are counted, so that the peak memory is the memory used while searching
+        for name, func in [('loaded', lambda: len(BaseRickle(fp.name).search_path('port'))),
+                           ('streamed', lambda: sum(1 for _ in stream_search(fp.name, 'port')))]:
+            start = time.perf_counter()
+            matches = func()
+            elapsed = time.perf_counter() - start
+            _, peak = measure(func)
+            print(f"{name:<10} {size / 2 ** 20:.1f} MiB file, {matches} paths: {elapsed * 1000:.0f} ms, "
+                  f"peak {peak / 2 ** 20:.2f} MiB")
+    finally:
+        os.remove(fp.name)
+
+
+if __name__ == '__main__':
+    main()
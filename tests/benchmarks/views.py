@@ -0,0 +1,37 @@
+"""
+Benchmark ``len``, ``has``, ``keys``, and iteration over a node with many nested children.
+
+Run from the repository root with:
+
+    python -m tests.benchmarks.views --nodes 100000
+"""
+import argparse
+
+from rickle import BaseRickle
+from tests.benchmarks.internalize import generate_document, best_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark top level node protocols')
+    parser.add_argument('--nodes', type=int, default=100000, help='Approximate number of nodes in the document')
+    parser.add_argument('--fan-out', type=int, default=100, help='Number of keys per dict')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs, the best is reported')
+    args = parser.parse_args()
+
+    test_rickle = BaseRickle(generate_document(args.nodes, fan_out=args.fan_out), strict=False)
+    name = next(iter(test_rickle))
+
+    results = [
+        ('len', best_of(args.repeat, lambda: len(test_rickle))),
+        ('has', best_of(args.repeat, lambda: test_rickle.has(name))),
+        ('keys', best_of(args.repeat, lambda: list(test_rickle.keys()))),
+        ('iterate', best_of(args.repeat, lambda: [k for k in test_rickle])),
+        ('items', best_of(args.repeat, lambda: list(test_rickle.items()))),
+    ]
+
+    for name, timing in results:
+        print(f"{name:<10} {args.nodes} nodes: {timing * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import importlib.util
+import tomli_w
+from io import StringIO, BytesIO
+from rickle import Rickle
+from rickle.tools import available_backends, get_backend, load_string
+
+class TestBackendConformance(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = {
+            'name': 'rickle',
+            'version': 1.5,
+            'count': 42,
+            'negative': -7,
+            'enabled': True,
+            'unicode': 'Zürich ☕',
+            'nested': {'mixed': [1, 'two', 3.0, False], 'empty': {}, 'deep': {'deeper': {'deepest': 'value'}}},
+            'records': [{'id': 1, 'tags': ['a', 'b']}, {'id': 2, 'tags': []}],
+        }
+        self.json_string = get_backend('json', name='json').dump(self.tree)
+        self.yaml_string = get_backend('yaml', name='pyyaml').dump(self.tree)
+        self.toml_string = get_backend('toml', name='tomllib').dump(self.tree)
+
+    def test_json_backends(self):
+        for name in available_backends('json'):
+            backend = get_backend('json', name=name)
+            self.assertDictEqual(backend.loads(self.json_string), self.tree, msg=name)
+            self.assertDictEqual(backend.loads(backend.dump(self.tree)), self.tree, msg=name)
+
+            stream = StringIO()
+            backend.dump(self.tree, stream)
+            self.assertDictEqual(backend.loads(stream.getvalue()), self.tree, msg=name)
+
+    def test_yaml_backends(self):
+        for name in available_backends('yaml'):
+            backend = get_backend('yaml', name=name)
+            self.assertDictEqual(backend.loads(self.yaml_string), self.tree, msg=name)
+            self.assertDictEqual(backend.loads(backend.dump(self.tree)), self.tree, msg=name)
+            self.assertListEqual(backend.loads_all(backend.dump_all([self.tree, self.tree])), [self.tree, self.tree],
+                                 msg=name)
+
+    def test_toml_backends(self):
+        # TOML has no null or heterogeneous free form, the tree above is valid TOML
+        for name in available_backends('toml'):
+            backend = get_backend('toml', name=name)
+            self.assertDictEqual(backend.loads(self.toml_string), self.tree, msg=name)
+            self.assertDictEqual(backend.loads(backend.dump(self.tree)), self.tree, msg=name)
+
+            stream = BytesIO()
+            backend.dump(self.tree, stream)
+            self.assertDictEqual(backend.loads(stream.getvalue().decode('utf-8')), self.tree, msg=name)
+
+    def test_rickle_backends(self):
+        for name in available_backends('json'):
+            r = Rickle(self.json_string, RICKLE_JSON_BACKEND=name)
+            self.assertDictEqual(r.dict(), self.tree, msg=name)
+            self.assertDictEqual(Rickle(r.to_json()).dict(), self.tree, msg=name)
+        for name in available_backends('yaml'):
+            r = Rickle(self.yaml_string, RICKLE_YAML_BACKEND=name)
+            self.assertDictEqual(r.dict(), self.tree, msg=name)
+            self.assertDictEqual(Rickle(r.to_yaml()).dict(), self.tree, msg=name)
+
+    def test_backend_selection(self):
+        self.assertEqual(get_backend('json', init_args={'RICKLE_JSON_BACKEND': 'json'}).name, 'json')
+
+        # The output of to_json does not depend on the installed backends
+        self.assertEqual(get_backend('json').name, 'json')
+        self.assertEqual(Rickle({'a': 'Zürich', 'b': [1, 2]}).to_json(), '{"a": "Z\\u00fcrich", "b": [1, 2]}')
+
+        os.environ['RICKLE_YAML_BACKEND'] = 'pyyaml'
+        try:
+            self.assertEqual(get_backend('yaml').name, 'pyyaml')
+        finally:
+            del os.environ['RICKLE_YAML_BACKEND']
+
+        # Unknown backends fall back to the default
+        with self.assertWarns(UserWarning):
+            self.assertEqual(get_backend('json', name='unknown').name, available_backends('json')[0])
+
+        self.assertDictEqual(load_string('a: 1', 'yaml', RICKLE_YAML_BACKEND='pyyaml')[0], {'a': 1})
+
+    def test_toml_output(self):
+        # The output of to_toml does not depend on the installed backends
+        tree = {'a': 1, 'c': {'x': 1}, 'b': 2, 'arr': [{'k': 1}, {'k': 2}], 'l': [1, 2, 3]}
+        self.assertEqual(get_backend('toml').name, 'tomllib')
+        self.assertEqual(Rickle(tree).to_toml(), tomli_w.dumps(tree))
+        self.assertEqual(Rickle(tree).to_toml(), get_backend('toml', name='tomllib').dump(tree))
+
+    @unittest.skipUnless(importlib.util.find_spec('rtoml'), 'rtoml is not installed')
+    def test_rtoml_output(self):
+        # rtoml writes tables last, lists of dicts as [[name]] tables, and lists on one line. It gives the same
+        # document, but different text, so it is only used when picked.
+        tree = {'a': 1, 'c': {'x': 1}, 'b': 2, 'arr': [{'k': 1}, {'k': 2}], 'l': [1, 2, 3]}
+        text = Rickle(tree, RICKLE_TOML_BACKEND='rtoml').to_toml()
+        self.assertNotEqual(text, Rickle(tree).to_toml())
+        self.assertEqual(text, 'a = 1\nb = 2\nl = [1, 2, 3]\n\n[[arr]]\nk = 1\n\n[[arr]]\nk = 2\n\n[c]\nx = 1\n')
+        self.assertDictEqual(Rickle(text).dict(), tree)
+
+
+if __name__ == "__main__":
+    unittest.main()
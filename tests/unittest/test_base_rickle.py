@@ -1,5 +1,12 @@
 import unittest
-from rickle import BaseRickle
+import os
+import pickle
+import tempfile
+import threading
+from io import StringIO, BytesIO
+from rickle import BaseRickle, SnapshotError
+from collections.abc import Mapping, Sequence
+from rickle.tools import parse_cache, get_backend, flatten_dict, Schema
 
 class TestBaseRickle(unittest.TestCase):
 
@@ -40,12 +47,34 @@ class TestBaseRickle(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.base_rickle.set("/key_one/going/nowhere", "slowly")
 
+        # Paths through lists that can not be set raise the same errors as before lists could be traversed
+        test_rickle = BaseRickle({'a': {'l': [{'k': 1}, {'k': 2}]}})
+        with self.assertRaises(KeyError):
+            test_rickle.set('/a/l/[1]/k', 3)
+        with self.assertRaises(KeyError):
+            test_rickle.set('/a/l/[5]/k', 3)
+        test_rickle = BaseRickle({'a': {'l': [{'k': 1}, {'k': 2}]}}, deep=True)
+        test_rickle.set('/a/l/[1]/k', 3)
+        self.assertEqual(test_rickle('/a/l/[1]/k'), 3)
+        with self.assertRaises(KeyError):
+            test_rickle.set('/a/l/[1]/k/z', 3)
+
     def test_remove(self):
         self.base_rickle.remove("key_one")
         self.assertIsNone(self.base_rickle.get("key_one"))
         with self.assertRaises(KeyError):
             self.base_rickle.remove("nonexistent_key")
 
+        # Error types are the same as before paths could go through lists
+        with self.assertRaises(KeyError):
+            BaseRickle([{'a': 1}]).remove('/[0]')
+        test_rickle = BaseRickle({'a': {'v': 1, 'l': [{'k': 1}]}, 's': 'x'})
+        for path in ['/a/v/x', '/s/x', '/a/l/[0]', '/a/l/x', '/a/l/[5]/k']:
+            with self.assertRaises(AttributeError):
+                test_rickle.remove(path)
+        with self.assertRaises(NameError):
+            test_rickle.remove('/a/x/y')
+
     def test_values(self):
         values = list(self.base_rickle.values())
         self.assertIn("value_one", values)
@@ -145,6 +174,637 @@ class TestBaseRickle(unittest.TestCase):
         self.assertEqual(self.base_rickle.get('name_with_numbers1929'), 'buy_stock')
         self.assertEqual(self.base_rickle.get('name_with_numbers'), 'buy_stock')
 
+    def test_parse_cache(self):
+        parse_cache.clear()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'config.yaml')
+            with open(file_path, 'w') as f:
+                f.write('path:\n  to:\n    value: cached\n')
+
+            first = BaseRickle(file_path, RICKLE_PARSE_CACHE=True)
+            second = BaseRickle(file_path, RICKLE_PARSE_CACHE=True)
+            self.assertEqual(parse_cache.info()['misses'], 1)
+            self.assertEqual(parse_cache.info()['hits'], 1)
+            self.assertEqual(second._input_type, 'yaml')
+
+            # Hits are independent trees
+            first.set('/path/to/value', 'changed')
+            self.assertEqual(second.get('/path/to/value'), 'cached')
+            self.assertEqual(BaseRickle(file_path, RICKLE_PARSE_CACHE=True).get('/path/to/value'), 'cached')
+
+            # Different template args are a different entry
+            BaseRickle(file_path, RICKLE_PARSE_CACHE=True, value=1)
+            self.assertEqual(parse_cache.info()['entries'], 2)
+
+            # Changing the file invalidates the entry
+            with open(file_path, 'w') as f:
+                f.write('path:\n  to:\n    value: updated and longer\n')
+            self.assertEqual(BaseRickle(file_path, RICKLE_PARSE_CACHE=True).get('/path/to/value'), 'updated and longer')
+        parse_cache.clear()
+
+    def test_iter_documents(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jsonl_path = os.path.join(tmp_dir, 'records.jsonl')
+            with open(jsonl_path, 'w') as f:
+                f.write('{"id": 1, "name": {{name}}}\n\n{"id": 2, "nested": {"value": 2}}\n[1, 2]\n')
+
+            records = list(BaseRickle.iter_documents(jsonl_path, name='first'))
+            self.assertEqual(len(records), 3)
+            self.assertIsInstance(records[0], BaseRickle)
+            self.assertEqual(records[0].name, 'first')
+            self.assertEqual(records[1].get('/nested/value'), 2)
+            self.assertEqual(records[2], [1, 2])
+
+            batches = list(BaseRickle.iter_documents(jsonl_path, as_dict=True, batch_size=2, name='second'))
+            self.assertEqual([len(b) for b in batches], [2, 1])
+            self.assertEqual(batches[0][1], {'id': 2, 'nested': {'value': 2}})
+
+            yaml_path = os.path.join(tmp_dir, 'records.yaml')
+            with open(yaml_path, 'w') as f:
+                f.write('---\nid: 1\n---\n# comment\nid: 2\n...\n---\nid: 3\n')
+            self.assertEqual([r.id for r in BaseRickle.iter_documents(yaml_path)], [1, 2, 3])
+
+            # Stream input with the type sniffed from the first line
+            with open(jsonl_path, 'r') as f:
+                self.assertEqual(len(list(BaseRickle.iter_documents(f, name='x'))), 3)
+
+            with self.assertRaises(ValueError):
+                next(BaseRickle.iter_documents(jsonl_path, input_type='toml'))
+
+    def test_lazy(self):
+        data = {'path': {'to': {'value': 1}, 'records': [{'a': 1}, 2]}, 'other': {'key': 'value'}, 'scalar': 3}
+        test_rickle = BaseRickle(data, deep=True, lazy=True)
+
+        # Untouched nodes are passed through, as a copy
+        self.assertDictEqual(test_rickle.dict()['other'], data['other'])
+        self.assertIsNotNone(test_rickle.path._pending)
+        test_rickle.dict()['other']['key'] = 'changed'
+        list(test_rickle.values())[1]['key'] = 'changed'
+        self.assertEqual(data['other']['key'], 'value')
+        self.assertEqual(test_rickle('/other/key'), 'value')
+
+        self.assertEqual(test_rickle.path.to.value, 1)
+        self.assertIsNone(test_rickle.path._pending)
+        self.assertIsInstance(test_rickle.path.to, BaseRickle)
+        self.assertEqual(test_rickle.get('/path/records/[0]/a'), 1)
+        self.assertEqual(test_rickle('/other/key'), 'value')
+        self.assertEqual(test_rickle.get('value', do_recursive=True), 1)
+        self.assertDictEqual(test_rickle.dict(), data)
+        self.assertListEqual(list(test_rickle.keys()), ['path', 'other', 'scalar'])
+
+        test_rickle = BaseRickle(data, lazy=True)
+        test_rickle.set('/other/key', 'changed')
+        test_rickle.put('/path/to/new', 2)
+        test_rickle.remove('/path/records')
+        self.assertDictEqual(test_rickle.dict(), {'path': {'to': {'value': 1, 'new': 2}},
+                                                  'other': {'key': 'changed'}, 'scalar': 3})
+        self.assertEqual(data['other']['key'], 'value')
+
+        # Hidden, renamed, and reserved keys give the same as without lazy
+        for data in [{'a': {'_h': 1, 'b': 2}}, {'a': {'x-id': 1, 'b': 2}}, {'records': [{'_h': 1}]}]:
+            for deep in [False, True]:
+                self.assertDictEqual(BaseRickle(data, deep=deep, lazy=True).dict(), BaseRickle(data, deep=deep).dict())
+                self.assertListEqual(list(BaseRickle(data, deep=deep, lazy=True).values()),
+                                     list(BaseRickle(data, deep=deep).values()))
+        self.assertDictEqual(BaseRickle({'a': {'_h': 1}}, lazy=True).dict(), {'a': {}})
+        with self.assertRaises(NameError):
+            BaseRickle({'keys': 1}, lazy=True).dict()
+        self.assertDictEqual(BaseRickle({'keys': 1}, lazy=True, strict=False).dict(), {'keys': 1})
+
+    def test_reserved_names(self):
+        with self.assertRaises(NameError):
+            BaseRickle({'path': {'items': 1}})
+        test_rickle = BaseRickle({'path': {'to': 1}}, RICKLE_PATH_SEP='.')
+        with self.assertRaises(NameError):
+            test_rickle.add('path', 2)
+        # Settings are resolved once and shared with child nodes
+        self.assertEqual(test_rickle.path._path_sep, '.')
+        self.assertEqual(test_rickle.get('.path.to'), 1)
+        self.assertIsNotNone(BaseRickle({'items': 1}, strict=False))
+
+    def test_compact_nodes(self):
+        test_rickle = BaseRickle({'path': {'to-value': 1}, 'other': {'key': 'value'}})
+
+        # Only keys are stored in the instance dict, node headers are slots
+        self.assertListEqual(list(test_rickle.__dict__.keys()), ['path', 'other'])
+        self.assertIs(test_rickle.path._settings, test_rickle._settings)
+        self.assertIs(test_rickle.other._keys_map, test_rickle._keys_map)
+        self.assertDictEqual(test_rickle.path._keys_map, {'tovalue': 'to-value'})
+
+        test_rickle.other.add('new', 1)
+        self.assertDictEqual(test_rickle.other.meta(), {'new': {'type': 'attribute', 'value': 1}})
+        self.assertDictEqual(test_rickle.path.meta(), {})
+
+        copied = pickle.loads(pickle.dumps(test_rickle))
+        self.assertDictEqual(copied.dict(), test_rickle.dict())
+        copied.add('more', 2)
+        self.assertFalse(test_rickle.has('more'))
+
+    def test_parallel_sources(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sources = list()
+            for i in range(6):
+                file_path = os.path.join(tmp_dir, f'fragment_{i}.yaml')
+                with open(file_path, 'w') as f:
+                    f.write(f'id: {i}\nname: {{{{name}}}}\n')
+                sources.append(file_path)
+            sources.append({'id': 'inline'})
+
+            expected = [{'id': i, 'name': 'fragment'} for i in range(6)] + [{'id': 'inline'}]
+            for pool in ['thread', 'process']:
+                test_rickle = BaseRickle(sources, workers=3, pool=pool, name='fragment')
+                self.assertEqual(test_rickle._input_type, 'array')
+                self.assertListEqual(test_rickle.list(), expected)
+
+            with self.assertRaises(ValueError):
+                BaseRickle(sources, workers=2, pool='unknown')
+
+    def test_compiled_path(self):
+        test_rickle = BaseRickle({'path': {'to': [1, {'value': 2}]}}, deep=True)
+        compiled = test_rickle.compile_path('/path/to/[1]/value')
+
+        self.assertEqual(test_rickle(compiled), 2)
+        self.assertEqual(test_rickle.get(compiled), 2)
+        test_rickle.set(compiled, 3)
+        self.assertEqual(test_rickle('/path/to/[1]/value'), 3)
+
+        new_path = test_rickle.compile_path('/path/new/value')
+        test_rickle.put(new_path, 4)
+        self.assertEqual(test_rickle.get(new_path), 4)
+        test_rickle.remove(new_path)
+        self.assertIsNone(test_rickle.get(new_path))
+
+        with self.assertRaises(KeyError):
+            test_rickle.compile_path('path/to')
+
+    def test_original_key_names(self):
+        test_rickle = BaseRickle({'headers': {'x-request-id': 'abc', 'content.type': 'json'}})
+        headers = test_rickle.headers
+
+        self.assertEqual(headers.get('x-request-id'), 'abc')
+        self.assertEqual(headers.get('xrequestid'), 'abc')
+        self.assertEqual(headers['content.type'], 'json')
+
+        headers.add('x-trace-id', 1)
+        self.assertEqual(headers.get('x-trace-id'), 1)
+        self.assertEqual(headers.meta('x-trace-id')['value'], 1)
+        headers['x-trace-id'] = 2
+        self.assertEqual(headers.xtraceid, 2)
+        self.assertDictEqual(headers.dict(), {'x-request-id': 'abc', 'content.type': 'json', 'x-trace-id': 2})
+
+        # Both sides of the index are updated when a key is removed
+        del headers['x-request-id']
+        self.assertIsNone(headers.get('x-request-id'))
+        self.assertNotIn('xrequestid', headers._keys_map)
+        self.assertNotIn('x-request-id', headers._names_map)
+
+        # A cleaned name mapped again replaces the previous original name
+        headers.add('x.trace.id', 3)
+        self.assertIsNone(headers._names_map.get('x-trace-id'))
+        self.assertEqual(headers.get('x.trace.id'), 3)
+
+    def test_path_index(self):
+        test_rickle = BaseRickle({'path': {'to': [1, {'value': 2}], 'other': 'x'}}, deep=True)
+        test_rickle.build_index()
+        index = test_rickle._index[0].paths
+        self.assertIn('/path/to/[1]/value', index)
+        self.assertEqual(test_rickle('/path/to/[1]/value'), 2)
+        self.assertEqual(test_rickle.path('/to/[1]/value'), 2)
+
+        # Changes patch the index
+        test_rickle.set('/path/to/[1]/value', 3)
+        self.assertEqual(test_rickle('/path/to/[1]/value'), 3)
+        test_rickle.put('/path/new/key', 4)
+        self.assertEqual(index['/path/new/key'], 4)
+        test_rickle.remove('/path/new')
+        self.assertNotIn('/path/new/key', index)
+        self.assertIsNone(test_rickle.get('/path/new/key'))
+        test_rickle.path['other'] = BaseRickle({'nested': 5})
+        self.assertEqual(test_rickle('/path/other/nested'), 5)
+
+        test_rickle.drop_index()
+        self.assertIsNone(test_rickle.path._index)
+        self.assertEqual(test_rickle('/path/other/nested'), 5)
+
+        list_rickle = BaseRickle([{'a': 1}, {'b': 2}])
+        list_rickle.build_index()
+        del list_rickle[0]
+        self.assertEqual(list_rickle('/[0]/b'), 2)
+        self.assertNotIn('/[1]', list_rickle._index[0].paths)
+
+    def test_search_index(self):
+        test_rickle = BaseRickle({'path': {'to': {'value': 1}, 'records': [{'value': 2}]}, 'value': 3})
+        self.assertListEqual(test_rickle.search_path('value'), ['/value', '/path/to/value', '/path/records/[0]/value'])
+        self.assertIsNone(test_rickle._index)
+        test_rickle.build_index()
+        self.assertListEqual(test_rickle.search_path('value'), ['/value', '/path/to/value', '/path/records/[0]/value'])
+        self.assertIsNotNone(test_rickle._index[0].keys)
+
+        # Searches below the root are relative to the node searched
+        self.assertListEqual(test_rickle.path.search_path('value'), ['/to/value', '/records/[0]/value'])
+        self.assertListEqual(test_rickle.path.search_path('value', report_parent=True), ['/to', '/records/[0]'])
+
+        # Changes only patch the index
+        test_rickle.remove('/path/to')
+        test_rickle.put('/other/value', 4)
+        test_rickle['value'] = {'nested': {'value': 5}}
+        self.assertCountEqual(test_rickle.search_path('value'),
+                              ['/value', '/other/value', '/value/nested/value', '/path/records/[0]/value'])
+        test_rickle.remove('/path/records/[0]/value')
+        self.assertNotIn('/path/records/[0]/value', test_rickle.search_path('value'))
+        self.assertListEqual(test_rickle.search_path('to'), [])
+
+        copied = pickle.loads(pickle.dumps(test_rickle))
+        self.assertCountEqual(copied.search_path('value'), test_rickle.search_path('value'))
+
+        # Without an index, changes that are not tracked are still found
+        test_rickle = BaseRickle({'a': {'value': 1}, 'b': {'x': 0}, 'records': [{'id': 1}]}, deep=True)
+        self.assertListEqual(test_rickle.search_path('value'), ['/a/value'])
+        self.assertListEqual(test_rickle.search_path('id'), ['/records/[0]/id'])
+        test_rickle.b.value = 5
+        test_rickle.records.append(BaseRickle({'id': 2}))
+        self.assertListEqual(test_rickle.search_path('value'), ['/a/value', '/b/value'])
+        self.assertListEqual(test_rickle.search_path('id'), ['/records/[0]/id', '/records/[1]/id'])
+
+        # With an index, attributes assigned directly and lists changed in place are picked up as well
+        test_rickle.build_index()
+        test_rickle.records.append(BaseRickle({'id': 3}))
+        self.assertListEqual(test_rickle.search_path('id'), ['/records/[0]/id', '/records/[1]/id', '/records/[2]/id'])
+        self.assertEqual(test_rickle('/records/[2]/id'), 3)
+        test_rickle.a = {'x': 1}
+        test_rickle.records[0].value = 6
+        self.assertListEqual(test_rickle.search_path('value'), ['/b/value', '/records/[0]/value'])
+        del test_rickle.records[1:]
+        self.assertListEqual(test_rickle.search_path('id'), ['/records/[0]/id'])
+        with self.assertRaises(IndexError):
+            test_rickle('/records/[1]/id')
+
+        # Also dicts and the lists in them, when not internalized
+        test_rickle = BaseRickle({'a': {'records': [{'id': 1}]}})
+        test_rickle.build_index()
+        test_rickle.a['records'][0]['id'] = 2
+        test_rickle.a['records'].append({'id': 3})
+        test_rickle.a['other'] = {'id': 4}
+        self.assertListEqual(test_rickle.search_path('id'), ['/a/records/[0]/id', '/a/records/[1]/id', '/a/other/id'])
+        self.assertEqual(test_rickle.to_json(), '{"a": {"records": [{"id": 2}, {"id": 3}], "other": {"id": 4}}}')
+        self.assertEqual(test_rickle.to_yaml(), 'a:\n  other:\n    id: 4\n  records:\n  - id: 2\n  - id: 3\n')
+        loaded = pickle.loads(pickle.dumps(test_rickle.a['records']))
+        self.assertIs(type(loaded), list)
+        self.assertIs(type(loaded[0]), dict)
+
+    def test_find_key_value(self):
+        test_rickle = BaseRickle({'path': {'to': {'value': 1}, 'records': [{'value': 2}, {'other': {'a': 1}}]},
+                                  'value': 3, 'x-id': 4}, deep=True)
+
+        self.assertListEqual(test_rickle.find_key_value('value', 2, '>='), ['/value', '/path/records/[0]/value'])
+        self.assertListEqual(test_rickle.find_key_value('value', 2, 'lt', report_parent=True), ['/path/to'])
+        self.assertListEqual(test_rickle.find_key_value('other', {'a': 1}, '='), ['/path/records/[1]/other'])
+        self.assertListEqual(test_rickle.find_key_value('x-id', 4, 'eq'), ['/x-id'])
+        self.assertListEqual(test_rickle.find_key_value('value', 0, '!=', limit=2), ['/value', '/path/to/value'])
+        self.assertListEqual(test_rickle.find_key_value('value', 0, 'unknown'), [])
+
+        # Only walks as far as needed
+        found = test_rickle.iter_find('value', 1, '=')
+        self.assertEqual(next(found), '/path/to/value')
+        with self.assertRaises(StopIteration):
+            next(found)
+
+        self.assertListEqual(test_rickle.search_path('value', limit=1), ['/value'])
+        self.assertIsNone(test_rickle._index)
+        self.assertListEqual(BaseRickle([{'a': 1}, {'a': 2}]).find_key_value('a', 2, '='), ['/[1]/a'])
+
+    def test_find_where(self):
+        test_rickle = BaseRickle({'first': {'threshold': 0.5, 'enabled': True},
+                                  'second': {'threshold': 0.9, 'enabled': False},
+                                  'third': {'threshold': 0.1, 'nested': {'threshold': 0.3, 'enabled': True}}})
+
+        # All conditions under the same parent, also for different keys
+        self.assertListEqual(test_rickle.find(where=['threshold > 0.2', 'enabled = true'], report_parent=True),
+                             ['/first', '/third/nested'])
+        self.assertListEqual(test_rickle.find(where=['threshold gt 0.2', ('threshold', '<', 0.8)]),
+                             ['/first/threshold', '/third/nested/threshold'])
+        self.assertListEqual(test_rickle.find(any_of=['threshold < 0.2', 'threshold > 0.8']),
+                             ['/second/threshold', '/third/threshold'])
+        self.assertListEqual(test_rickle.find(where=['enabled = true'], any_of=['threshold > 0.8'], report_parent=True),
+                             ['/first', '/second', '/third/nested'])
+        self.assertListEqual(test_rickle.find(where=['enabled = true'], limit=1), ['/first/enabled'])
+        self.assertListEqual(test_rickle.find(), [])
+        with self.assertRaises(ValueError):
+            test_rickle.find(where=['threshold ~ 1'])
+
+    def test_path_patterns(self):
+        test_rickle = BaseRickle({'servers': {'alpha': {'port': 80, 'timeout': 5}, 'beta': {'port': 81}},
+                                  'clusters': [{'nodes': [{'ip': 'a'}, {'ip': 'b'}]}, {'nodes': [{'ip': 'c'}]}],
+                                  'timeout': 1})
+
+        self.assertListEqual(test_rickle('/servers/*/port'), [('/servers/alpha/port', 80), ('/servers/beta/port', 81)])
+        self.assertListEqual([m.value for m in test_rickle('/clusters/[*]/nodes/[*]/ip')], ['a', 'b', 'c'])
+        self.assertListEqual([m.path for m in test_rickle.get('//timeout')], ['/timeout', '/servers/alpha/timeout'])
+        self.assertListEqual(test_rickle('/servers/*/missing'), [])
+        self.assertListEqual(test_rickle(test_rickle.compile_path('/clusters/[1]/nodes/[*]/ip')),
+                             [('/clusters/[1]/nodes/[0]/ip', 'c')])
+        self.assertListEqual(BaseRickle([{'a': 1}, {'a': 2}])('/[*]/a'), [('/[0]/a', 1), ('/[1]/a', 2)])
+
+        with self.assertRaises(KeyError):
+            test_rickle.set('/servers/*/port', 8080)
+
+    def test_batch_paths(self):
+        test_rickle = BaseRickle({'servers': {'alpha': {'port': 80}, 'beta': {'port': 81}}, 'x-request-id': 'abc'})
+
+        self.assertListEqual(test_rickle.get_many(['/servers/alpha/port', 'x-request-id', '/servers/gamma/port',
+                                                   test_rickle.compile_path('/servers/beta/port'), '/servers/*/port']),
+                             [80, 'abc', None, 81, [('/servers/alpha/port', 80), ('/servers/beta/port', 81)]])
+        self.assertListEqual(test_rickle.get_many(['/servers/gamma/port'], default=0), [0])
+
+        test_rickle.build_index()
+        test_rickle.set_many({'/servers/alpha/port': 8080, '/servers/beta/port': 8081, 'x-request-id': 'def'})
+        self.assertDictEqual(test_rickle.dict(), {'servers': {'alpha': {'port': 8080}, 'beta': {'port': 8081}},
+                                                  'x-request-id': 'def'})
+        self.assertEqual(test_rickle('/servers/beta/port'), 8081)
+
+        test_rickle.put_many({'/servers/gamma/port': 82, '/servers/gamma/host': 'localhost', '/servers/alpha/port': 80})
+        self.assertEqual(test_rickle('/servers/gamma/host'), 'localhost')
+        self.assertIn('/servers/gamma/port', test_rickle._index[0].paths)
+        self.assertDictEqual(test_rickle.get('/servers/gamma').dict(), {'port': 82, 'host': 'localhost'})
+
+        with self.assertRaises(KeyError):
+            test_rickle.set_many({'/servers/delta/port': 83, '/servers/alpha/port': 1})
+        with self.assertRaises(NameError):
+            test_rickle.set_many({'/servers/alpha/host': 'localhost'})
+        with self.assertRaises(KeyError):
+            test_rickle.set_many({'/servers/alpha': 1, '/servers/alpha/port': 1})
+        with self.assertRaises(KeyError):
+            test_rickle.put_many({'/servers/*/port': 1})
+        self.assertEqual(test_rickle('/servers/alpha/port'), 80)
+
+        array_rickle = BaseRickle([{'port': 80}, {'port': 81}])
+        array_rickle.set_many({'/[1]/port': 8081})
+        self.assertListEqual(array_rickle.get_many(['/[0]/port', '/[1]/port', '/[2]/port']), [80, 8081, None])
+
+    def test_sorted_index(self):
+        test_rickle = BaseRickle([{'host': 'a', 'port': 8080}, {'host': 'b', 'port': 80}, {'host': 'c', 'port': 443},
+                                  {'host': 'd', 'port': 80}])
+        test_rickle.create_index('port')
+
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '='), ['/[1]/port', '/[3]/port'])
+        self.assertListEqual(test_rickle.find_key_value('port', 443, '>='), ['/[0]/port', '/[2]/port'])
+        self.assertListEqual(test_rickle.find_key_value('port', 443, 'lt', report_parent=True), ['/[1]', '/[3]'])
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '>', limit=1), ['/[0]/port'])
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '!='), ['/[0]/port', '/[2]/port'])
+        self.assertListEqual(test_rickle[0].find_key_value('port', 80, '>'), ['/port'])
+
+        # The index gives the same paths as a search, limits included
+        nested = BaseRickle({'b': {'port': 1, 'x': {'port': 3}}, 'port': 2, 'a': [{'port': 0}]}, deep=True)
+        expected = nested.find_key_value('port', 0, '>=')
+        self.assertListEqual(expected, ['/port', '/b/port', '/b/x/port', '/a/[0]/port'])
+        nested.create_index('port')
+        self.assertListEqual(nested.find_key_value('port', 0, '>='), expected)
+        for limit in range(1, 5):
+            self.assertListEqual(nested.find_key_value('port', 0, '>=', limit=limit), expected[:limit])
+            self.assertListEqual(test_rickle.find_key_value('port', 80, '>=', limit=limit),
+                                 ['/[0]/port', '/[1]/port', '/[2]/port', '/[3]/port'][:limit])
+
+        # The index follows changes to the document
+        test_rickle[0].set('port', 22)
+        test_rickle[2].remove('port')
+        test_rickle[3].add('ports', {'port': 8443})
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '<='), ['/[0]/port', '/[1]/port', '/[3]/port'])
+        self.assertListEqual(test_rickle.find_key_value('port', 1024, '>'), ['/[3]/ports/port'])
+        del test_rickle[0]
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '='), ['/[0]/port', '/[2]/port'])
+
+        # Attributes assigned directly and lists changed in place are picked up
+        servers = BaseRickle({'records': [{'port': 22}]}, deep=True)
+        servers.create_index('port')
+        servers.records[0].port = 80
+        servers.records.append(BaseRickle({'port': 80}))
+        self.assertListEqual(servers.find_key_value('port', 80, '='), ['/records/[0]/port', '/records/[1]/port'])
+        servers.records.sort(key=lambda r: r.get('port'))
+        servers.records.insert(0, BaseRickle({'port': 443}))
+        self.assertListEqual(servers.find_key_value('port', 80, '>'), ['/records/[0]/port'])
+
+        # Values that can not be ordered with the others are only compared for equality
+        test_rickle[1].set('host', None)
+        test_rickle.create_index('host')
+        self.assertListEqual(test_rickle.find_key_value('host', None, '='), ['/[1]/host'])
+        with self.assertRaises(TypeError):
+            test_rickle.find_key_value('host', 'a', '>')
+
+        test_rickle.drop_index('host')
+        self.assertListEqual(test_rickle.find_key_value('port', 80, '='), ['/[0]/port', '/[2]/port'])
+        test_rickle.drop_index()
+        self.assertListEqual(test_rickle.find_key_value('port', 22, '>'), ['/[0]/port', '/[2]/port', '/[2]/ports/port'])
+
+    def test_views(self):
+        test_rickle = BaseRickle({'x-id': 1, 'nested': {'a': [{'b': 2}]}, '_hidden': 3})
+        keys, values, items = test_rickle.keys(), test_rickle.values(), test_rickle.items()
+        self.assertListEqual(list(keys), ['x-id', 'nested'])
+        self.assertListEqual(list(values), [1, {'a': [{'b': 2}]}])
+        self.assertEqual(len(test_rickle), 2)
+        self.assertTrue('x-id' in keys and 'x-id' in test_rickle)
+        self.assertFalse('xid' in keys or test_rickle.has('_hidden'))
+        self.assertTrue(('x-id', 1) in items and {'a': [{'b': 2}]} in values)
+        self.assertFalse(('x-id', 2) in items or ('_hidden', 3) in items or 3 in values)
+
+        # Keys and items are sets like those of a dict
+        self.assertEqual(keys, {'x-id', 'nested'})
+        self.assertSetEqual(keys & {'nested', 'other'}, {'nested'})
+        self.assertSetEqual(keys - {'nested'}, {'x-id'})
+        self.assertSetEqual(items & {('x-id', 1), ('x-id', 2)}, {('x-id', 1)})
+        self.assertNotEqual(keys, ['x-id', 'nested'])
+
+        # Views are live
+        test_rickle.add('other', 4)
+        self.assertTupleEqual(list(items)[-1], ('other', 4))
+        self.assertEqual(len(keys), 3)
+
+        # Iterators do not share their position
+        first, second = iter(test_rickle), iter(test_rickle)
+        next(first)
+        self.assertEqual(next(second), 'x-id')
+        self.assertListEqual(list(first), ['nested', 'other'])
+
+    def test_dict_cache(self):
+        test_rickle = BaseRickle({'a': {'b': {'c': 1}}, 'd': {'e': 2}, 'l': [{'f': 3}]}, deep=True,
+                                 RICKLE_DICT_CACHE=True)
+        cached = test_rickle.dict()
+        self.assertIs(test_rickle.dict(), cached)
+        self.assertIsNot(test_rickle.dict(serialised=True), cached)
+        sibling = test_rickle['d'].dict()
+
+        # Changes reach the nodes above, nodes beside keep their dictionary
+        test_rickle.set('/a/b/c', 4)
+        self.assertDictEqual(test_rickle.dict()['a'], {'b': {'c': 4}})
+        self.assertIs(test_rickle['d'].dict(), sibling)
+        test_rickle.put('/a/b/g', 5)
+        test_rickle['l'][0]['f'] = 6
+        test_rickle.remove('/d/e')
+        test_rickle.get('a').add('h', 7)
+        self.assertDictEqual(test_rickle.dict(), {'a': {'b': {'c': 4, 'g': 5}, 'h': 7}, 'd': {}, 'l': [{'f': 6}]})
+
+        test_rickle = BaseRickle([{'a': 1}, {'a': 2}], RICKLE_DICT_CACHE=True)
+        self.assertIs(test_rickle.list(), test_rickle.list())
+        test_rickle[1]['a'] = 3
+        self.assertListEqual(test_rickle.list(), [{'a': 1}, {'a': 3}])
+
+        # Off by default
+        self.assertIsNot(self.base_rickle.dict(), self.base_rickle.dict())
+
+    def test_as_mapping(self):
+        test_rickle = BaseRickle({'x-id': 1, 'nested': {'a': [{'b': 1}, {'b': 2}]}, '_hidden': 3}, deep=True)
+        view = test_rickle.as_mapping()
+        self.assertIsInstance(view, Mapping)
+        self.assertEqual(view, test_rickle.dict())
+        self.assertIsInstance(view['nested']['a'], Sequence)
+        self.assertEqual(view['nested']['a'][1]['b'], 2)
+        with self.assertRaises(KeyError):
+            view['_hidden']
+        with self.assertRaises(TypeError):
+            view['x-id'] = 2
+
+        # Views read the current state
+        test_rickle.set('/nested/a/[1]/b', 3)
+        self.assertEqual(view['nested']['a'][1]['b'], 3)
+
+        self.assertEqual(get_backend('json').dump(view), get_backend('json').dump(test_rickle.dict()))
+        self.assertEqual(get_backend('yaml').dump(view), get_backend('yaml').dump(test_rickle.dict()))
+        self.assertDictEqual(flatten_dict(view, '/'), flatten_dict(test_rickle.dict(), '/'))
+        schema = Schema.generate_schema_from_obj(test_rickle.dict())
+        self.assertTrue(Schema.schema_validation(view, schema, no_print=True))
+
+        self.assertEqual(BaseRickle([{'a': 1}]).as_mapping(), [{'a': 1}])
+
+    def test_streamed_output(self):
+        test_rickle = BaseRickle({'nested': {'a': [{'b': 1}, {'b': None}], 'c': 'ü'}, 'numbers': list(range(1500))},
+                                 lazy=True)
+        for format_type in ['json', 'yaml']:
+            output = StringIO()
+            getattr(test_rickle, f"to_{format_type}")(output, chunk_size=16)
+            self.assertEqual(output.getvalue(), getattr(test_rickle, f"to_{format_type}")())
+        output = BytesIO()
+        test_rickle.to_toml(output, chunk_size=16)
+        self.assertEqual(output.getvalue().decode('utf-8'), test_rickle.to_toml())
+
+        array_rickle = BaseRickle([{'a': i, 'b': {'c': [i]}} for i in range(10)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'records.jsonl')
+            array_rickle.to_json(file_path, chunk_size=16)
+            with open(file_path) as f:
+                self.assertEqual(f.read(), array_rickle.to_json() + '\n')
+            file_path = os.path.join(tmp_dir, 'records.yaml')
+            array_rickle.to_yaml(file_path)
+            with open(file_path) as f:
+                self.assertEqual(f.read(), array_rickle.to_yaml())
+            self.assertEqual(BaseRickle(file_path).list(), array_rickle.list())
+
+    def test_snapshot(self):
+        test_rickle = BaseRickle({'path': {'to': {'value': 1}}, 'other': {'value': 2},
+                                  'records': [{'id': 1}, {'id': 2}]}, deep=True)
+        test_rickle.build_index()
+        expected = test_rickle.dict()
+        snapshot = test_rickle.snapshot()
+
+        test_rickle.set('/path/to/value', 10)
+        test_rickle.put('/path/new/value', 3)
+        test_rickle.set('/records/[1]/id', 20)
+        test_rickle.remove('/other/value')
+        test_rickle['added'] = True
+        test_rickle.put_many({'/path/to/more': 4})
+        test_rickle.set_many({'/records/[0]/id': 10})
+
+        self.assertDictEqual(snapshot.dict(), expected)
+        self.assertEqual(snapshot('/path/to/value'), 1)
+        self.assertEqual(snapshot.get('/records/[1]/id'), 2)
+        self.assertListEqual(snapshot.search_path('id'), ['/records/[0]/id', '/records/[1]/id'])
+        self.assertEqual(test_rickle('/path/to/value'), 10)
+        self.assertEqual(test_rickle('/records/[1]/id'), 20)
+        self.assertFalse(test_rickle.other.has('value'))
+        self.assertTrue(snapshot.other.has('value'))
+
+        # Only the nodes that are accessed are copied, untouched nodes are read from the snapshot
+        test_rickle.set('/path/to/value', 11)
+        self.assertIs(snapshot.get('/path/new'), None)
+        self.assertIsNot(snapshot.get('/path/to'), test_rickle.get('/path/to'))
+        later = test_rickle.snapshot()
+        test_rickle.set('/records/[0]/id', 0)
+        self.assertIs(test_rickle.get('/path')._pending, later.get('/path'))
+        self.assertDictEqual(test_rickle.get('/path').dict(), later.get('/path').dict())
+        self.assertEqual(later('/records/[0]/id'), 10)
+
+        for change in [lambda: snapshot.set('/path/to/value', 0), lambda: snapshot.put('/x', 0),
+                       lambda: snapshot.remove('/path'), lambda: snapshot.add('x', 0),
+                       lambda: snapshot.__setitem__('x', 0), snapshot.build_index]:
+            with self.assertRaises(TypeError):
+                change()
+
+        # Readers keep a consistent view while the tree is changed
+        snapshot = test_rickle.snapshot()
+        expected = snapshot.to_json()
+        errors = list()
+
+        def read():
+            for _ in range(200):
+                if snapshot.to_json() != expected or snapshot('/path/to/value') != 11:
+                    errors.append(snapshot.to_json())
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(500):
+            test_rickle.set('/path/to/value', i)
+            test_rickle.put(f'/path/new/key', i)
+        for reader in readers:
+            reader.join()
+        self.assertListEqual(errors, [])
+        self.assertEqual(test_rickle('/path/to/value'), 499)
+
+        # Nodes got from a snapshot are read only
+        test_rickle = BaseRickle({'p': {'v': 1, 'd': {'x': 1}}, 'records': [{'id': 1}]}, deep=True)
+        snapshot = test_rickle.snapshot()
+        for change in [lambda: snapshot['p'].__setitem__('v', 99), lambda: snapshot.p.set('v', 100),
+                       lambda: snapshot.p.add('w', 0), lambda: snapshot.p.__delitem__('v'),
+                       lambda: snapshot.p.remove('/d/x'), lambda: snapshot.records[0].set('id', 2),
+                       lambda: setattr(snapshot.p, 'v', 101)]:
+            with self.assertRaises(SnapshotError):
+                change()
+        self.assertDictEqual(snapshot.dict(), {'p': {'v': 1, 'd': {'x': 1}}, 'records': [{'id': 1}]})
+
+        # Nodes got from the object are its own, changing them does not change the snapshot
+        test_rickle['p']['v'] = 2
+        test_rickle.p.set('d', {'x': 2})
+        test_rickle.p.add('w', 3)
+        test_rickle.records[0]['id'] = 2
+        test_rickle.records[0].name = 'a'
+        self.assertDictEqual(snapshot.dict(), {'p': {'v': 1, 'd': {'x': 1}}, 'records': [{'id': 1}]})
+        self.assertDictEqual(test_rickle.dict(), {'p': {'v': 2, 'd': {'x': 2}, 'w': 3},
+                                                  'records': [{'id': 2, 'name': 'a'}]})
+
+        # Nodes got before a snapshot belong to it, they are got again to be changed
+        node = test_rickle.p
+        later = test_rickle.snapshot()
+        with self.assertRaises(SnapshotError):
+            node['v'] = 4
+        self.assertIsInstance(SnapshotError(), TypeError)
+        test_rickle.p['v'] = 4
+        self.assertEqual(later('/p/v'), 2)
+        self.assertEqual(test_rickle('/p/v'), 4)
+
+        # Lazily loaded nodes share lists with the snapshot until they are changed
+        test_rickle = BaseRickle({'p': {'l': [{'k': {'d': 1, 'e': 2}}]}}, lazy=True)
+        snapshot = test_rickle.snapshot()
+        test_rickle.remove('/p/l/[0]/k/d')
+        self.assertDictEqual(snapshot.dict(), {'p': {'l': [{'k': {'d': 1, 'e': 2}}]}})
+        self.assertDictEqual(test_rickle.dict(), {'p': {'l': [{'k': {'e': 2}}]}})
+
+        # Generations are counted per object, snapshots of one object do not freeze the nodes of another
+        other = BaseRickle({'p': {'v': 1}})
+        node = other.p
+        generation = other._settings.versions.generation
+        test_rickle.snapshot()
+        self.assertEqual(other._settings.versions.generation, generation)
+        node['v'] = 2
+        self.assertEqual(other('/p/v'), 2)
+
 
 
 
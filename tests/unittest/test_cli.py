@@ -50,6 +50,33 @@ class TestCLITool(unittest.TestCase):
         # Compare actual and expected output
         self.assertEqual(classify_string(result.stdout), 'yaml', msg=f"Unexpected CLI output: {result.stdout}")
 
+    def test_cli_obj_find(self):
+        command_rickle = f'{self.python_command} -m {self.rickled_command} {self.obj_tool} find ' \
+                         f'--and "threshold gt 0.2" "enabled = true" -p'
+
+        result = subprocess.run(command_rickle,
+                                shell=True,
+                                input='first:\n  threshold: 0.5\n  enabled: true\nsecond:\n  threshold: 0.1\n',
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                text=True)
+
+        self.assertEqual(result.returncode, 0, msg=f"CLI returned non-zero exit code: {result.returncode}")
+        self.assertEqual(result.stdout.strip(), '/first')
+
+        command_rickle = f'{self.python_command} -m {self.rickled_command} {self.obj_tool} find ' \
+                         f'"threshold gt 0.2" --stream'
+
+        result = subprocess.run(command_rickle,
+                                shell=True,
+                                input='{"first": {"threshold": 0.5}, "second": {"threshold": 0.1}}',
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE,
+                                text=True)
+
+        self.assertEqual(result.returncode, 0, msg=f"CLI returned non-zero exit code: {result.returncode}")
+        self.assertEqual(result.stdout.strip(), '/first/threshold')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from rickle import Rickle
+from rickle import Rickle, UnsafeRickle
 import os
 import base64
 import tempfile
@@ -93,6 +93,28 @@ class TestBaseRickle(unittest.TestCase):
         self.rickle.add_file("bowser", './tests/placebos/6D6172696F.txt')
         self.assertTrue(self.rickle.get("bowser").startswith("d061"))
 
+    def test_dict_cache(self):
+        test_rickle = Rickle({'nested': {'a': 1}}, RICKLE_DICT_CACHE=True)
+        cached = test_rickle.dict()
+        self.assertIs(test_rickle.dict(), cached)
+        test_rickle.add_env('my_var', 'MY_ENV_VAR', default='nil')
+        self.assertDictEqual(test_rickle.dict(), {'nested': {'a': 1}, 'my_var': 'test_value'})
+        self.assertDictEqual(test_rickle.dict(serialised=True)['my_var'],
+                             {'type': 'env', 'load': 'MY_ENV_VAR', 'default': 'nil'})
+
+        # Rickle hides hot loaded values, so the dictionary is still kept
+        test_rickle['nested'] = Rickle(RICKLE_DICT_CACHE=True)
+        test_rickle['nested'].add_random_value('number', 'integer', hot_load=True)
+        self.assertIs(test_rickle.dict(), test_rickle.dict())
+        self.assertDictEqual(test_rickle.dict(), {'nested': {}, 'my_var': 'test_value'})
+
+        # UnsafeRickle shows them, hot loaded values are never kept, neither are the nodes above them
+        test_rickle['nested'] = UnsafeRickle(RICKLE_DICT_CACHE=True)
+        test_rickle['nested'].add_random_value('number', 'integer', hot_load=True)
+        self.assertIsNot(test_rickle.dict(), test_rickle.dict())
+        self.assertIsNot(test_rickle['nested'].dict(), test_rickle['nested'].dict())
+        self.assertTrue(callable(test_rickle.dict()['nested']['number']))
+
     def test_add_html_page(self):
 
         self.rickle.add_html_page("html_content", "https://zipfian.science/")
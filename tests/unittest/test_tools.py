@@ -0,0 +1,310 @@
+import unittest
+import importlib.util
+import warnings
+import os
+import tempfile
+from rickle.tools import sniff_string, infer_load_string, classify_string, Converter, ParseCache, \
+    substitute_template, template_pattern, load_mapped_file, use_mmap, compile_path, parse_condition, \
+    iter_json_events, stream_search, stream_find, stream_dump, get_backend, toml_null_stripper, template_options, \
+    path_step, ChunkWriter
+from io import StringIO, BytesIO
+
+class TestSniffing(unittest.TestCase):
+
+    def test_sniff_string(self):
+        self.assertEqual(sniff_string('{"a": 1}').format, 'json')
+        self.assertEqual(sniff_string('{"a": 1}\n{"a": 2}').format, 'jsonl')
+        self.assertEqual(sniff_string('# comment\na: 1\nb: 2').format, 'yaml')
+        self.assertEqual(sniff_string('---\na: 1').format, 'yaml')
+        self.assertEqual(sniff_string('title = "rickle"').format, 'toml')
+        self.assertEqual(sniff_string('[server]\nhost = localhost').format, 'toml')
+        self.assertEqual(sniff_string('<?xml version="1.0"?><a>1</a>').format, 'xml')
+        self.assertEqual(sniff_string('[1, 2, 3]').format, 'json')
+
+        sniffed = sniff_string('a: 1')
+        self.assertEqual(len(sniffed.candidates), len(set(sniffed.candidates)))
+        self.assertGreaterEqual(sniffed.elapsed, 0)
+
+    def test_infer_load_string(self):
+        inferred = infer_load_string('{"a": 1}\n{"a": 2}\n')
+        self.assertEqual(inferred.format, 'jsonl')
+        self.assertEqual(inferred.input_type, 'array')
+        self.assertListEqual(inferred.data, [{'a': 1}, {'a': 2}])
+
+        # Single line of JSONL is plain JSON
+        inferred = infer_load_string('{"a": 1}')
+        self.assertEqual(inferred.input_type, 'json')
+        self.assertDictEqual(inferred.data, {'a': 1})
+
+        # Sniffed as TOML, but falls back to INI
+        inferred = infer_load_string('[server]\nhost = localhost\n')
+        self.assertEqual(inferred.format, 'ini')
+        self.assertDictEqual(inferred.data, {'server': {'host': 'localhost'}})
+
+    def test_classify_string(self):
+        self.assertEqual(classify_string('{"a": 1}'), 'json')
+        self.assertEqual(classify_string('a: 1'), 'yaml')
+        self.assertEqual(classify_string('a = 1'), 'toml')
+
+    def test_infer_read_string_type(self):
+        self.assertDictEqual(Converter.infer_read_string_type('a:\n  b: 1'), {'a': {'b': 1}})
+
+
+class TestParseCache(unittest.TestCase):
+
+    def test_eviction(self):
+        cache = ParseCache(max_entries=2, max_bytes=100)
+        cache.put(('a', 0, 10), {'a': 1}, 'json')
+        cache.put(('b', 0, 10), {'b': 1}, 'json')
+        self.assertIsNotNone(cache.get(('a', 0, 10)))
+        cache.put(('c', 0, 10), {'c': 1}, 'json')
+
+        # 'b' is least recently used
+        self.assertIsNone(cache.get(('b', 0, 10)))
+        self.assertEqual(cache.info()['evictions'], 1)
+
+        cache.put(('d', 0, 95), {'d': 1}, 'json')
+        self.assertEqual(cache.info()['entries'], 1)
+        self.assertLessEqual(cache.info()['bytes'], 100)
+
+        # Too large to cache at all
+        cache.put(('e', 0, 101), {'e': 1}, 'json')
+        self.assertIsNone(cache.get(('e', 0, 101)))
+
+    def test_clone(self):
+        cache = ParseCache()
+        data = {'a': [{'b': 1}]}
+        cache.put(('a', 0, 10), data, 'json')
+        data['a'][0]['b'] = 2
+        cached, input_type = cache.get(('a', 0, 10))
+        self.assertDictEqual(cached, {'a': [{'b': 1}]})
+        cached['a'].append(3)
+        self.assertDictEqual(cache.get(('a', 0, 10))[0], {'a': [{'b': 1}]})
+
+
+class TestTemplates(unittest.TestCase):
+
+    def test_substitute(self):
+        self.assertEqual(substitute_template('a: {{x}}\nb: {{x}}\nc: {{y}}', {'x': 'v', 'y': [1]}),
+                         'a: "v"\nb: "v"\nc: [1]')
+        self.assertEqual(substitute_template('a: {{ {{x}}', {'x': 1}), 'a: {{ 1')
+        self.assertEqual(substitute_template('a: <x> {{x}}', {'x': 1}, opening='<', closing='>'), 'a: 1 {{x}}')
+        # Values are only dumped when used
+        self.assertEqual(substitute_template('a: {{x}}', {'x': 1, 'f': object()}), 'a: 1')
+
+    def test_pattern_cache(self):
+        self.assertIs(template_pattern('[[', ']]'), template_pattern('[[', ']]'))
+
+    def test_options(self):
+        self.assertTupleEqual(template_options(), ('{{', '}}', 'ignore'))
+        self.assertTupleEqual(template_options({'RICKLE_OPENING_BRACES': '<', 'RICKLE_CLOSING_BRACES': '>',
+                                                'RICKLE_UNRESOLVED_PLACEHOLDERS': 'raise'}), ('<', '>', 'raise'))
+
+    def test_unresolved(self):
+        self.assertEqual(substitute_template('a: {{x}}', {}), 'a: {{x}}')
+        with self.assertRaises(ValueError):
+            substitute_template('a: {{x}}\nb: {{y}}', {'y': 1}, unresolved='raise')
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            substitute_template('a: {{x}}\nb: {{x}}', {}, unresolved='warn')
+        self.assertEqual(len(caught), 1)
+        self.assertIn('x', str(caught[0].message))
+
+
+class TestMappedFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.jsonl_path = os.path.join(self.tmp_dir.name, 'records.jsonl')
+        with open(self.jsonl_path, 'w') as f:
+            f.write('{"a": 1}\n\n{"a": {{value}}}\n{"a": "é"}')
+        self.json_path = os.path.join(self.tmp_dir.name, 'doc.json')
+        with open(self.json_path, 'w') as f:
+            f.write('{"a": [1, 2, {"b": "é"}]}')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_use_mmap(self):
+        self.assertTrue(use_mmap(self.jsonl_path, {'RICKLE_MMAP_THRESHOLD': 0}))
+        self.assertFalse(use_mmap(self.jsonl_path, {'RICKLE_MMAP_THRESHOLD': -1}))
+        self.assertFalse(use_mmap(self.jsonl_path, {'RICKLE_MMAP_THRESHOLD': 10 ** 9}))
+
+        # The stdlib backend can not parse a JSON document from the map
+        self.assertFalse(use_mmap(self.json_path, {'RICKLE_MMAP_THRESHOLD': 0}))
+        self.assertFalse(use_mmap(self.json_path, {'RICKLE_MMAP_THRESHOLD': 0, 'RICKLE_JSON_BACKEND': 'json'}))
+        if importlib.util.find_spec('orjson'):
+            self.assertTrue(use_mmap(self.json_path, {'RICKLE_MMAP_THRESHOLD': 0, 'RICKLE_JSON_BACKEND': 'orjson'}))
+            self.assertFalse(use_mmap(self.json_path, {'RICKLE_MMAP_THRESHOLD': 0, 'RICKLE_JSON_BACKEND': 'orjson',
+                                                       'encoding': 'latin-1'}))
+
+    def test_load_mapped_file(self):
+        data, input_type = load_mapped_file(self.json_path, 'json')
+        self.assertEqual(input_type, 'json')
+        self.assertDictEqual(data, {'a': [1, 2, {'b': 'é'}]})
+
+        data, input_type = load_mapped_file(self.jsonl_path, 'jsonl', init_args={'value': 2}, substitute=True)
+        self.assertEqual(input_type, 'array')
+        self.assertListEqual(data, [{'a': 1}, {'a': 2}, {'a': 'é'}])
+
+        with self.assertRaises(ValueError):
+            load_mapped_file(self.jsonl_path, 'jsonl')
+
+        with self.assertRaises(ValueError):
+            load_mapped_file(self.json_path, 'yaml')
+
+        if importlib.util.find_spec('orjson'):
+            data, input_type = load_mapped_file(self.json_path, 'json', init_args={'RICKLE_JSON_BACKEND': 'orjson'})
+            self.assertDictEqual(data, {'a': [1, 2, {'b': 'é'}]})
+
+    def test_converter(self):
+        os.environ['RICKLE_MMAP_THRESHOLD'] = '0'
+        try:
+            self.assertDictEqual(Converter.infer_read_file_type(self.json_path), {'a': [1, 2, {'b': 'é'}]})
+        finally:
+            del os.environ['RICKLE_MMAP_THRESHOLD']
+
+
+class TestCompilePath(unittest.TestCase):
+
+    def test_compile_path(self):
+        compiled = compile_path('/[2]/path/[0]/func?x=1&y=2')
+        self.assertEqual(compiled.root_index, 2)
+        self.assertListEqual([s.key for s in compiled.steps], ['path', '[0]', 'func'])
+        self.assertListEqual([s.index for s in compiled.steps], [None, 0, None])
+        self.assertEqual(compiled.steps[-1].segment, 'func?x=1&y=2')
+        self.assertEqual(compiled.steps[-1].params, 'x=1&y=2')
+
+        self.assertTupleEqual(compile_path('/').steps, tuple())
+        self.assertListEqual([s.key for s in compile_path('.a.b', '.').steps], ['a', 'b'])
+        self.assertIs(compile_path('/a/b'), compile_path('/a/b'))
+
+        pattern = compile_path('/servers/*//port/[*]')
+        self.assertTrue(pattern.pattern)
+        self.assertListEqual([(s.key, s.wildcard, s.descendant) for s in pattern.steps],
+                             [('servers', False, False), ('*', True, False), ('port', False, True), ('[*]', True, False)])
+        self.assertFalse(compile_path('/a/[0]').pattern)
+
+        # Steps are shared by the paths they appear in
+        self.assertIs(compile_path('/b/[0]').steps[-1], compile_path('/a/[0]').steps[-1])
+        self.assertEqual(path_step('[0]'), compile_path('/a/[0]').steps[-1])
+        self.assertTupleEqual(tuple(path_step('b?x=1', descendant=True)), ('b?x=1', 'b', None, 'x=1', False, True))
+
+
+class TestConditions(unittest.TestCase):
+
+    def test_parse_condition(self):
+        self.assertTupleEqual(tuple(parse_condition('threshold >= 0.2')), ('threshold', '>=', 0.2))
+        self.assertTupleEqual(tuple(parse_condition('name eq larry')), ('name', 'eq', 'larry'))
+        self.assertTupleEqual(tuple(parse_condition('x-id!=null')), ('x-id', '!=', None))
+        self.assertTupleEqual(tuple(parse_condition(('key', 'lt', 3))), ('key', 'lt', 3))
+
+        with self.assertRaises(ValueError):
+            parse_condition('keygt 3')
+        with self.assertRaises(ValueError):
+            parse_condition(('key', 'like', 3))
+
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.json_string = '{"servers": [{"host": "a\\"b", "port": 80}, {"host": "c", "port": 8080, ' \
+                           '"tls": {"port": 443}}], "timeout": null, "ratio": -1.5e+2}'
+        self.yaml_string = 'servers:\n- host: a"b\n  port: 80\n- host: c\n  port: 8080\n  tls:\n    port: 443\n' \
+                           'timeout: null\nratio: -1.5e+2\n'
+
+    def test_json_events(self):
+        events = list(iter_json_events(StringIO('{"a": [1, true, "x"], "b": {}}')))
+        self.assertListEqual(events, [('start_map', None), ('key', 'a'), ('start_seq', None), ('scalar', 1),
+                                      ('scalar', True), ('scalar', 'x'), ('end_seq', None), ('key', 'b'),
+                                      ('start_map', None), ('end_map', None), ('end_map', None)])
+        # Tokens cut between chunks give the same events
+        self.assertListEqual(list(iter_json_events(StringIO(self.json_string), chunk_size=3)),
+                             list(iter_json_events(StringIO(self.json_string))))
+
+        # Missing, doubled, and trailing separators, and unclosed containers
+        for string in ['{"a": tru}', '{"a",1}', '[1 2]', '{"a"::1}', '{"a": 1,}', '[1,]', '[1,,2]', '{"a": 1}}',
+                       '{"a": [1}', '{"a": 1', '{1: 2}', ', 1']:
+            for chunk_size in [2, 64 * 1024]:
+                with self.assertRaises(ValueError):
+                    list(iter_json_events(StringIO(string), chunk_size=chunk_size))
+
+        # Numbers as JSON writes them, besides Infinity and NaN
+        events = list(iter_json_events(StringIO('[0, -0.5, 10, 1e3, 2E-2, -Infinity, NaN]\n0 1'), chunk_size=2))
+        values = [value for event, value in events if event == 'scalar']
+        self.assertListEqual(values[:6] + values[7:], [0, -0.5, 10, 1000.0, 0.02, float('-inf'), 0, 1])
+        self.assertNotEqual(values[6], values[6])
+        for string in ['{"a":01}', '{"a":1.}', '{"a":.5}', '[1.e5]', '[-]', '[+1]', '01', '1.', 'truefalse', '[nullx]']:
+            for chunk_size in [2, 64 * 1024]:
+                with self.assertRaises(ValueError):
+                    list(iter_json_events(StringIO(string), chunk_size=chunk_size))
+
+    def test_stream_search(self):
+        expected = ['/servers/[0]/port', '/servers/[1]/port', '/servers/[1]/tls/port']
+        self.assertListEqual(list(stream_search(StringIO(self.json_string), 'port')), expected)
+        self.assertListEqual(list(stream_search(StringIO(self.yaml_string), 'port')), expected)
+        self.assertListEqual(list(stream_search(StringIO(self.json_string), 'host', report_parent=True)),
+                             ['/servers/[0]', '/servers/[1]'])
+        self.assertListEqual(list(stream_search(StringIO('{"port": 1}\n{"port": 2}\n'), 'port')),
+                             ['/[0]/port', '/[1]/port'])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'export.yaml')
+            with open(file_path, 'w') as f:
+                f.write(self.yaml_string)
+            self.assertListEqual(list(stream_search(file_path, 'ratio')), ['/ratio'])
+
+    def test_stream_find(self):
+        for string in [self.json_string, self.yaml_string]:
+            self.assertListEqual(list(stream_find(StringIO(string), where=['port > 100'])),
+                                 ['/servers/[1]/tls/port', '/servers/[1]/port'])
+            self.assertListEqual(list(stream_find(StringIO(string), where=['port >= 80', 'host = c'],
+                                                  report_parent=True)), ['/servers/[1]'])
+            self.assertListEqual(list(stream_find(StringIO(string), any_of=['ratio < 0', 'timeout = null'])),
+                                 ['/ratio', '/timeout'])
+
+        with self.assertRaises(ValueError):
+            stream_find(StringIO(self.json_string), where=['tls = {port: 443}'])
+        with self.assertRaises(ValueError):
+            stream_find(StringIO(self.json_string), where=['port ~ 1'])
+
+    def test_chunk_writer(self):
+        output = BytesIO()
+        writer = ChunkWriter(output, chunk_size=4, encoding='utf-8')
+        writer.write('ab')
+        self.assertEqual(output.getvalue(), b'')
+        writer.write('çd')
+        self.assertEqual(output.getvalue(), 'abçd'.encode())
+        writer.write('e')
+        writer.flush()
+        self.assertEqual(output.getvalue(), 'abçde'.encode())
+
+    def test_stream_dump(self):
+        data = {'servers': [{'host': 'a"b', 'port': 80}, {'host': 'ç', 'port': 8080, 'tls': {'port': 443}}],
+                'timeout': None, 'ratio': -1.5e+2, 'name': 'yes', 'tags': list(range(2000))}
+        for format_type in ['json', 'yaml']:
+            dump = get_backend(format_type).dump
+            for chunk_size in [1, 7, 1024]:
+                output = StringIO()
+                stream_dump(data, output, format_type, chunk_size=chunk_size)
+                self.assertEqual(output.getvalue(), dump(data))
+
+        records = [{'a': 1}, [1, 'x'], 'text', None]
+        output = StringIO()
+        stream_dump(records, output, 'json', documents=True)
+        self.assertEqual(output.getvalue(), ''.join(get_backend('json').dump(r) + '\n' for r in records))
+        output = StringIO()
+        stream_dump(records, output, 'yaml', documents=True)
+        self.assertEqual(output.getvalue(), get_backend('yaml').dump_all(records))
+
+        output = BytesIO()
+        stream_dump(data, output, 'toml', chunk_size=5, encoding='utf-8')
+        self.assertEqual(output.getvalue().decode('utf-8'), get_backend('toml').dump(toml_null_stripper(data)))
+
+        with self.assertRaises(ValueError):
+            stream_dump(records, StringIO(), 'toml', documents=True)
+
+
+if __name__ == "__main__":
+    unittest.main()